@@ -1,14 +1,43 @@
 from __future__ import annotations
 
 import argparse
+import importlib
 import logging
 import os
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from gitlab_to_forgejo.forgejo_client import ForgejoClient
-from gitlab_to_forgejo.migrator import migrate_plan
 from gitlab_to_forgejo.plan_builder import Plan, build_plan
 
+if TYPE_CHECKING:
+    from gitlab_to_forgejo.forgejo_client import ForgejoClient
+    from gitlab_to_forgejo.migrator import migrate_plan
+
+# The migration stack pulls in requests/urllib3; import it on first use (PEP 562) so `--help`
+# and argument errors return without loading it.
+_LAZY_ATTRS = {
+    "ForgejoClient": "gitlab_to_forgejo.forgejo_client",
+    "migrate_plan": "gitlab_to_forgejo.migrator",
+}
+
+
+def __getattr__(name: str) -> object:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def _load_lazy_attrs() -> None:
+    # Bare names inside this module don't go through `__getattr__`; bind them as globals
+    # unless they are already set (e.g. patched by tests).
+    for name in _LAZY_ATTRS:
+        if name not in globals():
+            __getattr__(name)
+
+
 _STREAM_LOG_HANDLER_NAME = "gitlab_to_forgejo_stream"
 _ERRORS_FILE_HANDLER_NAME = "gitlab_to_forgejo_errors_file"
 
@@ -80,6 +109,16 @@ def _setup_logging(*, errors_log_path: Path) -> None:
     root.addHandler(errors_file)
 
 
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 def _parse_only_repo(value: str) -> tuple[str | None, str]:
     raw = value.strip().strip("/")
     if not raw:
@@ -118,15 +157,16 @@ def _filter_plan_to_single_repo(plan: Plan, *, only_repo: str) -> Plan:
 
     selected_issue_ids = {i.gitlab_issue_id for i in issues}
     selected_mr_ids = {mr.gitlab_mr_id for mr in merge_requests}
+    # Look up only the selected ids (already in output order) instead of scanning the full maps.
     issue_label_ids_by_gitlab_issue_id = {
-        issue_id: label_ids
-        for issue_id, label_ids in plan.issue_label_ids_by_gitlab_issue_id.items()
-        if issue_id in selected_issue_ids
+        issue_id: plan.issue_label_ids_by_gitlab_issue_id[issue_id]
+        for issue_id in sorted(selected_issue_ids)
+        if issue_id in plan.issue_label_ids_by_gitlab_issue_id
     }
     mr_label_ids_by_gitlab_mr_id = {
-        mr_id: label_ids
-        for mr_id, label_ids in plan.mr_label_ids_by_gitlab_mr_id.items()
-        if mr_id in selected_mr_ids
+        mr_id: plan.mr_label_ids_by_gitlab_mr_id[mr_id]
+        for mr_id in sorted(selected_mr_ids)
+        if mr_id in plan.mr_label_ids_by_gitlab_mr_id
     }
     referenced_label_ids: set[int] = set()
     for label_ids in issue_label_ids_by_gitlab_issue_id.values():
@@ -160,14 +200,6 @@ def _filter_plan_to_single_repo(plan: Plan, *, only_repo: str) -> Plan:
         if key_plan.gitlab_user_id in selected_user_ids
     ]
 
-    issue_label_ids_by_gitlab_issue_id_sorted = {
-        issue_id: issue_label_ids_by_gitlab_issue_id[issue_id]
-        for issue_id in sorted(issue_label_ids_by_gitlab_issue_id)
-    }
-    mr_label_ids_by_gitlab_mr_id_sorted = {
-        mr_id: mr_label_ids_by_gitlab_mr_id[mr_id] for mr_id in sorted(mr_label_ids_by_gitlab_mr_id)
-    }
-
     return Plan(
         backup_id=plan.backup_id,
         orgs=sorted(orgs, key=lambda o: o.name),
@@ -181,8 +213,8 @@ def _filter_plan_to_single_repo(plan: Plan, *, only_repo: str) -> Plan:
         notes=sorted(notes, key=lambda n: (n.gitlab_project_id, n.noteable_type, n.noteable_id)),
         uploads_tar_path=plan.uploads_tar_path,
         labels=sorted(labels, key=lambda label: (label.title.lower(), label.gitlab_label_id)),
-        issue_label_ids_by_gitlab_issue_id=issue_label_ids_by_gitlab_issue_id_sorted,
-        mr_label_ids_by_gitlab_mr_id=mr_label_ids_by_gitlab_mr_id_sorted,
+        issue_label_ids_by_gitlab_issue_id=issue_label_ids_by_gitlab_issue_id,
+        mr_label_ids_by_gitlab_mr_id=mr_label_ids_by_gitlab_mr_id,
         user_ssh_keys=sorted(
             user_ssh_keys, key=lambda key_plan: (key_plan.gitlab_user_id, key_plan.gitlab_key_id)
         ),
@@ -265,6 +297,30 @@ def _build_parser() -> argparse.ArgumentParser:
             "notification hooks). Intended for migration runs."
         ),
     )
+    migrate.add_argument(
+        "--fast-db-notes",
+        action=argparse.BooleanOptionalAction,
+        default=(
+            _env_truthy("FORGEJO_FAST_DB_NOTES") if "FORGEJO_FAST_DB_NOTES" in os.environ else None
+        ),
+        help=(
+            "Import comments via direct DB inserts, falling back to the API if the DB step fails "
+            "(default: same as --fast-db-issues). With API-created issues, Forgejo's own "
+            "comments can take ids that GitLab notes need, so only force this on together "
+            "with --fast-db-issues."
+        ),
+    )
+    migrate.add_argument(
+        "--concurrency",
+        type=_positive_int,
+        # A string default goes through `type` as well, so FORGEJO_CONCURRENCY is validated too.
+        default=os.environ.get("FORGEJO_CONCURRENCY", "1"),
+        help=(
+            "Number of concurrent workers for Forgejo API calls and git pushes: labels, "
+            "avatars, issues/MRs/comments (across repositories), upload rewrites and pushes; "
+            "overlapping phases share it (default: 1; env FORGEJO_CONCURRENCY)."
+        ),
+    )
 
     return parser
 
@@ -274,6 +330,7 @@ def main(argv: list[str] | None = None) -> int:
     args = parser.parse_args(argv)
 
     if args.command == "migrate":
+        _load_lazy_attrs()
         _setup_logging(errors_log_path=args.errors_log.expanduser())
         backup_root: Path = args.backup.expanduser()
         token: str = args.token or _read_token_file(args.token_file.expanduser())
@@ -281,18 +338,21 @@ def main(argv: list[str] | None = None) -> int:
         plan = build_plan(backup_root, root_group_path=args.root_group)
         if args.only_repo:
             plan = _filter_plan_to_single_repo(plan, only_repo=args.only_repo)
-        client = ForgejoClient(base_url=args.forgejo_url, token=token)
-        migrate_plan(
-            plan,
-            client,
-            user_password=args.user_password,
-            private_repos=args.private_repos,
-            forgejo_url=args.forgejo_url,
-            git_username=args.git_username,
-            git_token=token,
-            migrate_password_hashes=args.migrate_password_hashes,
-            fast_db_issues=args.fast_db_issues,
-        )
+        # One client (and so one pooled session) for the whole run; closed once it is done.
+        with ForgejoClient(base_url=args.forgejo_url, token=token) as client:
+            migrate_plan(
+                plan,
+                client,
+                user_password=args.user_password,
+                private_repos=args.private_repos,
+                forgejo_url=args.forgejo_url,
+                git_username=args.git_username,
+                git_token=token,
+                migrate_password_hashes=args.migrate_password_hashes,
+                fast_db_issues=args.fast_db_issues,
+                fast_db_notes=args.fast_db_notes,
+                concurrency=args.concurrency,
+            )
         return 0
 
     raise AssertionError(f"unhandled command: {args.command!r}")
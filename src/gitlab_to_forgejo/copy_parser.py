@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import gzip
-from collections.abc import Iterator
+import re
+from collections.abc import Iterator, Mapping
 from pathlib import Path
 from typing import IO
 
@@ -10,10 +11,14 @@ class CopyParseError(ValueError):
     pass
 
 
-def _open_text(path: Path) -> IO[str]:
+def _open_binary(path: Path) -> IO[bytes]:
     if path.suffix == ".gz":
-        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
-    return path.open("r", encoding="utf-8", errors="replace")
+        return gzip.open(path, "rb")
+    return path.open("rb")
+
+
+_COPY_HEADER_RE = re.compile(r"COPY public\.(\S+)[^(]*\((.*)\)")
+_STRIP_QUOTES = str.maketrans("", "", '"')
 
 
 def _parse_copy_header(line: str) -> tuple[str, list[str]]:
@@ -22,118 +27,119 @@ def _parse_copy_header(line: str) -> tuple[str, list[str]]:
     if not line.startswith("COPY public."):
         raise CopyParseError(f"not a COPY header: {line!r}")
 
-    prefix = "COPY public."
-    rest = line[len(prefix) :]
-    table = rest.split(" ", 1)[0]
-
-    open_paren = line.find("(")
-    close_paren = line.rfind(")")
-    if open_paren == -1 or close_paren == -1 or close_paren < open_paren:
+    m = _COPY_HEADER_RE.match(line)
+    if m is None:
         raise CopyParseError(f"malformed COPY header (missing parens): {line!r}")
 
-    cols_raw = line[open_paren + 1 : close_paren]
-    columns = [c.strip().strip('"') for c in cols_raw.split(",")]
-    if not columns or any(not c for c in columns):
+    columns = [c.strip() for c in m[2].translate(_STRIP_QUOTES).split(",")]
+    if any(not c for c in columns):
         raise CopyParseError(f"malformed COPY header (empty column): {line!r}")
-    return table, columns
+    return m[1], columns
+
+
+_COPY_ESCAPE_RE = re.compile(r"\\(?:([0-7]{1,3})|x([0-9A-Fa-f]{1,2})|(.))", re.DOTALL)
+_COPY_ESCAPES = {"b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v"}
+
+
+def _decode_copy_escape(match: re.Match[str]) -> str:
+    octal, hexa, char = match.groups()
+    if octal is not None:
+        return chr(int(octal, 8))
+    if hexa is not None:
+        return chr(int(hexa, 16))
+    # Unknown escapes (including `\\`) drop the backslash per COPY behavior.
+    return _COPY_ESCAPES.get(char, char)
 
 
 def _decode_copy_field(value: str) -> str:
-    # Postgres COPY FROM text format uses backslash escapes.
-    out: list[str] = []
-    i = 0
-    while i < len(value):
-        ch = value[i]
-        if ch != "\\":
-            out.append(ch)
-            i += 1
-            continue
-
-        # Trailing backslash, keep as-is.
-        if i + 1 >= len(value):
-            out.append("\\")
-            break
-
-        nxt = value[i + 1]
-        if nxt == "b":
-            out.append("\b")
-            i += 2
-        elif nxt == "f":
-            out.append("\f")
-            i += 2
-        elif nxt == "n":
-            out.append("\n")
-            i += 2
-        elif nxt == "r":
-            out.append("\r")
-            i += 2
-        elif nxt == "t":
-            out.append("\t")
-            i += 2
-        elif nxt == "v":
-            out.append("\v")
-            i += 2
-        elif nxt == "\\":
-            out.append("\\")
-            i += 2
-        elif nxt == "x" and i + 3 < len(value):
-            h1 = value[i + 2]
-            h2 = value[i + 3]
-            try:
-                out.append(chr(int(h1 + h2, 16)))
-                i += 4
-            except ValueError:
-                out.append(nxt)
-                i += 2
-        elif nxt.isdigit():
-            # Octal escape: up to 3 digits, including nxt.
-            j = i + 1
-            digits = []
-            while j < len(value) and len(digits) < 3 and value[j].isdigit():
-                digits.append(value[j])
-                j += 1
-            try:
-                out.append(chr(int("".join(digits), 8)))
-                i = j
-            except ValueError:
-                out.append(nxt)
-                i += 2
-        else:
-            # Unknown escape, drop backslash per COPY behavior.
-            out.append(nxt)
-            i += 2
-
-    return "".join(out)
+    # Postgres COPY FROM text format uses backslash escapes; a trailing backslash is kept as-is.
+    return _COPY_ESCAPE_RE.sub(_decode_copy_escape, value)
+
+
+def _decode_copy_value(raw: str) -> str | None:
+    # Most fields carry no escapes (NULL is the escape `\N`), so only those with a backslash
+    # go through the escape decoder.
+    if "\\" not in raw:
+        return raw
+    return None if raw == r"\N" else _decode_copy_field(raw)
+
+
+class CopyRow(Mapping[str, str | None]):
+    """
+    Read-only view of one COPY row.
+
+    The column index is shared by every row of a table and fields are decoded on access, so
+    columns a caller never reads cost nothing beyond the split.
+    """
+
+    __slots__ = ("_index", "_fields")
+
+    def __init__(self, index: Mapping[str, int], fields: list[str]) -> None:
+        self._index = index
+        self._fields = fields
+
+    def __getitem__(self, column: str) -> str | None:
+        return _decode_copy_value(self._fields[self._index[column]])
+
+    def get(self, column: str, default: str | None = None) -> str | None:
+        idx = self._index.get(column)
+        if idx is None:
+            return default
+        return _decode_copy_value(self._fields[idx])
+
+    def __contains__(self, column: object) -> bool:
+        return column in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __repr__(self) -> str:
+        return f"CopyRow({dict(self)!r})"
 
 
 def iter_copy_rows(
     db_path: Path | str,
     *,
     tables: set[str] | None = None,
-) -> Iterator[tuple[str, dict[str, str | None]]]:
+) -> Iterator[tuple[str, CopyRow]]:
     """
     Stream rows from a GitLab `database.sql(.gz)` dump.
 
-    Yields (table_name, row_dict) for each row in each COPY block.
+    Yields (table_name, row) for each row in each COPY block; `row` is a read-only mapping of
+    column name to value (None for SQL NULL).
     `table_name` matches the unqualified name in `COPY public.<table>`.
+    When `tables` is given, reading stops once each of them has had its COPY block.
     """
     path = Path(db_path)
     in_copy: str | None = None
-    columns: list[str] | None = None
+    columns: dict[str, int] | None = None
+    column_count = 0
     capture = False
+    # pg_dump writes one COPY block per table, so the rest of the dump can be skipped once
+    # every requested table has been read.
+    remaining = set(tables) if tables is not None else None
 
-    with _open_text(path) as f:
+    # Lines are read as bytes so rows of tables that are not captured are never decoded.
+    with _open_binary(path) as f:
         for line in f:
             if in_copy is None:
-                if line.startswith("COPY public."):
-                    tbl, cols = _parse_copy_header(line)
+                if line.startswith(b"COPY public."):
+                    tbl, cols = _parse_copy_header(line.decode("utf-8", errors="replace"))
                     in_copy = tbl
-                    columns = cols
+                    columns = {col: idx for idx, col in enumerate(cols)}
+                    column_count = len(cols)
                     capture = tables is None or tbl in tables
                 continue
 
             # inside a COPY block
-            if line.startswith("\\."):
+            if line.startswith(b"\\."):
+                if capture and remaining is not None:
+                    remaining.discard(in_copy)
+                    if not remaining:
+                        return
                 in_copy = None
                 columns = None
                 capture = False
@@ -143,18 +149,11 @@ def iter_copy_rows(
                 continue
 
             assert columns is not None
-            fields = line.rstrip("\n").split("\t")
-            if len(fields) != len(columns):
+            fields = line.rstrip(b"\r\n").decode("utf-8", errors="replace").split("\t")
+            if len(fields) != column_count:
                 raise CopyParseError(
                     f"COPY row column mismatch for table={in_copy}: "
-                    f"expected {len(columns)} fields, got {len(fields)}"
+                    f"expected {column_count} fields, got {len(fields)}"
                 )
 
-            row: dict[str, str | None] = {}
-            for col, raw in zip(columns, fields, strict=True):
-                if raw == r"\N":
-                    row[col] = None
-                else:
-                    row[col] = _decode_copy_field(raw)
-
-            yield in_copy, row
+            yield in_copy, CopyRow(columns, fields)
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import json as jsonlib
+from collections.abc import Iterator
 from dataclasses import dataclass
-from typing import Any
+from functools import cache, cached_property, lru_cache
+from typing import IO, Any
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.fields import RequestField
+from urllib3.filepost import choose_boundary
+from urllib3.util.retry import Retry
 
 
 @dataclass
@@ -16,6 +23,11 @@ class ForgejoError(Exception):
     def __str__(self) -> str:  # pragma: no cover (repr only)
         return f"{self.method} {self.url} failed with {self.status_code}: {self.body[:200]}"
 
+    @cached_property
+    def normalized_body(self) -> str:
+        """The body lowercased with whitespace runs collapsed, for message matching."""
+        return " ".join(self.body.lower().split())
+
 
 class ForgejoNotFound(ForgejoError):
     pass
@@ -55,17 +67,95 @@ def _pick_team_units(teams: list[dict[str, Any]]) -> list[str]:
     return list(_DEFAULT_TEAM_UNITS)
 
 
+_POOL_CONNECTIONS = 16
+_POOL_MAXSIZE = 32
+
+# Gateway errors from a reverse proxy in front of Forgejo are retried, but only for idempotent
+# methods: a POST that timed out at the proxy may still have created the issue/comment.
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.2,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+    raise_on_status=False,
+)
+
+
+def _new_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=_POOL_CONNECTIONS, pool_maxsize=_POOL_MAXSIZE, max_retries=_RETRY
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _encode_json(payload: Any) -> bytes:
+    # Compact separators and raw UTF-8 keep request bodies (issue/comment text) small.
+    return jsonlib.dumps(
+        payload, ensure_ascii=False, separators=(",", ":"), allow_nan=False
+    ).encode("utf-8")
+
+
+@lru_cache(maxsize=1024)
+def _encode_labels_payload(labels: tuple[str, ...]) -> bytes:
+    # Label sets repeat across many issues/PRs, so each distinct one is encoded once.
+    return _encode_json({"labels": list(labels)})
+
+
+@cache
+def _sudo_params(sudo: str | None) -> tuple[tuple[str, str], ...] | None:
+    # Issues/comments/attachments are posted as a handful of users thousands of times over, so
+    # each user's query params are built once; requests takes the pairs as-is.
+    return (("sudo", sudo),) if sudo else None
+
+
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def _iter_multipart_file(
+    boundary: str, *, name: str, filename: str, content: IO[bytes]
+) -> Iterator[bytes]:
+    # requests' `files=` encoder reads file objects fully into memory; this yields the same
+    # single-part body (headers rendered by urllib3, as requests does) chunk by chunk instead.
+    field = RequestField(name=name, data=b"", filename=filename)
+    field.make_multipart()
+    yield f"--{boundary}\r\n{field.render_headers()}".encode()
+    while chunk := content.read(_UPLOAD_CHUNK_SIZE):
+        yield chunk
+    yield f"\r\n--{boundary}--\r\n".encode()
+
+
+def _decode_json(content: bytes) -> Any:
+    # json.loads detects UTF-8/16/32 from the raw bytes itself, so skip requests' text
+    # decoding (and its charset guessing when the response has no charset).
+    return jsonlib.loads(content)
+
+
 class ForgejoClient:
     def __init__(
         self, *, base_url: str, token: str, session: requests.Session | None = None
     ) -> None:
         self._base_url = base_url.rstrip("/")
         self._api_url = f"{self._base_url}/api/v1"
-        self._token = token
-        self._session = session or requests.Session()
+        self._session = session or _new_session()
+        # Built once and passed per request rather than set on the session: Content-Type must
+        # stay unset for multipart uploads, and a caller-provided session is left untouched.
+        self._headers = {"Authorization": f"token {token}"}
+        self._json_headers = {**self._headers, "Content-Type": "application/json"}
 
         self._org_teams_cache: dict[str, list[dict[str, Any]]] = {}
 
+    def close(self) -> None:
+        self._session.close()
+
+    def __enter__(self) -> ForgejoClient:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
     def _url(self, path: str) -> str:
         if not path.startswith("/"):
             raise ValueError(f"path must start with '/': {path!r}")
@@ -76,19 +166,27 @@ class ForgejoClient:
         method: str,
         path: str,
         *,
-        params: dict[str, Any] | None = None,
+        params: dict[str, Any] | tuple[tuple[str, str], ...] | None = None,
         json: Any | None = None,
+        encoded_json: bytes | None = None,
         files: Any | None = None,
         data: Any | None = None,
+        content_type: str | None = None,
     ) -> requests.Response:
         url = self._url(path)
-        headers = {"Authorization": f"token {self._token}"}
+        headers = self._headers
+        if json is not None:
+            encoded_json = _encode_json(json)
+        if encoded_json is not None:
+            headers = self._json_headers
+            data = encoded_json
+        elif content_type is not None:
+            headers = {**self._headers, "Content-Type": content_type}
         resp = self._session.request(
             method,
             url,
             headers=headers,
             params=params,
-            json=json,
             files=files,
             data=data,
             timeout=30,
@@ -108,14 +206,15 @@ class ForgejoClient:
         method: str,
         path: str,
         *,
-        params: dict[str, Any] | None = None,
+        params: dict[str, Any] | tuple[tuple[str, str], ...] | None = None,
         json: Any | None = None,
+        encoded_json: bytes | None = None,
     ) -> Any:
-        resp = self._request(method, path, params=params, json=json)
+        resp = self._request(method, path, params=params, json=json, encoded_json=encoded_json)
 
         if resp.status_code == 204 or not resp.content:
             return None
-        return resp.json()
+        return _decode_json(resp.content)
 
     def get_user(self, username: str) -> dict[str, Any]:
         data = self._request_json("GET", f"/users/{username}")
@@ -238,8 +337,8 @@ class ForgejoClient:
         )
         assert isinstance(data, dict)
 
-        # Refresh cached teams on next query.
-        self._org_teams_cache.pop(org, None)
+        # The response is the created team, so record it instead of refetching the listing.
+        teams.append(data)
         return int(data["id"])
 
     def add_team_member(self, *, team_id: int, username: str) -> None:
@@ -298,7 +397,7 @@ class ForgejoClient:
         data = self._request_json(
             "POST",
             f"/repos/{owner}/{repo}/issues",
-            params={"sudo": sudo} if sudo else None,
+            params=_sudo_params(sudo),
             json={"title": title, "body": body},
         )
         assert isinstance(data, dict)
@@ -316,7 +415,7 @@ class ForgejoClient:
         data = self._request_json(
             "PATCH",
             f"/repos/{owner}/{repo}/issues/{issue_number}",
-            params={"sudo": sudo} if sudo else None,
+            params=_sudo_params(sudo),
             json={"body": body},
         )
         assert isinstance(data, dict)
@@ -334,7 +433,7 @@ class ForgejoClient:
         data = self._request_json(
             "PATCH",
             f"/repos/{owner}/{repo}/pulls/{pr_number}",
-            params={"sudo": sudo} if sudo else None,
+            params=_sudo_params(sudo),
             json={"body": body},
         )
         assert isinstance(data, dict)
@@ -354,7 +453,7 @@ class ForgejoClient:
         data = self._request_json(
             "POST",
             f"/repos/{owner}/{repo}/pulls",
-            params={"sudo": sudo} if sudo else None,
+            params=_sudo_params(sudo),
             json={
                 "title": title,
                 "body": body,
@@ -377,7 +476,7 @@ class ForgejoClient:
         data = self._request_json(
             "POST",
             f"/repos/{owner}/{repo}/issues/{issue_number}/comments",
-            params={"sudo": sudo} if sudo else None,
+            params=_sudo_params(sudo),
             json={"body": body},
         )
         assert isinstance(data, dict)
@@ -395,7 +494,7 @@ class ForgejoClient:
         data = self._request_json(
             "PATCH",
             f"/repos/{owner}/{repo}/issues/comments/{comment_id}",
-            params={"sudo": sudo} if sudo else None,
+            params=_sudo_params(sudo),
             json={"body": body},
         )
         assert isinstance(data, dict)
@@ -408,18 +507,17 @@ class ForgejoClient:
         repo: str,
         issue_number: int,
         filename: str,
-        content: bytes,
+        content: bytes | IO[bytes],
         sudo: str | None = None,
     ) -> dict[str, Any]:
-        resp = self._request(
-            "POST",
+        # The assets endpoint accepts exactly one "attachment" part per request; callers
+        # dedupe repeated uploads instead of batching.
+        return self._post_attachment(
             f"/repos/{owner}/{repo}/issues/{issue_number}/assets",
-            params={"sudo": sudo} if sudo else None,
-            files={"attachment": (filename, content)},
+            filename=filename,
+            content=content,
+            sudo=sudo,
         )
-        data = resp.json()
-        assert isinstance(data, dict)
-        return data
 
     def create_issue_comment_attachment(
         self,
@@ -428,16 +526,39 @@ class ForgejoClient:
         repo: str,
         comment_id: int,
         filename: str,
-        content: bytes,
+        content: bytes | IO[bytes],
         sudo: str | None = None,
     ) -> dict[str, Any]:
-        resp = self._request(
-            "POST",
+        return self._post_attachment(
             f"/repos/{owner}/{repo}/issues/comments/{comment_id}/assets",
-            params={"sudo": sudo} if sudo else None,
-            files={"attachment": (filename, content)},
+            filename=filename,
+            content=content,
+            sudo=sudo,
         )
-        data = resp.json()
+
+    def _post_attachment(
+        self, path: str, *, filename: str, content: bytes | IO[bytes], sudo: str | None
+    ) -> dict[str, Any]:
+        if isinstance(content, bytes):
+            resp = self._request(
+                "POST",
+                path,
+                params=_sudo_params(sudo),
+                files={"attachment": (filename, content)},
+            )
+        else:
+            # Stream file objects (uploads can be several MB) as a chunked request body.
+            boundary = choose_boundary()
+            resp = self._request(
+                "POST",
+                path,
+                params=_sudo_params(sudo),
+                data=_iter_multipart_file(
+                    boundary, name="attachment", filename=filename, content=content
+                ),
+                content_type=f"multipart/form-data; boundary={boundary}",
+            )
+        data = _decode_json(resp.content)
         assert isinstance(data, dict)
         return data
 
@@ -445,7 +566,7 @@ class ForgejoClient:
         self._request_json(
             "POST",
             "/user/avatar",
-            params={"sudo": sudo} if sudo else None,
+            params=_sudo_params(sudo),
             json={"image": image_b64},
         )
 
@@ -459,7 +580,7 @@ class ForgejoClient:
         data = self._request_json(
             "POST",
             "/user/keys",
-            params={"sudo": sudo} if sudo else None,
+            params=_sudo_params(sudo),
             json={"title": title, "key": key},
         )
         assert isinstance(data, dict)
@@ -499,8 +620,8 @@ class ForgejoClient:
         data = self._request_json(
             "PUT",
             f"/repos/{owner}/{repo}/issues/{issue_number}/labels",
-            params={"sudo": sudo} if sudo else None,
-            json={"labels": labels},
+            params=_sudo_params(sudo),
+            encoded_json=_encode_labels_payload(tuple(labels)),
         )
         assert isinstance(data, list)
         return [label for label in data if isinstance(label, dict)]
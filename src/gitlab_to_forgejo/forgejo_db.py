@@ -55,6 +55,29 @@ def build_password_hash_fix_sql(
     return "\n".join(["BEGIN;", *updates, "COMMIT;", ""])
 
 
+_COPY_TEXT_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_row(*values: object) -> str:
+    """Format one row for `COPY ... FROM stdin` (text format)."""
+    return "\t".join(str(value).translate(_COPY_TEXT_ESCAPES) for value in values)
+
+
+def _issue_timestamps(
+    created_unix: int, updated_unix: int, closed_unix: int, *, state_id: int
+) -> tuple[int, int, int, bool]:
+    is_closed = state_id != 1 and state_id != 0
+    if updated_unix <= 0:
+        updated_unix = created_unix
+    if created_unix <= 0:
+        created_unix = updated_unix
+    if is_closed and closed_unix <= 0:
+        closed_unix = updated_unix or created_unix
+    if not is_closed:
+        closed_unix = 0
+    return created_unix, updated_unix, closed_unix, is_closed
+
+
 def build_metadata_fix_sql(
     plan: Plan,
     *,
@@ -65,9 +88,16 @@ def build_metadata_fix_sql(
     include_merge_requests: bool = True,
     include_notes: bool = True,
 ) -> str:
-    repo_by_project_id = {r.gitlab_project_id: r for r in plan.repos}
+    """Build a psql script that backfills GitLab timestamps/state onto created issues/comments.
 
-    lines: list[str] = ["BEGIN;"]
+    Rows are streamed into temp tables via `COPY ... FROM stdin` and applied with one set-based
+    `UPDATE` per table, so Postgres parses and plans a handful of statements instead of one
+    statement per issue/comment.
+    """
+    repo_by_project_id = plan.repo_by_project_id
+
+    # owner, repo, index, pulls_allowed, created_unix, updated_unix, closed_unix, is_closed
+    issue_rows: list[str] = []
 
     if include_issues:
         for issue in plan.issues:
@@ -77,42 +107,23 @@ def build_metadata_fix_sql(
             repo = repo_by_project_id.get(issue.gitlab_project_id)
             if repo is None:
                 continue
-
-            created_unix = int(issue.created_unix or 0)
-            updated_unix = int(issue.updated_unix or 0)
-            closed_unix = int(issue.closed_unix or 0)
-            is_closed = issue.state_id != 1 and issue.state_id != 0
-
-            if updated_unix <= 0:
-                updated_unix = created_unix
-            if created_unix <= 0:
-                created_unix = updated_unix
-            if is_closed and closed_unix <= 0:
-                closed_unix = updated_unix or created_unix
-            if not is_closed:
-                closed_unix = 0
-
-            lines.extend(
-                [
-                    (
-                        f"-- gitlab issue #{issue.gitlab_issue_iid} → "
-                        f"{repo.owner}/{repo.name} #{issue_number}"
-                    ),
-                    "UPDATE issue i",
-                    "SET",
-                    f"  created = {created_unix},",
-                    f"  created_unix = {created_unix},",
-                    f"  updated_unix = {updated_unix},",
-                    f"  closed_unix = {closed_unix},",
-                    f"  is_closed = {'TRUE' if is_closed else 'FALSE'}",
-                    "FROM repository r",
-                    'JOIN "user" u ON u.id = r.owner_id',
-                    "WHERE i.repo_id = r.id",
-                    f"  AND u.lower_name = lower({_sql_literal(repo.owner)})",
-                    f"  AND r.lower_name = lower({_sql_literal(repo.name)})",
-                    f'  AND i."index" = {int(issue_number)}',
-                    "  AND i.is_pull = FALSE;",
-                ]
+            created_unix, updated_unix, closed_unix, is_closed = _issue_timestamps(
+                int(issue.created_unix or 0),
+                int(issue.updated_unix or 0),
+                int(issue.closed_unix or 0),
+                state_id=issue.state_id,
+            )
+            issue_rows.append(
+                _copy_row(
+                    repo.owner,
+                    repo.name,
+                    int(issue_number),
+                    "f",
+                    created_unix,
+                    updated_unix,
+                    closed_unix,
+                    "t" if is_closed else "f",
+                )
             )
 
     if include_merge_requests:
@@ -123,43 +134,30 @@ def build_metadata_fix_sql(
             repo = repo_by_project_id.get(mr.gitlab_target_project_id)
             if repo is None:
                 continue
-
-            created_unix = int(mr.created_unix or 0)
-            updated_unix = int(mr.updated_unix or 0)
-            closed_unix = int(mr.closed_unix or 0)
-            is_closed = mr.state_id != 1 and mr.state_id != 0
-
-            if updated_unix <= 0:
-                updated_unix = created_unix
-            if created_unix <= 0:
-                created_unix = updated_unix
-            if is_closed and closed_unix <= 0:
-                closed_unix = updated_unix or created_unix
-            if not is_closed:
-                closed_unix = 0
-
-            lines.extend(
-                [
-                    (
-                        f"-- gitlab mr !{mr.gitlab_mr_iid} → "
-                        f"{repo.owner}/{repo.name} #{int(pr_number)}"
-                    ),
-                    "UPDATE issue i",
-                    "SET",
-                    f"  created = {created_unix},",
-                    f"  created_unix = {created_unix},",
-                    f"  updated_unix = {updated_unix},",
-                    f"  closed_unix = {closed_unix},",
-                    f"  is_closed = {'TRUE' if is_closed else 'FALSE'}",
-                    "FROM repository r",
-                    'JOIN "user" u ON u.id = r.owner_id',
-                    "WHERE i.repo_id = r.id",
-                    f"  AND u.lower_name = lower({_sql_literal(repo.owner)})",
-                    f"  AND r.lower_name = lower({_sql_literal(repo.name)})",
-                    f'  AND i."index" = {int(pr_number)};',
-                ]
+            created_unix, updated_unix, closed_unix, is_closed = _issue_timestamps(
+                int(mr.created_unix or 0),
+                int(mr.updated_unix or 0),
+                int(mr.closed_unix or 0),
+                state_id=mr.state_id,
+            )
+            # MRs that fell back to plain issues share the index space, so pulls are not
+            # required here (matching the previous per-row UPDATE).
+            issue_rows.append(
+                _copy_row(
+                    repo.owner,
+                    repo.name,
+                    int(pr_number),
+                    "t",
+                    created_unix,
+                    updated_unix,
+                    closed_unix,
+                    "t" if is_closed else "f",
+                )
             )
 
+    # comment_id, created_unix, updated_unix
+    comment_rows: list[str] = []
+
     if include_notes:
         for note in plan.notes:
             comment_id = comment_id_by_gitlab_note_id.get(note.gitlab_note_id)
@@ -170,18 +168,55 @@ def build_metadata_fix_sql(
             updated_unix = int(note.updated_unix or 0)
             if updated_unix <= 0:
                 updated_unix = created_unix
+            comment_rows.append(_copy_row(int(comment_id), created_unix, updated_unix))
 
-            lines.extend(
-                [
-                    f"-- gitlab note {note.gitlab_note_id} → forgejo comment {int(comment_id)}",
-                    "UPDATE comment",
-                    f"SET created_unix = {created_unix}, updated_unix = {updated_unix}",
-                    f"WHERE id = {int(comment_id)};",
-                ]
-            )
+    lines: list[str] = ["BEGIN;"]
+
+    if issue_rows:
+        lines.extend(
+            [
+                "CREATE TEMP TABLE _gitlab_issue_meta (",
+                "  owner text, repo text, idx bigint, pulls_allowed boolean,",
+                "  created_unix bigint, updated_unix bigint, closed_unix bigint, is_closed boolean",
+                ") ON COMMIT DROP;",
+                "COPY _gitlab_issue_meta FROM stdin;",
+                *issue_rows,
+                "\\.",
+                "UPDATE issue i",
+                "SET",
+                "  created = t.created_unix,",
+                "  created_unix = t.created_unix,",
+                "  updated_unix = t.updated_unix,",
+                "  closed_unix = t.closed_unix,",
+                "  is_closed = t.is_closed",
+                "FROM _gitlab_issue_meta t",
+                'JOIN "user" u ON u.lower_name = lower(t.owner)',
+                "JOIN repository r ON r.owner_id = u.id AND r.lower_name = lower(t.repo)",
+                "WHERE i.repo_id = r.id",
+                '  AND i."index" = t.idx',
+                "  AND (t.pulls_allowed OR i.is_pull = FALSE);",
+            ]
+        )
 
-    lines.append("COMMIT;")
-    return "\n".join(lines) + "\n"
+    if comment_rows:
+        lines.extend(
+            [
+                "CREATE TEMP TABLE _gitlab_comment_meta (",
+                "  id bigint, created_unix bigint, updated_unix bigint",
+                ") ON COMMIT DROP;",
+                "COPY _gitlab_comment_meta FROM stdin;",
+                *comment_rows,
+                "\\.",
+                "UPDATE comment c",
+                "SET created_unix = t.created_unix, updated_unix = t.updated_unix",
+                "FROM _gitlab_comment_meta t",
+                "WHERE c.id = t.id;",
+            ]
+        )
+
+    # The trailing "" yields the final newline without copying the joined script again.
+    lines += ("COMMIT;", "")
+    return "\n".join(lines)
 
 
 def build_fast_issue_import_sql(
@@ -190,11 +225,16 @@ def build_fast_issue_import_sql(
     issue_number_by_gitlab_issue_id: Mapping[int, int],
     forgejo_username_by_gitlab_user_id: Mapping[int, str],
 ) -> str:
-    repo_by_project_id = {repo.gitlab_project_id: repo for repo in plan.repos}
+    """Build a psql script that inserts planned issues straight into Forgejo's `issue` table.
+
+    Rows are streamed into a temp table via `COPY ... FROM stdin` and inserted with one
+    `INSERT ... SELECT` that resolves the repo and poster ids, so Postgres parses no per-row SQL.
+    """
+    repo_by_project_id = plan.repo_by_project_id
 
     max_index_by_repo: dict[tuple[str, str], int] = {}
-    lines: list[str] = ["BEGIN;"]
-    inserted = 0
+    # owner, repo, poster, index, title, body, is_closed, created_unix, updated_unix, closed_unix
+    rows: list[str] = []
 
     for issue in plan.issues:
         issue_number = issue_number_by_gitlab_issue_id.get(issue.gitlab_issue_id)
@@ -207,58 +247,62 @@ def build_fast_issue_import_sql(
         if not poster_username:
             continue
 
-        created_unix = int(issue.created_unix or 0)
-        updated_unix = int(issue.updated_unix or 0)
-        closed_unix = int(issue.closed_unix or 0)
-        is_closed = issue.state_id != 1 and issue.state_id != 0
-
-        if updated_unix <= 0:
-            updated_unix = created_unix
-        if created_unix <= 0:
-            created_unix = updated_unix
-        if is_closed and closed_unix <= 0:
-            closed_unix = updated_unix or created_unix
-        if not is_closed:
-            closed_unix = 0
+        created_unix, updated_unix, closed_unix, is_closed = _issue_timestamps(
+            int(issue.created_unix or 0),
+            int(issue.updated_unix or 0),
+            int(issue.closed_unix or 0),
+            state_id=issue.state_id,
+        )
 
-        lines.extend(
-            [
-                (
-                    f"-- gitlab issue #{issue.gitlab_issue_iid} ({issue.gitlab_issue_id}) → "
-                    f"{repo.owner}/{repo.name} #{issue_number}"
-                ),
-                "INSERT INTO issue (",
-                '  repo_id, "index", poster_id, name, content, content_version,',
-                "  is_closed, is_pull, num_comments, ref, pin_order,",
-                "  created, created_unix, updated_unix, closed_unix, is_locked",
-                ")",
-                "SELECT",
-                (
-                    "  r.id, "
-                    f"{int(issue_number)}, "
-                    f"u.id, {_sql_literal(issue.title)}, {_sql_literal(issue.description)}, 0,"
-                ),
-                (
-                    "  "
-                    f"{'TRUE' if is_closed else 'FALSE'}, FALSE, 0, '', 0,"
-                ),
-                f"  {created_unix}, {created_unix}, {updated_unix}, {closed_unix}, FALSE",
-                "FROM repository r",
-                'JOIN "user" owner_u ON owner_u.id = r.owner_id',
-                f'JOIN "user" u ON u.lower_name = lower({_sql_literal(poster_username)})',
-                f"WHERE owner_u.lower_name = lower({_sql_literal(repo.owner)})",
-                f"  AND r.lower_name = lower({_sql_literal(repo.name)})",
-                'ON CONFLICT (repo_id, "index") DO NOTHING;',
-            ]
+        rows.append(
+            _copy_row(
+                repo.owner,
+                repo.name,
+                poster_username,
+                int(issue_number),
+                issue.title,
+                issue.description,
+                "t" if is_closed else "f",
+                created_unix,
+                updated_unix,
+                closed_unix,
+            )
         )
         max_index_by_repo[(repo.owner, repo.name)] = max(
             int(issue_number), max_index_by_repo.get((repo.owner, repo.name), 0)
         )
-        inserted += 1
 
-    if inserted == 0:
+    if not rows:
         return ""
 
+    lines: list[str] = [
+        "BEGIN;",
+        "CREATE TEMP TABLE _gitlab_fast_issue (",
+        "  owner text, repo text, poster text, issue_index bigint,",
+        "  name text, content text, is_closed boolean,",
+        "  created_unix bigint, updated_unix bigint, closed_unix bigint",
+        ") ON COMMIT DROP;",
+        "COPY _gitlab_fast_issue FROM stdin;",
+        *rows,
+        "\\.",
+        "INSERT INTO issue (",
+        '  repo_id, "index", poster_id, name, content, content_version,',
+        "  is_closed, is_pull, num_comments, ref, pin_order,",
+        "  created, created_unix, updated_unix, closed_unix, is_locked",
+        ")",
+        "SELECT",
+        "  r.id, v.issue_index, u.id, v.name, v.content, 0,",
+        "  v.is_closed, FALSE, 0, '', 0,",
+        "  v.created_unix, v.created_unix, v.updated_unix, v.closed_unix, FALSE",
+        "FROM _gitlab_fast_issue v",
+        'JOIN "user" owner_u ON owner_u.lower_name = lower(v.owner)',
+        "JOIN repository r ON r.owner_id = owner_u.id",
+        'JOIN "user" u ON u.lower_name = lower(v.poster)',
+        # A WHERE clause keeps ON CONFLICT from reading as another join condition.
+        "WHERE r.lower_name = lower(v.repo)",
+        'ON CONFLICT (repo_id, "index") DO NOTHING;',
+    ]
+
     for (owner, repo), max_index in sorted(max_index_by_repo.items()):
         lines.extend(
             [
@@ -274,8 +318,8 @@ def build_fast_issue_import_sql(
             ]
         )
 
-    lines.append("COMMIT;")
-    return "\n".join(lines) + "\n"
+    lines += ("COMMIT;", "")
+    return "\n".join(lines)
 
 
 def build_fast_note_import_sql(
@@ -285,11 +329,17 @@ def build_fast_note_import_sql(
     pr_number_by_gitlab_mr_id: Mapping[int, int],
     forgejo_username_by_gitlab_user_id: Mapping[int, str],
 ) -> tuple[str, dict[int, int]]:
-    repo_by_project_id = {repo.gitlab_project_id: repo for repo in plan.repos}
+    """Build a psql script that inserts planned notes into Forgejo's `comment` table.
+
+    Returns the script and the Forgejo comment id for each GitLab note id. Rows are staged with
+    `COPY ... FROM stdin`, as in `build_fast_issue_import_sql`.
+    """
+    repo_by_project_id = plan.repo_by_project_id
 
     comment_id_by_gitlab_note_id: dict[int, int] = {}
     touched_repos: set[tuple[str, str]] = set()
-    lines: list[str] = ["BEGIN;"]
+    # id, owner, repo, issue index, poster, body, created_unix, updated_unix
+    rows: list[str] = []
 
     for note in plan.notes:
         repo = repo_by_project_id.get(note.gitlab_project_id)
@@ -317,38 +367,46 @@ def build_fast_note_import_sql(
         comment_id_by_gitlab_note_id[note.gitlab_note_id] = comment_id
         touched_repos.add((repo.owner, repo.name))
 
-        lines.extend(
-            [
-                (
-                    f"-- gitlab note {note.gitlab_note_id} "
-                    f"({note.noteable_type} {note.noteable_id})"
-                    f" → {repo.owner}/{repo.name} #{int(issue_number)}"
-                ),
-                "INSERT INTO comment (",
-                (
-                    "  id, type, poster_id, issue_id, content, content_version, "
-                    "created_unix, updated_unix"
-                ),
-                ")",
-                "SELECT",
-                (
-                    f"  {comment_id}, 0, u.id, i.id, {_sql_literal(note.body)}, 0, "
-                    f"{created_unix}, {updated_unix}"
-                ),
-                "FROM issue i",
-                "JOIN repository r ON r.id = i.repo_id",
-                'JOIN "user" owner_u ON owner_u.id = r.owner_id',
-                f'JOIN "user" u ON u.lower_name = lower({_sql_literal(poster_username)})',
-                f"WHERE owner_u.lower_name = lower({_sql_literal(repo.owner)})",
-                f"  AND r.lower_name = lower({_sql_literal(repo.name)})",
-                f'  AND i."index" = {int(issue_number)}',
-                "ON CONFLICT (id) DO NOTHING;",
-            ]
+        rows.append(
+            _copy_row(
+                comment_id,
+                repo.owner,
+                repo.name,
+                int(issue_number),
+                poster_username,
+                note.body,
+                created_unix,
+                updated_unix,
+            )
         )
 
-    if not comment_id_by_gitlab_note_id:
+    if not rows:
         return "", {}
 
+    lines: list[str] = [
+        "BEGIN;",
+        "CREATE TEMP TABLE _gitlab_fast_comment (",
+        "  id bigint, owner text, repo text, issue_index bigint,",
+        "  poster text, content text, created_unix bigint, updated_unix bigint",
+        ") ON COMMIT DROP;",
+        "COPY _gitlab_fast_comment FROM stdin;",
+        *rows,
+        "\\.",
+        "INSERT INTO comment (",
+        "  id, type, poster_id, issue_id, content, content_version, created_unix, updated_unix",
+        ")",
+        "SELECT",
+        "  v.id, 0, u.id, i.id, v.content, 0, v.created_unix, v.updated_unix",
+        "FROM _gitlab_fast_comment v",
+        'JOIN "user" owner_u ON owner_u.lower_name = lower(v.owner)',
+        "JOIN repository r ON r.owner_id = owner_u.id",
+        "JOIN issue i ON i.repo_id = r.id",
+        'JOIN "user" u ON u.lower_name = lower(v.poster)',
+        "WHERE r.lower_name = lower(v.repo)",
+        '  AND i."index" = v.issue_index',
+        "ON CONFLICT (id) DO NOTHING;",
+    ]
+
     for owner, repo in sorted(touched_repos):
         lines.extend(
             [
@@ -368,8 +426,8 @@ def build_fast_note_import_sql(
             ]
         )
 
-    lines.append("COMMIT;")
-    return "\n".join(lines) + "\n", comment_id_by_gitlab_note_id
+    lines += ("COMMIT;", "")
+    return "\n".join(lines), comment_id_by_gitlab_note_id
 
 
 def build_sequence_resync_sql() -> str:
@@ -1,10 +1,21 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 
 
 def read_ref_shas(refs_path: Path) -> dict[str, str]:
-    """Return a mapping of ref name → SHA from GitLab `*.refs` files."""
+    """Return a mapping of ref name → SHA from GitLab `*.refs` files.
+
+    The same file is read by the repo, push, wiki and merge request phases, so parsed results
+    are cached while its mtime and size are unchanged; callers get their own copy.
+    """
+    st = refs_path.stat()
+    return dict(_parse_ref_shas(refs_path, st.st_mtime_ns, st.st_size))
+
+
+@lru_cache(maxsize=256)
+def _parse_ref_shas(refs_path: Path, _mtime_ns: int, _size: int) -> dict[str, str]:
     out: dict[str, str] = {}
     for raw in refs_path.read_text(encoding="utf-8", errors="replace").splitlines():
         line = raw.strip()
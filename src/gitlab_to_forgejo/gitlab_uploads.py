@@ -1,83 +1,110 @@
 from __future__ import annotations
 
 import re
+import shutil
 import tarfile
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping
 from dataclasses import dataclass
 from pathlib import Path
+from typing import IO
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GitLabProjectUpload:
     disk_path: str
     upload_hash: str
     filename: str
 
 
+# The `/uploads/` prefix is matched case-sensitively (GitLab always emits it lowercase) so bodies
+# without it can be skipped with a plain substring check before running the regex.
+_GITLAB_UPLOAD_URL_PREFIX = "/uploads/"
 _GITLAB_UPLOAD_URL_RE = re.compile(
-    r"(?P<url>/uploads/(?P<hash>[0-9a-f]{32})/(?P<filename>[^\s)\]\"'>]+))",
-    re.IGNORECASE,
+    r"(?P<url>/uploads/(?P<hash>[0-9a-fA-F]{32})/(?P<filename>[^\s)\]\"'>]+))"
 )
 
 
+def mentions_gitlab_uploads(text: str) -> bool:
+    """Cheap pre-filter: False means `text` cannot contain a GitLab upload URL."""
+    return _GITLAB_UPLOAD_URL_PREFIX in text
+
+
 def iter_gitlab_upload_urls(text: str) -> list[tuple[str, str, str]]:
     """
     Return a list of GitLab `/uploads/<hash>/<filename>` URLs found in `text`.
 
     The returned tuples are: (url, upload_hash, filename), in the order they appear.
     """
-    out: list[tuple[str, str, str]] = []
-    for m in _GITLAB_UPLOAD_URL_RE.finditer(text):
-        url = m.group("url")
-        upload_hash = m.group("hash").lower()
-        filename = m.group("filename")
-        out.append((url, upload_hash, filename))
-    return out
+    if _GITLAB_UPLOAD_URL_PREFIX not in text:
+        return []
+    return [
+        (m.group("url"), m.group("hash").lower(), m.group("filename"))
+        for m in _GITLAB_UPLOAD_URL_RE.finditer(text)
+    ]
 
 
 def replace_gitlab_upload_urls(text: str, *, mapping: Mapping[str, str]) -> str:
+    """Replace GitLab upload URLs found in `mapping` in a single regex pass over `text`."""
+    if not mapping or _GITLAB_UPLOAD_URL_PREFIX not in text:
+        return text
+    get = mapping.get
+
+    # The whole match is the URL, so group 0 avoids a named-group lookup per match.
     def repl(match: re.Match[str]) -> str:
-        url = match.group("url")
-        return mapping.get(url, url)
+        url = match[0]
+        return get(url, url)
 
     return _GITLAB_UPLOAD_URL_RE.sub(repl, text)
 
 
-def read_user_avatars_from_uploads(
+# Archive members are keyed by GitLab user id (avatars) or by project upload.
+_UploadKey = int | GitLabProjectUpload
+
+
+def _avatar_member_names(user_id: int, filename: str | None) -> tuple[str, ...]:
+    if not filename:
+        return ()
+    return (
+        f"./-/system/user/avatar/{user_id}/{filename}",
+        f"-/system/user/avatar/{user_id}/{filename}",
+    )
+
+
+def _upload_member_names(upload: GitLabProjectUpload) -> tuple[str, ...]:
+    disk_path = upload.disk_path.strip().lstrip("./")
+    upload_hash = upload.upload_hash.strip()
+    filename = upload.filename.strip()
+    if not disk_path or not upload_hash or not filename:
+        return ()
+    return (
+        f"./{disk_path}/{upload_hash}/{filename}",
+        f"{disk_path}/{upload_hash}/{filename}",
+    )
+
+
+def _iter_wanted_members(
     uploads_tar_path: Path,
-    *,
-    desired: Mapping[int, str | None],
-) -> dict[int, bytes]:
+    names_by_key: Mapping[_UploadKey, tuple[str, ...]],
+) -> Iterator[tuple[_UploadKey, IO[bytes]]]:
     """
-    Extract user avatar bytes from a GitLab backup `uploads.tar(.gz)` archive.
-
-    GitLab stores avatars under:
-      `./-/system/user/avatar/<user_id>/<filename>`
+    Stream `uploads_tar_path` once, yielding `(key, fileobj)` for the first regular file matching
+    any of each key's candidate member names. Stops reading once every key was found.
     """
-    wanted_by_name: dict[str, int] = {}
-    names_by_user_id: dict[int, tuple[str, ...]] = {}
-    for user_id, filename in desired.items():
-        if not filename:
-            continue
-        candidates = (
-            f"./-/system/user/avatar/{user_id}/{filename}",
-            f"-/system/user/avatar/{user_id}/{filename}",
-        )
-        names_by_user_id[user_id] = candidates
-        for name in candidates:
-            wanted_by_name[name] = user_id
+    wanted_by_name: dict[str, _UploadKey] = {}
+    for key, names in names_by_key.items():
+        for name in names:
+            wanted_by_name[name] = key
 
     if not wanted_by_name:
-        return {}
+        return
 
-    remaining_user_ids = set(names_by_user_id)
-    out: dict[int, bytes] = {}
+    remaining = {key for key, names in names_by_key.items() if names}
 
     mode = "r|gz" if uploads_tar_path.name.endswith(".gz") else "r|"
     with tarfile.open(uploads_tar_path, mode) as tf:
         for member in tf:
-            user_id = wanted_by_name.get(member.name)
-            if user_id is None or user_id not in remaining_user_ids:
+            key = wanted_by_name.get(member.name)
+            if key is None or key not in remaining:
                 continue
             if not member.isfile():
                 continue
@@ -85,71 +112,67 @@ def read_user_avatars_from_uploads(
             if f is None:
                 continue
             with f:
-                out[user_id] = f.read()
+                yield key, f
 
-            remaining_user_ids.remove(user_id)
-            for name in names_by_user_id.get(user_id, ()):
+            remaining.remove(key)
+            for name in names_by_key[key]:
                 wanted_by_name.pop(name, None)
-            if not remaining_user_ids:
+            if not remaining:
                 break
 
-    return out
-
 
-def read_project_uploads_from_uploads(
+def iter_user_avatars_from_uploads(
     uploads_tar_path: Path,
     *,
-    desired: set[GitLabProjectUpload],
-) -> dict[GitLabProjectUpload, bytes]:
+    desired: Mapping[int, str | None],
+) -> Iterator[tuple[int, bytes]]:
     """
-    Extract per-project upload bytes referenced as `/uploads/<hash>/<filename>`.
+    Yield `(user_id, avatar_bytes)` from a GitLab backup `uploads.tar(.gz)` in archive order.
 
-    In a GitLab backup, these are stored under:
-      `./<project_disk_path>/<upload_hash>/<filename>`
+    GitLab stores avatars under:
+      `./-/system/user/avatar/<user_id>/<filename>`
     """
-    wanted_by_name: dict[str, GitLabProjectUpload] = {}
-    names_by_upload: dict[GitLabProjectUpload, tuple[str, ...]] = {}
-    for upload in desired:
-        disk_path = upload.disk_path.strip().lstrip("./")
-        if not disk_path:
-            continue
-        upload_hash = upload.upload_hash.strip()
-        filename = upload.filename.strip()
-        if not upload_hash or not filename:
-            continue
-
-        candidates = (
-            f"./{disk_path}/{upload_hash}/{filename}",
-            f"{disk_path}/{upload_hash}/{filename}",
-        )
-        names_by_upload[upload] = candidates
-        for name in candidates:
-            wanted_by_name[name] = upload
+    names_by_user_id: dict[_UploadKey, tuple[str, ...]] = {
+        user_id: _avatar_member_names(user_id, filename) for user_id, filename in desired.items()
+    }
+    for user_id, f in _iter_wanted_members(uploads_tar_path, names_by_user_id):
+        assert isinstance(user_id, int)
+        yield user_id, f.read()
 
-    if not wanted_by_name:
-        return {}
 
-    remaining = set(names_by_upload)
-    out: dict[GitLabProjectUpload, bytes] = {}
+@dataclass(frozen=True)
+class ExtractedUploads:
+    avatar_path_by_user_id: dict[int, Path]
+    upload_path_by_upload: dict[GitLabProjectUpload, Path]
 
-    mode = "r|gz" if uploads_tar_path.name.endswith(".gz") else "r|"
-    with tarfile.open(uploads_tar_path, mode) as tf:
-        for member in tf:
-            upload = wanted_by_name.get(member.name)
-            if upload is None or upload not in remaining:
-                continue
-            if not member.isfile():
-                continue
-            f = tf.extractfile(member)
-            if f is None:
-                continue
-            with f:
-                out[upload] = f.read()
 
-            remaining.remove(upload)
-            for name in names_by_upload.get(upload, ()):
-                wanted_by_name.pop(name, None)
-            if not remaining:
-                break
+def extract_uploads(
+    uploads_tar_path: Path,
+    *,
+    desired_avatars: Mapping[int, str | None],
+    desired_uploads: set[GitLabProjectUpload],
+    dest_dir: Path,
+) -> ExtractedUploads:
+    """
+    Extract user avatars and project uploads to `dest_dir` in a single pass over the archive.
 
+    `uploads.tar.gz` can only be read sequentially, so scanning it once for both kinds of file
+    avoids inflating the whole archive twice.
+    """
+    names_by_key: dict[_UploadKey, tuple[str, ...]] = {}
+    for user_id, filename in desired_avatars.items():
+        names_by_key[user_id] = _avatar_member_names(user_id, filename)
+    for upload in desired_uploads:
+        names_by_key[upload] = _upload_member_names(upload)
+
+    out = ExtractedUploads(avatar_path_by_user_id={}, upload_path_by_upload={})
+    for idx, (key, f) in enumerate(_iter_wanted_members(uploads_tar_path, names_by_key)):
+        if isinstance(key, GitLabProjectUpload):
+            path = dest_dir / f"{idx:06d}-{key.upload_hash}"
+            out.upload_path_by_upload[key] = path
+        else:
+            path = dest_dir / f"{idx:06d}-avatar-{key}"
+            out.avatar_path_by_user_id[key] = path
+        with path.open("wb") as dst:
+            shutil.copyfileobj(f, dst)
     return out
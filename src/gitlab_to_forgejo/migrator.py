@@ -2,11 +2,22 @@ from __future__ import annotations
 
 import base64
 import logging
+import random
 import re
+import tempfile
+import threading
 import time
-from collections.abc import Iterator, Mapping
+from bisect import bisect_right
+from collections import defaultdict, deque
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Protocol
+from dataclasses import dataclass
+from enum import Enum
+from functools import partial
+from itertools import chain
+from pathlib import Path
+from typing import IO, Protocol
 
 from gitlab_to_forgejo.forgejo_client import ForgejoError
 from gitlab_to_forgejo.forgejo_db import (
@@ -21,13 +32,22 @@ from gitlab_to_forgejo.forgejo_wiki import ensure_wiki_repo_exists
 from gitlab_to_forgejo.git_push import push_bundle_http
 from gitlab_to_forgejo.git_refs import guess_default_branch, list_wiki_push_refspecs, read_ref_shas
 from gitlab_to_forgejo.gitlab_uploads import (
+    ExtractedUploads,
     GitLabProjectUpload,
+    extract_uploads,
     iter_gitlab_upload_urls,
-    read_project_uploads_from_uploads,
-    read_user_avatars_from_uploads,
+    iter_user_avatars_from_uploads,
+    mentions_gitlab_uploads,
     replace_gitlab_upload_urls,
 )
-from gitlab_to_forgejo.plan_builder import Plan
+from gitlab_to_forgejo.plan_builder import (
+    IssuePlan,
+    LabelPlan,
+    MergeRequestPlan,
+    NotePlan,
+    Plan,
+    RepoPlan,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +86,71 @@ def _format_duration(seconds: float) -> str:
     return "".join(parts)
 
 
+_LOG_BODY_LIMIT = 256
+
+
+def _truncate_body(body: str, *, limit: int = _LOG_BODY_LIMIT) -> str:
+    if len(body) <= limit:
+        return body
+    return body[:limit] + f"… ({len(body)} chars)"
+
+
+def _run_tasks(tasks: Iterable[Callable[[], None]], *, concurrency: int) -> None:
+    """Run independent tasks, up to `concurrency` at a time.
+
+    Tasks are expected to log and swallow their own errors, like the sequential loops do.
+    """
+    if concurrency <= 1:
+        for task in tasks:
+            task()
+        return
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        # Bound the number of queued tasks so lazily produced inputs are not all materialized.
+        pending: deque[Future[None]] = deque()
+        for task in tasks:
+            if len(pending) >= 2 * concurrency:
+                pending.popleft().result()
+            pending.append(pool.submit(task))
+        for future in pending:
+            future.result()
+
+
+def _run_in_order(tasks: Iterable[Callable[[], None]]) -> None:
+    for task in tasks:
+        task()
+
+
+def _log_progress(label: str, idx: int, total: int, *, started_ns: int) -> None:
+    avg_ns = (time.monotonic_ns() - started_ns) // idx
+    logger.info(
+        "%s progress: %d/%d (avg %.2fs, eta %s)",
+        label,
+        idx,
+        total,
+        avg_ns / 1e9,
+        _format_duration(avg_ns * (total - idx) / 1e9),
+    )
+
+
+class _Progress:
+    """Thread-safe counterpart of the `enumerate` + `_log_progress` pattern for task pools."""
+
+    def __init__(self, label: str, total: int, *, min_step: int = 25) -> None:
+        self._label = label
+        self._total = total
+        self._step = _progress_step(total, min_step=min_step)
+        self._started_ns = time.monotonic_ns()
+        self._idx = 0
+        self._lock = threading.Lock()
+
+    def advance(self) -> None:
+        with self._lock:
+            self._idx += 1
+            idx = self._idx
+        if idx == 1 or idx % self._step == 0 or idx == self._total:
+            _log_progress(self._label, idx, self._total, started_ns=self._started_ns)
+
+
 class _ForgejoOps(Protocol):
     def ensure_user(self, *, username: str, email: str, full_name: str, password: str) -> None: ...
 
@@ -170,7 +255,7 @@ class _ForgejoRepoOps(_ForgejoOps, Protocol):
         repo: str,
         issue_number: int,
         filename: str,
-        content: bytes,
+        content: bytes | IO[bytes],
         sudo: str | None,
     ) -> Mapping[str, object]: ...
 
@@ -181,7 +266,7 @@ class _ForgejoRepoOps(_ForgejoOps, Protocol):
         repo: str,
         comment_id: int,
         filename: str,
-        content: bytes,
+        content: bytes | IO[bytes],
         sudo: str | None,
     ) -> Mapping[str, object]: ...
 
@@ -208,36 +293,33 @@ class _ForgejoRepoOps(_ForgejoOps, Protocol):
     ) -> list[Mapping[str, object]]: ...
 
 
+# GitLab access levels at which a member moves up a team: developer, maintainer, owner.
+_MEMBER_LEVEL_THRESHOLDS = (30, 40, 50)
+
+
 def _iter_members_by_level(
     members: Mapping[str, int],
 ) -> tuple[list[str], list[str], list[str], list[str]]:
-    owners: list[str] = []
-    maintainers: list[str] = []
-    developers: list[str] = []
     reporters: list[str] = []
+    developers: list[str] = []
+    maintainers: list[str] = []
+    owners: list[str] = []
+    buckets = (reporters.append, developers.append, maintainers.append, owners.append)
 
-    for username, lvl in members.items():
-        if lvl >= 50:
-            owners.append(username)
-        elif lvl >= 40:
-            maintainers.append(username)
-        elif lvl >= 30:
-            developers.append(username)
-        else:
-            reporters.append(username)
+    # One sort up front keeps every bucket sorted as it is filled.
+    for username in sorted(members):
+        buckets[bisect_right(_MEMBER_LEVEL_THRESHOLDS, members[username])](username)
 
-    owners.sort()
-    maintainers.sort()
-    developers.sort()
-    reporters.sort()
     return owners, maintainers, developers, reporters
 
 
-_NON_USERNAME_CHARS_RE = re.compile(r"[^a-z0-9_.-]+", re.IGNORECASE)
+# Applied to the lowercased name, so the class needs no IGNORECASE (which would also let
+# non-ASCII letters that case-fold to ASCII, such as the long s, through).
+_NON_USERNAME_CHARS_RE = re.compile(r"[^a-z0-9_.-]+")
 
 
 def _fallback_username(gitlab_username: str, gitlab_user_id: int) -> str:
-    base = _NON_USERNAME_CHARS_RE.sub("-", gitlab_username).strip("._-").lower()
+    base = _NON_USERNAME_CHARS_RE.sub("-", gitlab_username.lower()).strip("._-")
     if not base:
         base = "user"
 
@@ -254,14 +336,14 @@ def _fallback_username(gitlab_username: str, gitlab_user_id: int) -> str:
 def _is_username_creation_error(err: ForgejoError) -> bool:
     if err.status_code != 422:
         return False
-    msg = err.body.lower()
+    msg = err.normalized_body
     return ("reserved" in msg or "invalid" in msg) and ("name" in msg or "username" in msg)
 
 
 def _is_duplicate_ssh_key_error(err: ForgejoError) -> bool:
     if err.status_code != 422:
         return False
-    msg = " ".join(err.body.lower().split())
+    msg = err.normalized_body
     return (
         "already exist" in msg
         or "already used" in msg
@@ -270,27 +352,31 @@ def _is_duplicate_ssh_key_error(err: ForgejoError) -> bool:
     )
 
 
-def _is_transient_target_not_found(err: ForgejoError) -> bool:
-    if err.status_code != 404:
-        return False
-    msg = err.body.lower().replace(" ", "")
-    return (
-        "targetcouldn'tbefound" in msg or "targetcouldn\\u0027tbefound" in msg
-    ) and '"errors":[]' in msg
-
-
-def _is_missing_pull_request_base(err: ForgejoError) -> bool:
-    if err.status_code != 404:
-        return False
-    msg = err.body.lower()
-    return "could not find" in msg and "base repository" in msg
-
-
-def _is_no_changes_between_head_and_base(err: ForgejoError) -> bool:
-    if err.status_code != 422:
-        return False
-    msg = " ".join(err.body.lower().split())
-    return "no changes between the head and the base" in msg
+class _PullRequestError(Enum):
+    MISSING_BASE = "missing_base"
+    NO_CHANGES = "no_changes"
+    TRANSIENT = "transient"
+    OTHER = "other"
+
+
+def _classify_pull_request_error(err: ForgejoError) -> _PullRequestError:
+    """Classify a `create_pull_request` failure from its (cached) normalized body."""
+    if err.status_code not in (404, 422):
+        return _PullRequestError.OTHER
+    msg = err.normalized_body
+    if err.status_code == 422:
+        if "no changes between the head and the base" in msg:
+            return _PullRequestError.NO_CHANGES
+        return _PullRequestError.OTHER
+    if "could not find" in msg and "base repository" in msg:
+        return _PullRequestError.MISSING_BASE
+    # Forgejo briefly answers 404 "The target couldn't be found." right after a push.
+    compact = msg.replace(" ", "")
+    if (
+        "targetcouldn'tbefound" in compact or "targetcouldn\\u0027tbefound" in compact
+    ) and '"errors":[]' in compact:
+        return _PullRequestError.TRANSIENT
+    return _PullRequestError.OTHER
 
 
 def apply_plan(plan: Plan, client: _ForgejoOps, *, user_password: str) -> dict[str, str]:
@@ -312,7 +398,7 @@ def apply_plan(plan: Plan, client: _ForgejoOps, *, user_password: str) -> dict[s
                     user.username,
                     user.gitlab_user_id,
                     err.status_code,
-                    err.body,
+                    _truncate_body(err.body),
                 )
                 continue
             fallback = _fallback_username(user.username, user.gitlab_user_id)
@@ -331,7 +417,7 @@ def apply_plan(plan: Plan, client: _ForgejoOps, *, user_password: str) -> dict[s
                     user.gitlab_user_id,
                     fallback,
                     err2.status_code,
-                    err2.body,
+                    _truncate_body(err2.body),
                 )
                 continue
             except Exception:
@@ -356,24 +442,29 @@ def apply_plan(plan: Plan, client: _ForgejoOps, *, user_password: str) -> dict[s
         if forgejo_username:
             forgejo_user_by_gitlab_user_id[user.gitlab_user_id] = forgejo_username
 
-    org_by_project_id = {r.gitlab_project_id: r.owner for r in plan.repos}
-    extra_members_by_org: dict[str, set[str]] = {o.name: set() for o in plan.orgs}
+    # Collect distinct (project, author) ids first; there are far fewer of those than notes, so
+    # the org and username lookups below run once per pair instead of once per item.
+    author_ids_by_project: defaultdict[int, set[int]] = defaultdict(set)
+    for project_id, author_id in chain(
+        ((issue.gitlab_project_id, issue.author_id) for issue in plan.issues),
+        ((mr.gitlab_target_project_id, mr.author_id) for mr in plan.merge_requests),
+        ((note.gitlab_project_id, note.author_id) for note in plan.notes),
+    ):
+        author_ids_by_project[project_id].add(author_id)
 
-    def add_interactor(project_id: int, user_id: int) -> None:
+    org_by_project_id = {r.gitlab_project_id: r.owner for r in plan.repos}
+    extra_members_by_org: defaultdict[str, set[str]] = defaultdict(set)
+    for project_id, author_ids in author_ids_by_project.items():
         org = org_by_project_id.get(project_id)
         if not org:
-            return
-        username = forgejo_user_by_gitlab_user_id.get(user_id)
-        if not username:
-            return
-        extra_members_by_org.setdefault(org, set()).add(username)
-
-    for issue in plan.issues:
-        add_interactor(issue.gitlab_project_id, issue.author_id)
-    for mr in plan.merge_requests:
-        add_interactor(mr.gitlab_target_project_id, mr.author_id)
-    for note in plan.notes:
-        add_interactor(note.gitlab_project_id, note.author_id)
+            continue
+        usernames = {
+            username
+            for author_id in author_ids
+            if (username := forgejo_user_by_gitlab_user_id.get(author_id))
+        }
+        if usernames:
+            extra_members_by_org[org].update(usernames)
 
     for org in plan.orgs:
         try:
@@ -383,7 +474,7 @@ def apply_plan(plan: Plan, client: _ForgejoOps, *, user_password: str) -> dict[s
                 "Create org failed for %s status=%s body=%r",
                 org.name,
                 err.status_code,
-                err.body,
+                _truncate_body(err.body),
             )
             continue
         except Exception:
@@ -413,7 +504,7 @@ def apply_plan(plan: Plan, client: _ForgejoOps, *, user_password: str) -> dict[s
                     "Get owner team failed for org=%s status=%s body=%r",
                     org.name,
                     err.status_code,
-                    err.body,
+                    _truncate_body(err.body),
                 )
                 owner_team_id = None
             except Exception:
@@ -429,7 +520,7 @@ def apply_plan(plan: Plan, client: _ForgejoOps, *, user_password: str) -> dict[s
                             org.name,
                             username,
                             err.status_code,
-                            err.body,
+                            _truncate_body(err.body),
                         )
                     except Exception:
                         logger.exception(
@@ -451,7 +542,7 @@ def apply_plan(plan: Plan, client: _ForgejoOps, *, user_password: str) -> dict[s
                     "Ensure team failed org=%s team=Maintainers status=%s body=%r",
                     org.name,
                     err.status_code,
-                    err.body,
+                    _truncate_body(err.body),
                 )
                 team_id = None
             except Exception:
@@ -468,7 +559,7 @@ def apply_plan(plan: Plan, client: _ForgejoOps, *, user_password: str) -> dict[s
                             org.name,
                             username,
                             err.status_code,
-                            err.body,
+                            _truncate_body(err.body),
                         )
                     except Exception:
                         logger.exception(
@@ -490,7 +581,7 @@ def apply_plan(plan: Plan, client: _ForgejoOps, *, user_password: str) -> dict[s
                     "Ensure team failed org=%s team=Developers status=%s body=%r",
                     org.name,
                     err.status_code,
-                    err.body,
+                    _truncate_body(err.body),
                 )
                 team_id = None
             except Exception:
@@ -507,7 +598,7 @@ def apply_plan(plan: Plan, client: _ForgejoOps, *, user_password: str) -> dict[s
                             org.name,
                             username,
                             err.status_code,
-                            err.body,
+                            _truncate_body(err.body),
                         )
                     except Exception:
                         logger.exception(
@@ -529,7 +620,7 @@ def apply_plan(plan: Plan, client: _ForgejoOps, *, user_password: str) -> dict[s
                     "Ensure team failed org=%s team=Reporters status=%s body=%r",
                     org.name,
                     err.status_code,
-                    err.body,
+                    _truncate_body(err.body),
                 )
                 team_id = None
             except Exception:
@@ -546,7 +637,7 @@ def apply_plan(plan: Plan, client: _ForgejoOps, *, user_password: str) -> dict[s
                             org.name,
                             username,
                             err.status_code,
-                            err.body,
+                            _truncate_body(err.body),
                         )
                     except Exception:
                         logger.exception(
@@ -579,7 +670,7 @@ def apply_repos(plan: Plan, client: _ForgejoRepoOps, *, private: bool) -> None:
                 repo.owner,
                 repo.name,
                 err.status_code,
-                err.body,
+                _truncate_body(err.body),
             )
             continue
         except Exception:
@@ -587,57 +678,105 @@ def apply_repos(plan: Plan, client: _ForgejoRepoOps, *, private: bool) -> None:
             continue
 
 
-def push_repos(plan: Plan, *, forgejo_url: str, git_username: str, git_token: str) -> None:
+def push_repos(
+    plan: Plan, *, forgejo_url: str, git_username: str, git_token: str, concurrency: int = 1
+) -> None:
     base = forgejo_url.rstrip("/")
     total = len(plan.repos)
     if total:
         logger.info("Pushing git repositories (%d)", total)
-    for idx, repo in enumerate(plan.repos, start=1):
-        logger.info("Git push repo %d/%d %s/%s", idx, total, repo.owner, repo.name)
-        try:
-            push_bundle_http(
-                bundle_path=repo.bundle_path,
-                refs_path=repo.refs_path,
-                remote_url=f"{base}/{repo.owner}/{repo.name}.git",
-                username=git_username,
-                token=git_token,
+    # Each push is its own git subprocess against a distinct repo, so they are independent.
+    _run_tasks(
+        (
+            partial(
+                _push_repo,
+                repo,
+                base=base,
+                git_username=git_username,
+                git_token=git_token,
+                idx=idx,
+                total=total,
             )
-        except Exception:
-            logger.exception("Push repo failed for %s/%s", repo.owner, repo.name)
-            continue
+            for idx, repo in enumerate(plan.repos, start=1)
+        ),
+        concurrency=concurrency,
+    )
+
+
+def _push_repo(
+    repo: RepoPlan, *, base: str, git_username: str, git_token: str, idx: int, total: int
+) -> None:
+    logger.info("Git push repo %d/%d %s/%s", idx, total, repo.owner, repo.name)
+    try:
+        push_bundle_http(
+            bundle_path=repo.bundle_path,
+            refs_path=repo.refs_path,
+            remote_url=f"{base}/{repo.owner}/{repo.name}.git",
+            username=git_username,
+            token=git_token,
+        )
+    except Exception:
+        logger.exception("Push repo failed for %s/%s", repo.owner, repo.name)
 
 
-def push_wikis(plan: Plan, *, forgejo_url: str, git_username: str, git_token: str) -> None:
+def push_wikis(
+    plan: Plan, *, forgejo_url: str, git_username: str, git_token: str, concurrency: int = 1
+) -> None:
     base = forgejo_url.rstrip("/")
     if plan.repos:
         logger.info("Pushing git wikis (best-effort)")
     total = len(plan.repos)
+    tasks: list[Callable[[], None]] = []
     for idx, repo in enumerate(plan.repos, start=1):
         refspecs = list_wiki_push_refspecs(repo.wiki_refs_path)
         if not refspecs or not repo.wiki_bundle_path.exists():
             continue
-        logger.info("Git push wiki %d/%d %s/%s", idx, total, repo.owner, repo.name)
-        try:
-            ensure_wiki_repo_exists(owner=repo.owner, repo=repo.name)
-        except Exception:
-            logger.exception("Ensure wiki repo failed for %s/%s", repo.owner, repo.name)
-            continue
-        try:
-            push_bundle_http(
-                bundle_path=repo.wiki_bundle_path,
-                refs_path=repo.wiki_refs_path,
-                remote_url=f"{base}/{repo.owner}/{repo.name}.wiki.git",
-                username=git_username,
-                token=git_token,
-                refspecs=refspecs,
+        tasks.append(
+            partial(
+                _push_wiki,
+                repo,
+                refspecs,
+                base=base,
+                git_username=git_username,
+                git_token=git_token,
+                idx=idx,
+                total=total,
             )
-        except Exception:
-            logger.exception("Push wiki failed for %s/%s", repo.owner, repo.name)
-            continue
+        )
+    _run_tasks(tasks, concurrency=concurrency)
+
+
+def _push_wiki(
+    repo: RepoPlan,
+    refspecs: list[str],
+    *,
+    base: str,
+    git_username: str,
+    git_token: str,
+    idx: int,
+    total: int,
+) -> None:
+    logger.info("Git push wiki %d/%d %s/%s", idx, total, repo.owner, repo.name)
+    try:
+        ensure_wiki_repo_exists(owner=repo.owner, repo=repo.name)
+    except Exception:
+        logger.exception("Ensure wiki repo failed for %s/%s", repo.owner, repo.name)
+        return
+    try:
+        push_bundle_http(
+            bundle_path=repo.wiki_bundle_path,
+            refs_path=repo.wiki_refs_path,
+            remote_url=f"{base}/{repo.owner}/{repo.name}.wiki.git",
+            username=git_username,
+            token=git_token,
+            refspecs=refspecs,
+        )
+    except Exception:
+        logger.exception("Push wiki failed for %s/%s", repo.owner, repo.name)
 
 
 def push_merge_request_heads(
-    plan: Plan, *, forgejo_url: str, git_username: str, git_token: str
+    plan: Plan, *, forgejo_url: str, git_username: str, git_token: str, concurrency: int = 1
 ) -> None:
     """Create synthetic branches in Forgejo for GitLab MRs missing source/target branches.
 
@@ -650,9 +789,9 @@ def push_merge_request_heads(
     base branch `gitlab-mr-base-iid-<iid>` pointing at `merge_request_diffs.base_commit_sha`.
     """
     base = forgejo_url.rstrip("/")
-    repo_by_project_id = {r.gitlab_project_id: r for r in plan.repos}
+    repo_by_project_id = plan.repo_by_project_id
     refs_by_project_id: dict[int, dict[str, str]] = {}
-    refspecs_by_project_id: dict[int, list[str]] = {}
+    refspecs_by_project_id: defaultdict[int, list[str]] = defaultdict(list)
 
     if plan.merge_requests:
         logger.info("Pushing merge request helper branches (%d)", len(plan.merge_requests))
@@ -676,59 +815,102 @@ def push_merge_request_heads(
         if sha:
             branch_name = f"gitlab-mr-iid-{mr.gitlab_mr_iid}"
             refspec = f"{sha}:refs/heads/{branch_name}"
-            refspecs_by_project_id.setdefault(repo.gitlab_project_id, []).append(refspec)
+            refspecs_by_project_id[repo.gitlab_project_id].append(refspec)
 
         target_branch_ref = f"refs/heads/{mr.target_branch}"
         if target_branch_ref not in refs and mr.base_commit_sha:
             branch_name = f"gitlab-mr-base-iid-{mr.gitlab_mr_iid}"
             refspec = f"{mr.base_commit_sha}:refs/heads/{branch_name}"
-            refspecs_by_project_id.setdefault(repo.gitlab_project_id, []).append(refspec)
-
-    for project_id, refspecs in refspecs_by_project_id.items():
-        repo = repo_by_project_id[project_id]
-        try:
-            push_bundle_http(
-                bundle_path=repo.bundle_path,
-                refs_path=repo.refs_path,
-                remote_url=f"{base}/{repo.owner}/{repo.name}.git",
-                username=git_username,
-                token=git_token,
-                refspecs=sorted(set(refspecs)),
+            refspecs_by_project_id[repo.gitlab_project_id].append(refspec)
+
+    _run_tasks(
+        (
+            partial(
+                _push_merge_request_branches,
+                repo_by_project_id[project_id],
+                sorted(set(refspecs)),
+                base=base,
+                git_username=git_username,
+                git_token=git_token,
             )
-        except Exception:
-            logger.exception("Push merge request branches failed for %s/%s", repo.owner, repo.name)
-            continue
+            for project_id, refspecs in refspecs_by_project_id.items()
+        ),
+        concurrency=concurrency,
+    )
+
+
+def _push_merge_request_branches(
+    repo: RepoPlan, refspecs: list[str], *, base: str, git_username: str, git_token: str
+) -> None:
+    try:
+        push_bundle_http(
+            bundle_path=repo.bundle_path,
+            refs_path=repo.refs_path,
+            remote_url=f"{base}/{repo.owner}/{repo.name}.git",
+            username=git_username,
+            token=git_token,
+            refspecs=refspecs,
+        )
+    except Exception:
+        logger.exception("Push merge request branches failed for %s/%s", repo.owner, repo.name)
 
 
 def apply_issues(
-    plan: Plan, client: _ForgejoRepoOps, *, user_by_id: Mapping[int, str]
+    plan: Plan,
+    client: _ForgejoRepoOps,
+    *,
+    user_by_id: Mapping[int, str],
+    concurrency: int = 1,
 ) -> dict[int, int]:
-    repo_by_project_id = {r.gitlab_project_id: r for r in plan.repos}
+    repo_by_project_id = plan.repo_by_project_id
     issue_number_by_gitlab_issue_id: dict[int, int] = {}
 
     total = len(plan.issues)
     if total:
         logger.info("Importing issues (%d)", total)
-    step = _progress_step(total)
-    started = time.monotonic()
-
-    for idx, issue in enumerate(plan.issues, start=1):
-        if total and (idx == 1 or idx % step == 0 or idx == total):
-            elapsed = time.monotonic() - started
-            avg = elapsed / idx if idx else 0.0
-            eta = avg * (total - idx)
-            logger.info(
-                "Issues progress: %d/%d (avg %.2fs, eta %s)",
-                idx,
-                total,
-                avg,
-                _format_duration(eta),
-            )
-        repo = repo_by_project_id.get(issue.gitlab_project_id)
+    progress = _Progress("Issues", total)
+
+    issues_by_project_id: defaultdict[int, list[IssuePlan]] = defaultdict(list)
+    for issue in plan.issues:
+        issues_by_project_id[issue.gitlab_project_id].append(issue)
+
+    # Forgejo numbers issues per repo in creation order, so a repo's issues are created by a
+    # single task; only different repos run concurrently.
+    tasks: list[Callable[[], None]] = []
+    for project_id, issues in issues_by_project_id.items():
+        repo = repo_by_project_id.get(project_id)
         if repo is None:
-            logger.error("No repo found for issue project_id=%s", issue.gitlab_project_id)
+            for _issue in issues:
+                progress.advance()
+                logger.error("No repo found for issue project_id=%s", project_id)
             continue
+        tasks.append(
+            partial(
+                _create_repo_issues,
+                client,
+                repo,
+                issues,
+                user_by_id=user_by_id,
+                progress=progress,
+                issue_number_by_gitlab_issue_id=issue_number_by_gitlab_issue_id,
+            )
+        )
+    _run_tasks(tasks, concurrency=concurrency)
+
+    return issue_number_by_gitlab_issue_id
 
+
+def _create_repo_issues(
+    client: _ForgejoRepoOps,
+    repo: RepoPlan,
+    issues: list[IssuePlan],
+    *,
+    user_by_id: Mapping[int, str],
+    progress: _Progress,
+    issue_number_by_gitlab_issue_id: dict[int, int],
+) -> None:
+    for issue in issues:
+        progress.advance()
         sudo = user_by_id.get(issue.author_id)
         try:
             resp = client.create_issue(
@@ -747,7 +929,7 @@ def apply_issues(
                 issue.gitlab_issue_id,
                 sudo,
                 err.status_code,
-                err.body,
+                _truncate_body(err.body),
             )
             continue
         except Exception:
@@ -760,14 +942,15 @@ def apply_issues(
                 sudo,
             )
             continue
-        number = int(resp["number"])
-        issue_number_by_gitlab_issue_id[issue.gitlab_issue_id] = number
-
-    return issue_number_by_gitlab_issue_id
+        issue_number_by_gitlab_issue_id[issue.gitlab_issue_id] = int(resp["number"])
 
 
 def apply_issues_db_fast(
-    plan: Plan, client: _ForgejoRepoOps, *, user_by_id: Mapping[int, str]
+    plan: Plan,
+    client: _ForgejoRepoOps,
+    *,
+    user_by_id: Mapping[int, str],
+    concurrency: int = 1,
 ) -> dict[int, int]:
     issue_number_by_gitlab_issue_id = {
         issue.gitlab_issue_id: issue.gitlab_issue_iid for issue in plan.issues
@@ -785,340 +968,147 @@ def apply_issues_db_fast(
         apply_metadata_fix_sql(sql)
     except Exception:
         logger.exception("Fast DB issue import failed; falling back to API issue import")
-        return apply_issues(plan, client, user_by_id=user_by_id)
+        return apply_issues(plan, client, user_by_id=user_by_id, concurrency=concurrency)
     return issue_number_by_gitlab_issue_id
 
 
-def apply_merge_requests(
-    plan: Plan, client: _ForgejoRepoOps, *, user_by_id: Mapping[int, str]
-) -> dict[int, int]:
-    repo_by_project_id = {r.gitlab_project_id: r for r in plan.repos}
-    pr_number_by_gitlab_mr_id: dict[int, int] = {}
-    refs_by_project_id: dict[int, dict[str, str]] = {}
+_MR_IMPORTED_FROM = "_Imported from GitLab MR !{iid} ({source} → {target})_"
+_MR_TARGET_BRANCH_MISSING = (
+    "_Forgejo pull request not created because the target branch does not exist in the "
+    "GitLab backup._"
+)
+_MR_TARGET_BRANCH_UNRESOLVED = (
+    "_Forgejo pull request not created because the target branch could not be resolved in the "
+    "base repository._"
+)
+_MR_NO_CHANGES = (
+    "_Forgejo pull request not created because there are no changes between the head and base._"
+)
+_MR_PR_FAILED = "_Forgejo pull request not created because PR creation failed._"
+_MR_PR_RAISED = "_Forgejo pull request not created because PR creation raised an error._"
 
-    total = len(plan.merge_requests)
-    if total:
-        logger.info("Importing merge requests (%d)", total)
-    step = _progress_step(total)
-    started = time.monotonic()
-
-    for idx, mr in enumerate(plan.merge_requests, start=1):
-        if total and (idx == 1 or idx % step == 0 or idx == total):
-            elapsed = time.monotonic() - started
-            avg = elapsed / idx if idx else 0.0
-            eta = avg * (total - idx)
-            logger.info(
-                "Merge requests progress: %d/%d (avg %.2fs, eta %s)",
-                idx,
-                total,
-                avg,
-                _format_duration(eta),
-            )
-        repo = repo_by_project_id.get(mr.gitlab_target_project_id)
-        if repo is None:
-            logger.error("No repo found for mr target_project_id=%s", mr.gitlab_target_project_id)
-            continue
 
-        refs = refs_by_project_id.get(repo.gitlab_project_id)
-        if refs is None:
-            try:
-                refs = read_ref_shas(repo.refs_path)
-            except (FileNotFoundError, ValueError):
-                refs = {}
-            refs_by_project_id[repo.gitlab_project_id] = refs
+def _mr_fallback_issue_body(mr: MergeRequestPlan, *details: str) -> str:
+    imported = _MR_IMPORTED_FROM.format(
+        iid=mr.gitlab_mr_iid, source=mr.source_branch, target=mr.target_branch
+    )
+    if not details:
+        return f"{mr.description}\n\n{imported}".strip() if mr.description else imported
+    # Joining a single detail returns it as-is, so the common one-reason case builds one string.
+    detail_lines = "\n".join(details)
+    return f"{mr.description}\n\n{imported}\n\n{detail_lines}".strip()
 
-        source_branch_ref = f"refs/heads/{mr.source_branch}"
-        head_sha = mr.head_commit_sha or refs.get(f"refs/merge-requests/{mr.gitlab_mr_iid}/head")
-        if head_sha:
-            head = f"gitlab-mr-iid-{mr.gitlab_mr_iid}"
-        elif source_branch_ref in refs:
-            head = mr.source_branch
-        else:
-            body = "\n".join(
-                [
-                    mr.description,
-                    "",
-                    (
-                        f"_Imported from GitLab MR !{mr.gitlab_mr_iid} "
-                        f"({mr.source_branch} → {mr.target_branch})_"
-                    ),
-                ]
-            ).strip()
-            sudo = user_by_id.get(mr.author_id)
-            try:
-                resp = client.create_issue(
-                    owner=repo.owner,
-                    repo=repo.name,
-                    title=f"MR: {mr.title}",
-                    body=body,
-                    sudo=sudo,
-                )
-                number = int(resp["number"])
-                pr_number_by_gitlab_mr_id[mr.gitlab_mr_id] = number
-            except ForgejoError as err:
-                logger.error(
-                    "Create MR issue fallback failed for %s/%s GitLab MR !%s (id=%s) "
-                    "sudo=%s status=%s body=%r",
-                    repo.owner,
-                    repo.name,
-                    mr.gitlab_mr_iid,
-                    mr.gitlab_mr_id,
-                    sudo,
-                    err.status_code,
-                    err.body,
-                )
-            except Exception:
-                logger.exception(
-                    "Create MR issue fallback failed for %s/%s GitLab MR !%s (id=%s) sudo=%s",
-                    repo.owner,
-                    repo.name,
-                    mr.gitlab_mr_iid,
-                    mr.gitlab_mr_id,
-                    sudo,
-                )
-            continue
 
-        synthetic_base_branch = f"gitlab-mr-base-iid-{mr.gitlab_mr_iid}"
-        target_branch_ref = f"refs/heads/{mr.target_branch}"
-        if target_branch_ref in refs:
-            base = mr.target_branch
-        elif mr.base_commit_sha:
-            base = synthetic_base_branch
-        else:
-            body = "\n".join(
-                [
-                    mr.description,
-                    "",
-                    (
-                        f"_Imported from GitLab MR !{mr.gitlab_mr_iid} "
-                        f"({mr.source_branch} → {mr.target_branch})_"
-                    ),
-                    "",
-                    (
-                        "_Forgejo pull request not created because the target branch "
-                        "does not exist in the GitLab backup._"
-                    ),
-                ]
-            ).strip()
-            sudo = user_by_id.get(mr.author_id)
-            try:
-                resp = client.create_issue(
-                    owner=repo.owner,
-                    repo=repo.name,
-                    title=f"MR: {mr.title}",
-                    body=body,
+def _create_mr_fallback_issue(
+    client: _ForgejoRepoOps,
+    repo: RepoPlan,
+    mr: MergeRequestPlan,
+    *,
+    sudo: str | None,
+    body: str,
+) -> int | None:
+    try:
+        resp = client.create_issue(
+            owner=repo.owner,
+            repo=repo.name,
+            title=f"MR: {mr.title}",
+            body=body,
+            sudo=sudo,
+        )
+        return int(resp["number"])
+    except ForgejoError as err:
+        logger.error(
+            "Create MR issue fallback failed for %s/%s GitLab MR !%s (id=%s) "
+            "sudo=%s status=%s body=%r",
+            repo.owner,
+            repo.name,
+            mr.gitlab_mr_iid,
+            mr.gitlab_mr_id,
+            sudo,
+            err.status_code,
+            _truncate_body(err.body),
+        )
+    except Exception:
+        logger.exception(
+            "Create MR issue fallback failed for %s/%s GitLab MR !%s (id=%s) sudo=%s",
+            repo.owner,
+            repo.name,
+            mr.gitlab_mr_iid,
+            mr.gitlab_mr_id,
+            sudo,
+        )
+    return None
+
+
+# Transient PR failures (see `_classify_pull_request_error`) are retried with jittered
+# exponential backoff, bounded by an attempt count and a per-MR time budget.
+_PR_RETRY_MAX_ATTEMPTS = 6
+_PR_RETRY_BUDGET_S = 5.0
+_PR_RETRY_BASE_DELAY_S = 0.1
+_PR_RETRY_MAX_DELAY_S = 2.0
+
+
+def _pr_retry_delay(attempt: int, *, deadline: float) -> float:
+    delay = min(_PR_RETRY_MAX_DELAY_S, _PR_RETRY_BASE_DELAY_S * 2**attempt)
+    delay += random.uniform(0, _PR_RETRY_BASE_DELAY_S / 2)
+    return max(0.0, min(delay, deadline - time.monotonic()))
+
+
+def _create_pull_request_or_fallback(
+    client: _ForgejoRepoOps,
+    repo: RepoPlan,
+    mr: MergeRequestPlan,
+    *,
+    head: str,
+    base: str,
+    sudo: str | None,
+    missing_bases: set[str],
+) -> int | None:
+    """Create the PR for `mr`, falling back to an issue; returns the Forgejo number."""
+    synthetic_base_branch = f"gitlab-mr-base-iid-{mr.gitlab_mr_iid}"
+    deadline = time.monotonic() + _PR_RETRY_BUDGET_S
+    for attempt in range(_PR_RETRY_MAX_ATTEMPTS):
+        try:
+            resp = client.create_pull_request(
+                owner=repo.owner,
+                repo=repo.name,
+                title=mr.title,
+                body=mr.description,
+                head=head,
+                base=base,
+                sudo=sudo,
+            )
+        except ForgejoError as err:
+            kind = _classify_pull_request_error(err)
+            if kind is _PullRequestError.MISSING_BASE:
+                if base != synthetic_base_branch:
+                    missing_bases.add(base)
+                    if mr.base_commit_sha:
+                        base = synthetic_base_branch
+                        continue
+                return _create_mr_fallback_issue(
+                    client,
+                    repo,
+                    mr,
                     sudo=sudo,
+                    body=_mr_fallback_issue_body(mr, _MR_TARGET_BRANCH_UNRESOLVED),
                 )
-                number = int(resp["number"])
-                pr_number_by_gitlab_mr_id[mr.gitlab_mr_id] = number
-            except ForgejoError as err:
-                logger.error(
-                    "Create MR issue fallback failed for %s/%s GitLab MR !%s (id=%s) "
-                    "sudo=%s status=%s body=%r",
-                    repo.owner,
-                    repo.name,
-                    mr.gitlab_mr_iid,
-                    mr.gitlab_mr_id,
-                    sudo,
-                    err.status_code,
-                    err.body,
-                )
-            except Exception:
-                logger.exception(
-                    "Create MR issue fallback failed for %s/%s GitLab MR !%s (id=%s) sudo=%s",
-                    repo.owner,
-                    repo.name,
-                    mr.gitlab_mr_iid,
-                    mr.gitlab_mr_id,
-                    sudo,
-                )
-            continue
-
-        delays = (0.2, 0.5, 1.0)
-        resp: Mapping[str, object] | None = None
-        created_issue = False
-        sudo = user_by_id.get(mr.author_id)
-        for attempt in range(len(delays) + 1):
-            try:
-                resp = client.create_pull_request(
-                    owner=repo.owner,
-                    repo=repo.name,
-                    title=mr.title,
-                    body=mr.description,
-                    head=head,
-                    base=base,
+            if kind is _PullRequestError.NO_CHANGES:
+                return _create_mr_fallback_issue(
+                    client,
+                    repo,
+                    mr,
                     sudo=sudo,
+                    body=_mr_fallback_issue_body(mr, _MR_NO_CHANGES),
                 )
-                break
-            except ForgejoError as err:
-                if _is_missing_pull_request_base(err):
-                    if mr.base_commit_sha and base != synthetic_base_branch:
-                        base = synthetic_base_branch
-                        continue
-                    issue_body = "\n".join(
-                        [
-                            mr.description,
-                            "",
-                            (
-                                f"_Imported from GitLab MR !{mr.gitlab_mr_iid} "
-                                f"({mr.source_branch} → {mr.target_branch})_"
-                            ),
-                            "",
-                            (
-                                "_Forgejo pull request not created because the target branch "
-                                "could not be resolved in the base repository._"
-                            ),
-                        ]
-                    ).strip()
-                    try:
-                        issue_resp = client.create_issue(
-                            owner=repo.owner,
-                            repo=repo.name,
-                            title=f"MR: {mr.title}",
-                            body=issue_body,
-                            sudo=sudo,
-                        )
-                        pr_number_by_gitlab_mr_id[mr.gitlab_mr_id] = int(issue_resp["number"])
-                        created_issue = True
-                    except ForgejoError as err2:
-                        logger.error(
-                            "Create MR issue fallback failed for %s/%s GitLab MR !%s (id=%s) "
-                            "sudo=%s status=%s body=%r",
-                            repo.owner,
-                            repo.name,
-                            mr.gitlab_mr_iid,
-                            mr.gitlab_mr_id,
-                            sudo,
-                            err2.status_code,
-                            err2.body,
-                        )
-                    except Exception:
-                        logger.exception(
-                            "Create MR issue fallback failed for %s/%s GitLab MR !%s "
-                            "(id=%s) sudo=%s",
-                            repo.owner,
-                            repo.name,
-                            mr.gitlab_mr_iid,
-                            mr.gitlab_mr_id,
-                            sudo,
-                        )
-                    break
-                if _is_no_changes_between_head_and_base(err):
-                    issue_body = "\n".join(
-                        [
-                            mr.description,
-                            "",
-                            (
-                                f"_Imported from GitLab MR !{mr.gitlab_mr_iid} "
-                                f"({mr.source_branch} → {mr.target_branch})_"
-                            ),
-                            "",
-                            (
-                                "_Forgejo pull request not created because there are no changes "
-                                "between the head and base._"
-                            ),
-                        ]
-                    ).strip()
-                    try:
-                        issue_resp = client.create_issue(
-                            owner=repo.owner,
-                            repo=repo.name,
-                            title=f"MR: {mr.title}",
-                            body=issue_body,
-                            sudo=sudo,
-                        )
-                        pr_number_by_gitlab_mr_id[mr.gitlab_mr_id] = int(issue_resp["number"])
-                        created_issue = True
-                    except ForgejoError as err2:
-                        logger.error(
-                            "Create MR issue fallback failed for %s/%s GitLab MR !%s (id=%s) "
-                            "sudo=%s status=%s body=%r",
-                            repo.owner,
-                            repo.name,
-                            mr.gitlab_mr_iid,
-                            mr.gitlab_mr_id,
-                            sudo,
-                            err2.status_code,
-                            err2.body,
-                        )
-                    except Exception:
-                        logger.exception(
-                            "Create MR issue fallback failed for %s/%s GitLab MR !%s "
-                            "(id=%s) sudo=%s",
-                            repo.owner,
-                            repo.name,
-                            mr.gitlab_mr_iid,
-                            mr.gitlab_mr_id,
-                            sudo,
-                        )
-                    break
-                if not _is_transient_target_not_found(err) or attempt >= len(delays):
-                    logger.error(
-                        "Create PR failed for %s/%s GitLab MR !%s (id=%s) "
-                        "head=%s base=%s sudo=%s status=%s body=%r",
-                        repo.owner,
-                        repo.name,
-                        mr.gitlab_mr_iid,
-                        mr.gitlab_mr_id,
-                        head,
-                        base,
-                        sudo,
-                        err.status_code,
-                        err.body,
-                    )
-                    issue_body = "\n".join(
-                        [
-                            mr.description,
-                            "",
-                            (
-                                f"_Imported from GitLab MR !{mr.gitlab_mr_iid} "
-                                f"({mr.source_branch} → {mr.target_branch})_"
-                            ),
-                            "",
-                            ("_Forgejo pull request not created because PR creation failed._"),
-                            "",
-                            f"- head: `{head}`",
-                            f"- base: `{base}`",
-                            f"- error: {err.status_code} {err.body}",
-                        ]
-                    ).strip()
-                    try:
-                        issue_resp = client.create_issue(
-                            owner=repo.owner,
-                            repo=repo.name,
-                            title=f"MR: {mr.title}",
-                            body=issue_body,
-                            sudo=sudo,
-                        )
-                        pr_number_by_gitlab_mr_id[mr.gitlab_mr_id] = int(issue_resp["number"])
-                    except ForgejoError as err2:
-                        logger.error(
-                            "Create MR issue fallback failed for %s/%s GitLab MR !%s (id=%s) "
-                            "sudo=%s status=%s body=%r",
-                            repo.owner,
-                            repo.name,
-                            mr.gitlab_mr_iid,
-                            mr.gitlab_mr_id,
-                            sudo,
-                            err2.status_code,
-                            err2.body,
-                        )
-                    except Exception:
-                        logger.exception(
-                            "Create MR issue fallback failed for %s/%s GitLab MR !%s "
-                            "(id=%s) sudo=%s",
-                            repo.owner,
-                            repo.name,
-                            mr.gitlab_mr_iid,
-                            mr.gitlab_mr_id,
-                            sudo,
-                        )
-                    created_issue = True
-                    break
-                time.sleep(delays[attempt])
-            except Exception as exc:
-                logger.exception(
-                    "Create PR failed for %s/%s GitLab MR !%s (id=%s) head=%s base=%s sudo=%s",
+            if (
+                kind is not _PullRequestError.TRANSIENT
+                or attempt + 1 >= _PR_RETRY_MAX_ATTEMPTS
+                or time.monotonic() >= deadline
+            ):
+                logger.error(
+                    "Create PR failed for %s/%s GitLab MR !%s (id=%s) "
+                    "head=%s base=%s sudo=%s status=%s body=%r",
                     repo.owner,
                     repo.name,
                     mr.gitlab_mr_iid,
@@ -1126,67 +1116,196 @@ def apply_merge_requests(
                     head,
                     base,
                     sudo,
+                    err.status_code,
+                    _truncate_body(err.body),
                 )
-                issue_body = "\n".join(
-                    [
-                        mr.description,
-                        "",
-                        (
-                            f"_Imported from GitLab MR !{mr.gitlab_mr_iid} "
-                            f"({mr.source_branch} → {mr.target_branch})_"
-                        ),
-                        "",
-                        "_Forgejo pull request not created because PR creation raised an error._",
+                return _create_mr_fallback_issue(
+                    client,
+                    repo,
+                    mr,
+                    sudo=sudo,
+                    body=_mr_fallback_issue_body(
+                        mr,
+                        _MR_PR_FAILED,
                         "",
                         f"- head: `{head}`",
                         f"- base: `{base}`",
-                        f"- error: `{exc!r}`",
-                    ]
-                ).strip()
-                try:
-                    issue_resp = client.create_issue(
-                        owner=repo.owner,
-                        repo=repo.name,
-                        title=f"MR: {mr.title}",
-                        body=issue_body,
-                        sudo=sudo,
-                    )
-                    pr_number_by_gitlab_mr_id[mr.gitlab_mr_id] = int(issue_resp["number"])
-                except ForgejoError as err2:
-                    logger.error(
-                        "Create MR issue fallback failed for %s/%s GitLab MR !%s (id=%s) "
-                        "sudo=%s status=%s body=%r",
-                        repo.owner,
-                        repo.name,
-                        mr.gitlab_mr_iid,
-                        mr.gitlab_mr_id,
-                        sudo,
-                        err2.status_code,
-                        err2.body,
-                    )
-                except Exception:
-                    logger.exception(
-                        "Create MR issue fallback failed for %s/%s GitLab MR !%s (id=%s) sudo=%s",
-                        repo.owner,
-                        repo.name,
-                        mr.gitlab_mr_iid,
-                        mr.gitlab_mr_id,
-                        sudo,
-                    )
-                created_issue = True
-                break
-
-        if created_issue:
-            continue
-
-        if resp is None:
-            continue
-        number = int(resp["number"])
-        pr_number_by_gitlab_mr_id[mr.gitlab_mr_id] = number
-
+                        f"- error: {err.status_code} {err.body}",
+                    ),
+                )
+            time.sleep(_pr_retry_delay(attempt, deadline=deadline))
+        except Exception as exc:
+            logger.exception(
+                "Create PR failed for %s/%s GitLab MR !%s (id=%s) head=%s base=%s sudo=%s",
+                repo.owner,
+                repo.name,
+                mr.gitlab_mr_iid,
+                mr.gitlab_mr_id,
+                head,
+                base,
+                sudo,
+            )
+            return _create_mr_fallback_issue(
+                client,
+                repo,
+                mr,
+                sudo=sudo,
+                body=_mr_fallback_issue_body(
+                    mr,
+                    _MR_PR_RAISED,
+                    "",
+                    f"- head: `{head}`",
+                    f"- base: `{base}`",
+                    f"- error: `{exc!r}`",
+                ),
+            )
+        else:
+            return int(resp["number"])
+    return None
+
+
+def apply_merge_requests(
+    plan: Plan,
+    client: _ForgejoRepoOps,
+    *,
+    user_by_id: Mapping[int, str],
+    concurrency: int = 1,
+) -> dict[int, int]:
+    repo_by_project_id = plan.repo_by_project_id
+    pr_number_by_gitlab_mr_id: dict[int, int] = {}
+
+    total = len(plan.merge_requests)
+    if total:
+        logger.info("Importing merge requests (%d)", total)
+    progress = _Progress("Merge requests", total)
+
+    mrs_by_project_id: defaultdict[int, list[MergeRequestPlan]] = defaultdict(list)
+    for mr in plan.merge_requests:
+        mrs_by_project_id[mr.gitlab_target_project_id].append(mr)
+
+    # PRs share the issue number sequence of their repo, so each repo is handled by one task.
+    tasks: list[Callable[[], None]] = []
+    for project_id, mrs in mrs_by_project_id.items():
+        repo = repo_by_project_id.get(project_id)
+        if repo is None:
+            for _mr in mrs:
+                progress.advance()
+                logger.error("No repo found for mr target_project_id=%s", project_id)
+            continue
+        tasks.append(
+            partial(
+                _create_repo_merge_requests,
+                client,
+                repo,
+                mrs,
+                user_by_id=user_by_id,
+                progress=progress,
+                pr_number_by_gitlab_mr_id=pr_number_by_gitlab_mr_id,
+            )
+        )
+    _run_tasks(tasks, concurrency=concurrency)
+
     return pr_number_by_gitlab_mr_id
 
 
+@dataclass(frozen=True)
+class _MergeRequestAction:
+    """How one MR is imported, decided from the repo's refs before any API call.
+
+    `head` is None when neither the MR head commit nor its source branch is available, in which
+    case the MR becomes an issue. `target_branch_exists` feeds the base selection, which can
+    still change at runtime when Forgejo rejects a base as missing.
+    """
+
+    mr: MergeRequestPlan
+    head: str | None
+    target_branch_exists: bool
+
+
+def _plan_merge_request_actions(
+    mrs: Iterable[MergeRequestPlan], refs: Mapping[str, str]
+) -> list[_MergeRequestAction]:
+    branches = frozenset(
+        ref.removeprefix("refs/heads/") for ref in refs if ref.startswith("refs/heads/")
+    )
+    get_ref = refs.get
+    actions: list[_MergeRequestAction] = []
+    for mr in mrs:
+        head: str | None
+        if mr.head_commit_sha or get_ref(f"refs/merge-requests/{mr.gitlab_mr_iid}/head"):
+            head = f"gitlab-mr-iid-{mr.gitlab_mr_iid}"
+        elif mr.source_branch in branches:
+            head = mr.source_branch
+        else:
+            head = None
+        actions.append(
+            _MergeRequestAction(mr=mr, head=head, target_branch_exists=mr.target_branch in branches)
+        )
+    return actions
+
+
+def _create_repo_merge_requests(
+    client: _ForgejoRepoOps,
+    repo: RepoPlan,
+    mrs: list[MergeRequestPlan],
+    *,
+    user_by_id: Mapping[int, str],
+    progress: _Progress,
+    pr_number_by_gitlab_mr_id: dict[int, int],
+) -> None:
+    try:
+        refs = read_ref_shas(repo.refs_path)
+    except (FileNotFoundError, ValueError):
+        refs = {}
+    actions = _plan_merge_request_actions(mrs, refs)
+
+    # Target branches Forgejo already rejected as missing, so later MRs against them skip the
+    # doomed PR call (and its retries) and go straight to the synthetic base / issue fallback.
+    missing_bases: set[str] = set()
+
+    advance = progress.advance
+    get_sudo = user_by_id.get
+    for action in actions:
+        advance()
+        mr = action.mr
+        sudo = get_sudo(mr.author_id)
+        if action.head is None:
+            number = _create_mr_fallback_issue(
+                client, repo, mr, sudo=sudo, body=_mr_fallback_issue_body(mr)
+            )
+        elif action.target_branch_exists and mr.target_branch not in missing_bases:
+            number = _create_pull_request_or_fallback(
+                client,
+                repo,
+                mr,
+                head=action.head,
+                base=mr.target_branch,
+                sudo=sudo,
+                missing_bases=missing_bases,
+            )
+        elif mr.base_commit_sha:
+            number = _create_pull_request_or_fallback(
+                client,
+                repo,
+                mr,
+                head=action.head,
+                base=f"gitlab-mr-base-iid-{mr.gitlab_mr_iid}",
+                sudo=sudo,
+                missing_bases=missing_bases,
+            )
+        else:
+            reason = (
+                _MR_TARGET_BRANCH_UNRESOLVED
+                if action.target_branch_exists
+                else _MR_TARGET_BRANCH_MISSING
+            )
+            number = _create_mr_fallback_issue(
+                client, repo, mr, sudo=sudo, body=_mr_fallback_issue_body(mr, reason)
+            )
+        if number is not None:
+            pr_number_by_gitlab_mr_id[mr.gitlab_mr_id] = number
+
+
 def apply_notes(
     plan: Plan,
     client: _ForgejoRepoOps,
@@ -1194,47 +1313,80 @@ def apply_notes(
     user_by_id: Mapping[int, str],
     issue_number_by_gitlab_issue_id: Mapping[int, int],
     pr_number_by_gitlab_mr_id: Mapping[int, int],
+    concurrency: int = 1,
 ) -> dict[int, int]:
-    repo_by_project_id = {r.gitlab_project_id: r for r in plan.repos}
+    repo_by_project_id = plan.repo_by_project_id
     comment_id_by_gitlab_note_id: dict[int, int] = {}
 
     total = len(plan.notes)
     if total:
         logger.info("Importing notes/comments (%d)", total)
-    step = _progress_step(total, min_step=100)
-    started = time.monotonic()
-
-    for idx, note in enumerate(plan.notes, start=1):
-        if total and (idx == 1 or idx % step == 0 or idx == total):
-            elapsed = time.monotonic() - started
-            avg = elapsed / idx if idx else 0.0
-            eta = avg * (total - idx)
-            logger.info(
-                "Notes progress: %d/%d (avg %.2fs, eta %s)",
-                idx,
-                total,
-                avg,
-                _format_duration(eta),
+    progress = _Progress("Notes", total, min_step=100)
+
+    notes_by_project_id: defaultdict[int, list[NotePlan]] = defaultdict(list)
+    for note in plan.notes:
+        notes_by_project_id[note.gitlab_project_id].append(note)
+
+    # Comments on one repo are posted in plan order by a single task so each thread keeps its
+    # GitLab order; different repos run concurrently.
+    tasks: list[Callable[[], None]] = []
+    for project_id, notes in notes_by_project_id.items():
+        try:
+            repo = repo_by_project_id[project_id]
+        except KeyError:
+            for _note in notes:
+                progress.advance()
+                logger.error("No repo found for note project_id=%s", project_id)
+            continue
+        tasks.append(
+            partial(
+                _create_repo_notes,
+                client,
+                repo,
+                notes,
+                user_by_id=user_by_id,
+                issue_number_by_gitlab_issue_id=issue_number_by_gitlab_issue_id,
+                pr_number_by_gitlab_mr_id=pr_number_by_gitlab_mr_id,
+                progress=progress,
+                comment_id_by_gitlab_note_id=comment_id_by_gitlab_note_id,
             )
-        repo = repo_by_project_id.get(note.gitlab_project_id)
-        if repo is None:
-            logger.error("No repo found for note project_id=%s", note.gitlab_project_id)
-            continue
+        )
+    _run_tasks(tasks, concurrency=concurrency)
 
-        issue_number: int | None
-        if note.noteable_type == "Issue":
-            issue_number = issue_number_by_gitlab_issue_id.get(note.noteable_id)
-        elif note.noteable_type == "MergeRequest":
-            issue_number = pr_number_by_gitlab_mr_id.get(note.noteable_id)
-        else:
-            continue
+    return comment_id_by_gitlab_note_id
 
+
+def _create_repo_notes(
+    client: _ForgejoRepoOps,
+    repo: RepoPlan,
+    notes: list[NotePlan],
+    *,
+    user_by_id: Mapping[int, str],
+    issue_number_by_gitlab_issue_id: Mapping[int, int],
+    pr_number_by_gitlab_mr_id: Mapping[int, int],
+    progress: _Progress,
+    comment_id_by_gitlab_note_id: dict[int, int],
+) -> None:
+    # Bound once per repo; the loop below runs for every note.
+    advance = progress.advance
+    number_getter_by_type = {
+        "Issue": issue_number_by_gitlab_issue_id.get,
+        "MergeRequest": pr_number_by_gitlab_mr_id.get,
+    }
+    get_sudo = user_by_id.get
+    create_comment = client.create_issue_comment
+    for note in notes:
+        advance()
+        get_number = number_getter_by_type.get(note.noteable_type)
+        if get_number is None:
+            continue
+        issue_number = get_number(note.noteable_id)
         if issue_number is None:
             continue
 
-        sudo = user_by_id.get(note.author_id)
+        sudo = get_sudo(note.author_id)
         try:
-            resp = client.create_issue_comment(
+            resp = create_comment(
                 owner=repo.owner,
                 repo=repo.name,
                 issue_number=issue_number,
@@ -1253,7 +1405,7 @@ def apply_notes(
                 issue_number,
                 sudo,
                 err.status_code,
-                err.body,
+                _truncate_body(err.body),
             )
             continue
         except Exception:
@@ -1273,8 +1425,6 @@ def apply_notes(
         if comment_id_raw is not None:
             comment_id_by_gitlab_note_id[note.gitlab_note_id] = int(comment_id_raw)
 
-    return comment_id_by_gitlab_note_id
-
 
 def apply_notes_db_fast(
     plan: Plan,
@@ -1283,6 +1433,7 @@ def apply_notes_db_fast(
     user_by_id: Mapping[int, str],
     issue_number_by_gitlab_issue_id: Mapping[int, int],
     pr_number_by_gitlab_mr_id: Mapping[int, int],
+    concurrency: int = 1,
 ) -> dict[int, int]:
     sql, comment_id_by_gitlab_note_id = build_fast_note_import_sql(
         plan,
@@ -1304,282 +1455,373 @@ def apply_notes_db_fast(
             user_by_id=user_by_id,
             issue_number_by_gitlab_issue_id=issue_number_by_gitlab_issue_id,
             pr_number_by_gitlab_mr_id=pr_number_by_gitlab_mr_id,
+            concurrency=concurrency,
         )
     return comment_id_by_gitlab_note_id
 
 
-def apply_issue_and_pr_uploads(
-    plan: Plan,
-    client: _ForgejoRepoOps,
+def _rewrite_body_uploads(
+    body: str,
     *,
-    user_by_id: Mapping[int, str],
-    issue_number_by_gitlab_issue_id: Mapping[int, int],
-    pr_number_by_gitlab_mr_id: Mapping[int, int],
-    upload_bytes_by_upload: Mapping[GitLabProjectUpload, bytes],
-) -> None:
-    if not upload_bytes_by_upload:
-        return
-
-    logger.info(
-        "Migrating uploads referenced in issue/PR bodies (%d files)", len(upload_bytes_by_upload)
-    )
-    repo_by_project_id = {r.gitlab_project_id: r for r in plan.repos}
+    disk_path: str,
+    upload_path_by_upload: Mapping[GitLabProjectUpload, Path],
+    uploaded_url_by_upload: dict[GitLabProjectUpload, str],
+    create_attachment: Callable[[str, IO[bytes]], str | None],
+    upload_urls_by_body: Mapping[str, list[tuple[str, str, str]]] | None = None,
+) -> str | None:
+    """
+    Upload the files referenced by `body` and return it with their URLs rewritten.
 
-    for issue in plan.issues:
-        issue_number = issue_number_by_gitlab_issue_id.get(issue.gitlab_issue_id)
-        if issue_number is None:
-            continue
-        repo = repo_by_project_id.get(issue.gitlab_project_id)
-        if repo is None:
-            logger.error("No repo found for issue uploads project_id=%s", issue.gitlab_project_id)
-            continue
+    Returns `None` when nothing in `body` changed.
 
-        sudo = user_by_id.get(issue.author_id)
-        mapping: dict[str, str] = {}
-        seen_urls: set[str] = set()
-        for url, upload_hash, filename in iter_gitlab_upload_urls(issue.description):
-            if url in seen_urls:
-                continue
-            seen_urls.add(url)
-            upload = GitLabProjectUpload(
-                disk_path=repo.gitlab_disk_path,
-                upload_hash=upload_hash,
-                filename=filename,
-            )
-            content = upload_bytes_by_upload.get(upload)
-            if content is None:
-                continue
-            try:
-                resp = client.create_issue_attachment(
-                    owner=repo.owner,
-                    repo=repo.name,
-                    issue_number=int(issue_number),
-                    filename=filename,
-                    content=content,
-                    sudo=sudo,
-                )
-            except ForgejoError as err:
-                logger.error(
-                    "Create issue attachment failed for %s/%s GitLab issue #%s (id=%s) "
-                    "filename=%s sudo=%s status=%s body=%r",
-                    repo.owner,
-                    repo.name,
-                    issue.gitlab_issue_iid,
-                    issue.gitlab_issue_id,
-                    filename,
-                    sudo,
-                    err.status_code,
-                    err.body,
-                )
+    Each distinct URL is resolved once, in order of first appearance, and the body is then
+    rewritten in a single regex pass. `upload_urls_by_body` holds the URLs already parsed by
+    `collect_project_uploads`; bodies missing from it are parsed here.
+    """
+    parsed_urls = upload_urls_by_body.get(body) if upload_urls_by_body is not None else None
+    if parsed_urls is None:
+        parsed_urls = iter_gitlab_upload_urls(body)
+    upload_by_url = {
+        url: GitLabProjectUpload(disk_path=disk_path, upload_hash=upload_hash, filename=filename)
+        for url, upload_hash, filename in parsed_urls
+    }
+    # Only URLs that resolved to an attachment are recorded; the rest are left as they are.
+    new_url_by_url: dict[str, str] = {}
+    for url, upload in upload_by_url.items():
+        new_url = uploaded_url_by_upload.get(upload)
+        if new_url is None:
+            path = upload_path_by_upload.get(upload)
+            if path is None:
                 continue
-            except Exception:
-                logger.exception(
-                    "Create issue attachment failed for %s/%s GitLab issue #%s (id=%s) "
-                    "filename=%s sudo=%s",
-                    repo.owner,
-                    repo.name,
-                    issue.gitlab_issue_iid,
-                    issue.gitlab_issue_id,
-                    filename,
-                    sudo,
-                )
+            with path.open("rb") as content:
+                new_url = create_attachment(upload.filename, content)
+            if new_url is None:
                 continue
-            new_url = resp.get("browser_download_url")
-            if new_url:
-                mapping[url] = str(new_url)
+            uploaded_url_by_upload[upload] = new_url
+        if new_url != url:
+            new_url_by_url[url] = new_url
 
-        if not mapping:
-            continue
-        new_body = replace_gitlab_upload_urls(issue.description, mapping=mapping)
-        if new_body == issue.description:
-            continue
+    if not new_url_by_url:
+        return None
+    return replace_gitlab_upload_urls(body, mapping=new_url_by_url)
+
+
+def _apply_issue_uploads(
+    client: _ForgejoRepoOps,
+    repo: RepoPlan,
+    issue: IssuePlan,
+    *,
+    issue_number: int,
+    sudo: str | None,
+    upload_path_by_upload: Mapping[GitLabProjectUpload, Path],
+    uploaded_url_by_upload: dict[GitLabProjectUpload, str],
+    upload_urls_by_body: Mapping[str, list[tuple[str, str, str]]] | None = None,
+) -> None:
+    def create_attachment(filename: str, content: IO[bytes]) -> str | None:
         try:
-            client.edit_issue_body(
+            resp = client.create_issue_attachment(
                 owner=repo.owner,
                 repo=repo.name,
                 issue_number=int(issue_number),
-                body=new_body,
+                filename=filename,
+                content=content,
                 sudo=sudo,
             )
         except ForgejoError as err:
             logger.error(
-                "Edit issue body failed for %s/%s GitLab issue #%s (id=%s) "
-                "forgejo issue #%s sudo=%s status=%s body=%r",
+                "Create issue attachment failed for %s/%s GitLab issue #%s (id=%s) "
+                "filename=%s sudo=%s status=%s body=%r",
                 repo.owner,
                 repo.name,
                 issue.gitlab_issue_iid,
                 issue.gitlab_issue_id,
-                issue_number,
+                filename,
                 sudo,
                 err.status_code,
-                err.body,
+                _truncate_body(err.body),
             )
-            continue
+            return None
         except Exception:
             logger.exception(
-                "Edit issue body failed for %s/%s GitLab issue #%s (id=%s) "
-                "forgejo issue #%s sudo=%s",
+                "Create issue attachment failed for %s/%s GitLab issue #%s (id=%s) "
+                "filename=%s sudo=%s",
                 repo.owner,
                 repo.name,
                 issue.gitlab_issue_iid,
                 issue.gitlab_issue_id,
-                issue_number,
+                filename,
                 sudo,
             )
-            continue
-
-    for mr in plan.merge_requests:
-        pr_number = pr_number_by_gitlab_mr_id.get(mr.gitlab_mr_id)
-        if pr_number is None:
-            continue
-        repo = repo_by_project_id.get(mr.gitlab_target_project_id)
-        if repo is None:
-            logger.error(
-                "No repo found for merge request uploads project_id=%s",
-                mr.gitlab_target_project_id,
-            )
-            continue
+            return None
+        new_url = resp.get("browser_download_url")
+        return str(new_url) if new_url else None
+
+    new_body = _rewrite_body_uploads(
+        issue.description,
+        disk_path=repo.gitlab_disk_path,
+        upload_path_by_upload=upload_path_by_upload,
+        uploaded_url_by_upload=uploaded_url_by_upload,
+        create_attachment=create_attachment,
+        upload_urls_by_body=upload_urls_by_body,
+    )
+    if new_body is None:
+        return
+    try:
+        client.edit_issue_body(
+            owner=repo.owner,
+            repo=repo.name,
+            issue_number=int(issue_number),
+            body=new_body,
+            sudo=sudo,
+        )
+    except ForgejoError as err:
+        logger.error(
+            "Edit issue body failed for %s/%s GitLab issue #%s (id=%s) "
+            "forgejo issue #%s sudo=%s status=%s body=%r",
+            repo.owner,
+            repo.name,
+            issue.gitlab_issue_iid,
+            issue.gitlab_issue_id,
+            issue_number,
+            sudo,
+            err.status_code,
+            _truncate_body(err.body),
+        )
+    except Exception:
+        logger.exception(
+            "Edit issue body failed for %s/%s GitLab issue #%s (id=%s) forgejo issue #%s sudo=%s",
+            repo.owner,
+            repo.name,
+            issue.gitlab_issue_iid,
+            issue.gitlab_issue_id,
+            issue_number,
+            sudo,
+        )
 
-        sudo = user_by_id.get(mr.author_id)
-        mapping: dict[str, str] = {}
-        seen_urls: set[str] = set()
-        for url, upload_hash, filename in iter_gitlab_upload_urls(mr.description):
-            if url in seen_urls:
-                continue
-            seen_urls.add(url)
-            upload = GitLabProjectUpload(
-                disk_path=repo.gitlab_disk_path,
-                upload_hash=upload_hash,
-                filename=filename,
-            )
-            content = upload_bytes_by_upload.get(upload)
-            if content is None:
-                continue
-            try:
-                resp = client.create_issue_attachment(
-                    owner=repo.owner,
-                    repo=repo.name,
-                    issue_number=int(pr_number),
-                    filename=filename,
-                    content=content,
-                    sudo=sudo,
-                )
-            except ForgejoError as err:
-                logger.error(
-                    "Create PR attachment failed for %s/%s GitLab MR !%s (id=%s) "
-                    "filename=%s sudo=%s status=%s body=%r",
-                    repo.owner,
-                    repo.name,
-                    mr.gitlab_mr_iid,
-                    mr.gitlab_mr_id,
-                    filename,
-                    sudo,
-                    err.status_code,
-                    err.body,
-                )
-                continue
-            except Exception:
-                logger.exception(
-                    "Create PR attachment failed for %s/%s GitLab MR !%s (id=%s) "
-                    "filename=%s sudo=%s",
-                    repo.owner,
-                    repo.name,
-                    mr.gitlab_mr_iid,
-                    mr.gitlab_mr_id,
-                    filename,
-                    sudo,
-                )
-                continue
-            new_url = resp.get("browser_download_url")
-            if new_url:
-                mapping[url] = str(new_url)
 
-        if not mapping:
-            continue
-        new_body = replace_gitlab_upload_urls(mr.description, mapping=mapping)
-        if new_body == mr.description:
-            continue
+def _apply_merge_request_uploads(
+    client: _ForgejoRepoOps,
+    repo: RepoPlan,
+    mr: MergeRequestPlan,
+    *,
+    pr_number: int,
+    sudo: str | None,
+    upload_path_by_upload: Mapping[GitLabProjectUpload, Path],
+    uploaded_url_by_upload: dict[GitLabProjectUpload, str],
+    upload_urls_by_body: Mapping[str, list[tuple[str, str, str]]] | None = None,
+) -> None:
+    def create_attachment(filename: str, content: IO[bytes]) -> str | None:
         try:
-            client.edit_pull_request_body(
+            resp = client.create_issue_attachment(
                 owner=repo.owner,
                 repo=repo.name,
-                pr_number=int(pr_number),
-                body=new_body,
+                issue_number=int(pr_number),
+                filename=filename,
+                content=content,
                 sudo=sudo,
             )
         except ForgejoError as err:
-            # MRs imported as issues do not have a pull request to edit.
-            if err.status_code == 404:
-                continue
             logger.error(
-                "Edit PR body failed for %s/%s GitLab MR !%s (id=%s) forgejo pr #%s "
-                "sudo=%s status=%s body=%r",
+                "Create PR attachment failed for %s/%s GitLab MR !%s (id=%s) "
+                "filename=%s sudo=%s status=%s body=%r",
                 repo.owner,
                 repo.name,
                 mr.gitlab_mr_iid,
                 mr.gitlab_mr_id,
-                pr_number,
+                filename,
                 sudo,
                 err.status_code,
-                err.body,
+                _truncate_body(err.body),
             )
-            continue
+            return None
         except Exception:
             logger.exception(
-                "Edit PR body failed for %s/%s GitLab MR !%s (id=%s) forgejo pr #%s sudo=%s",
+                "Create PR attachment failed for %s/%s GitLab MR !%s (id=%s) filename=%s sudo=%s",
                 repo.owner,
                 repo.name,
                 mr.gitlab_mr_iid,
                 mr.gitlab_mr_id,
-                pr_number,
+                filename,
                 sudo,
             )
-            continue
+            return None
+        new_url = resp.get("browser_download_url")
+        return str(new_url) if new_url else None
+
+    new_body = _rewrite_body_uploads(
+        mr.description,
+        disk_path=repo.gitlab_disk_path,
+        upload_path_by_upload=upload_path_by_upload,
+        uploaded_url_by_upload=uploaded_url_by_upload,
+        create_attachment=create_attachment,
+        upload_urls_by_body=upload_urls_by_body,
+    )
+    if new_body is None:
+        return
+    try:
+        client.edit_pull_request_body(
+            owner=repo.owner,
+            repo=repo.name,
+            pr_number=int(pr_number),
+            body=new_body,
+            sudo=sudo,
+        )
+    except ForgejoError as err:
+        # MRs imported as issues do not have a pull request to edit.
+        if err.status_code == 404:
+            return
+        logger.error(
+            "Edit PR body failed for %s/%s GitLab MR !%s (id=%s) forgejo pr #%s "
+            "sudo=%s status=%s body=%r",
+            repo.owner,
+            repo.name,
+            mr.gitlab_mr_iid,
+            mr.gitlab_mr_id,
+            pr_number,
+            sudo,
+            err.status_code,
+            _truncate_body(err.body),
+        )
+    except Exception:
+        logger.exception(
+            "Edit PR body failed for %s/%s GitLab MR !%s (id=%s) forgejo pr #%s sudo=%s",
+            repo.owner,
+            repo.name,
+            mr.gitlab_mr_iid,
+            mr.gitlab_mr_id,
+            pr_number,
+            sudo,
+        )
 
 
-def apply_note_uploads(
+def apply_issue_and_pr_uploads(
     plan: Plan,
     client: _ForgejoRepoOps,
     *,
     user_by_id: Mapping[int, str],
-    comment_id_by_gitlab_note_id: Mapping[int, int],
-    upload_bytes_by_upload: Mapping[GitLabProjectUpload, bytes],
+    issue_number_by_gitlab_issue_id: Mapping[int, int],
+    pr_number_by_gitlab_mr_id: Mapping[int, int],
+    upload_path_by_upload: Mapping[GitLabProjectUpload, Path],
+    uploaded_url_by_upload: dict[GitLabProjectUpload, str] | None = None,
+    upload_urls_by_body: Mapping[str, list[tuple[str, str, str]]] | None = None,
+    concurrency: int = 1,
 ) -> None:
-    if not upload_bytes_by_upload:
+    if not upload_path_by_upload:
         return
+    if uploaded_url_by_upload is None:
+        uploaded_url_by_upload = {}
 
     logger.info(
-        "Migrating uploads referenced in note/comment bodies (%d files)",
-        len(upload_bytes_by_upload),
+        "Migrating uploads referenced in issue/PR bodies (%d files)", len(upload_path_by_upload)
     )
-    repo_by_project_id = {r.gitlab_project_id: r for r in plan.repos}
-
-    for note in plan.notes:
-        comment_id = comment_id_by_gitlab_note_id.get(note.gitlab_note_id)
-        if comment_id is None:
+    repo_by_project_id = plan.repo_by_project_id
+    get_sudo = user_by_id.get
+    # Upload keys include the repo's disk path, so repos never share uploaded_url_by_upload
+    # entries; each repo's bodies are handled in order by one task.
+    work_by_project_id: defaultdict[int, list[Callable[[], None]]] = defaultdict(list)
+
+    get_issue_number = issue_number_by_gitlab_issue_id.get
+    # Most bodies reference no upload at all; skip those before any per-item work.
+    for issue in plan.issues:
+        if not mentions_gitlab_uploads(issue.description):
+            continue
+        issue_number = get_issue_number(issue.gitlab_issue_id)
+        if issue_number is None:
+            continue
+        try:
+            repo = repo_by_project_id[issue.gitlab_project_id]
+        except KeyError:
+            logger.error("No repo found for issue uploads project_id=%s", issue.gitlab_project_id)
             continue
+        work_by_project_id[repo.gitlab_project_id].append(
+            partial(
+                _apply_issue_uploads,
+                client,
+                repo,
+                issue,
+                issue_number=issue_number,
+                sudo=get_sudo(issue.author_id),
+                upload_path_by_upload=upload_path_by_upload,
+                uploaded_url_by_upload=uploaded_url_by_upload,
+                upload_urls_by_body=upload_urls_by_body,
+            )
+        )
 
-        repo = repo_by_project_id.get(note.gitlab_project_id)
-        if repo is None:
-            logger.error("No repo found for note uploads project_id=%s", note.gitlab_project_id)
+    get_pr_number = pr_number_by_gitlab_mr_id.get
+    for mr in plan.merge_requests:
+        if not mentions_gitlab_uploads(mr.description):
+            continue
+        pr_number = get_pr_number(mr.gitlab_mr_id)
+        if pr_number is None:
             continue
+        try:
+            repo = repo_by_project_id[mr.gitlab_target_project_id]
+        except KeyError:
+            logger.error(
+                "No repo found for merge request uploads project_id=%s",
+                mr.gitlab_target_project_id,
+            )
+            continue
+        work_by_project_id[repo.gitlab_project_id].append(
+            partial(
+                _apply_merge_request_uploads,
+                client,
+                repo,
+                mr,
+                pr_number=pr_number,
+                sudo=get_sudo(mr.author_id),
+                upload_path_by_upload=upload_path_by_upload,
+                uploaded_url_by_upload=uploaded_url_by_upload,
+                upload_urls_by_body=upload_urls_by_body,
+            )
+        )
 
-        sudo = user_by_id.get(note.author_id)
-        attachment_sudo = sudo
-        mapping: dict[str, str] = {}
-        seen_urls: set[str] = set()
-        for url, upload_hash, filename in iter_gitlab_upload_urls(note.body):
-            if url in seen_urls:
-                continue
-            seen_urls.add(url)
-            upload = GitLabProjectUpload(
-                disk_path=repo.gitlab_disk_path,
-                upload_hash=upload_hash,
+    _run_tasks(
+        (partial(_run_in_order, work) for work in work_by_project_id.values()),
+        concurrency=concurrency,
+    )
+
+
+def _apply_note_uploads(
+    client: _ForgejoRepoOps,
+    repo: RepoPlan,
+    note: NotePlan,
+    *,
+    comment_id: int,
+    sudo: str | None,
+    upload_path_by_upload: Mapping[GitLabProjectUpload, Path],
+    uploaded_url_by_upload: dict[GitLabProjectUpload, str],
+    upload_urls_by_body: Mapping[str, list[tuple[str, str, str]]] | None = None,
+) -> None:
+    attachment_sudo = sudo
+
+    def create_attachment(filename: str, content: IO[bytes]) -> str | None:
+        nonlocal attachment_sudo
+        try:
+            resp = client.create_issue_comment_attachment(
+                owner=repo.owner,
+                repo=repo.name,
+                comment_id=int(comment_id),
                 filename=filename,
+                content=content,
+                sudo=attachment_sudo,
             )
-            content = upload_bytes_by_upload.get(upload)
-            if content is None:
-                continue
+        except ForgejoError as err:
+            if err.status_code != 403 or attachment_sudo is None:
+                logger.error(
+                    "Create comment attachment failed for %s/%s GitLab note %s "
+                    "filename=%s sudo=%s status=%s body=%r",
+                    repo.owner,
+                    repo.name,
+                    note.gitlab_note_id,
+                    filename,
+                    attachment_sudo,
+                    err.status_code,
+                    _truncate_body(err.body),
+                )
+                return None
+            attachment_sudo = None
+            content.seek(0)
             try:
                 resp = client.create_issue_comment_attachment(
                     owner=repo.owner,
@@ -1590,53 +1832,18 @@ def apply_note_uploads(
                     sudo=attachment_sudo,
                 )
             except ForgejoError as err:
-                if err.status_code != 403 or attachment_sudo is None:
-                    logger.error(
-                        "Create comment attachment failed for %s/%s GitLab note %s "
-                        "filename=%s sudo=%s status=%s body=%r",
-                        repo.owner,
-                        repo.name,
-                        note.gitlab_note_id,
-                        filename,
-                        attachment_sudo,
-                        err.status_code,
-                        err.body,
-                    )
-                    continue
-                attachment_sudo = None
-                try:
-                    resp = client.create_issue_comment_attachment(
-                        owner=repo.owner,
-                        repo=repo.name,
-                        comment_id=int(comment_id),
-                        filename=filename,
-                        content=content,
-                        sudo=attachment_sudo,
-                    )
-                except ForgejoError as err:
-                    logger.error(
-                        "Create comment attachment failed for %s/%s GitLab note %s "
-                        "filename=%s sudo=%s status=%s body=%r",
-                        repo.owner,
-                        repo.name,
-                        note.gitlab_note_id,
-                        filename,
-                        attachment_sudo,
-                        err.status_code,
-                        err.body,
-                    )
-                    continue
-                except Exception:
-                    logger.exception(
-                        "Create comment attachment failed for %s/%s GitLab note %s "
-                        "filename=%s sudo=%s",
-                        repo.owner,
-                        repo.name,
-                        note.gitlab_note_id,
-                        filename,
-                        attachment_sudo,
-                    )
-                    continue
+                logger.error(
+                    "Create comment attachment failed for %s/%s GitLab note %s "
+                    "filename=%s sudo=%s status=%s body=%r",
+                    repo.owner,
+                    repo.name,
+                    note.gitlab_note_id,
+                    filename,
+                    attachment_sudo,
+                    err.status_code,
+                    _truncate_body(err.body),
+                )
+                return None
             except Exception:
                 logger.exception(
                     "Create comment attachment failed for %s/%s GitLab note %s filename=%s sudo=%s",
@@ -1646,93 +1853,161 @@ def apply_note_uploads(
                     filename,
                     attachment_sudo,
                 )
-                continue
-            new_url = resp.get("browser_download_url")
-            if new_url:
-                mapping[url] = str(new_url)
-
-        if not mapping:
-            continue
-        new_body = replace_gitlab_upload_urls(note.body, mapping=mapping)
-        if new_body == note.body:
-            continue
-        try:
-            client.edit_issue_comment(
-                owner=repo.owner,
-                repo=repo.name,
-                comment_id=int(comment_id),
-                body=new_body,
-                sudo=sudo,
-            )
-        except ForgejoError as err:
-            logger.error(
-                "Edit comment body failed for %s/%s GitLab note %s forgejo comment %s "
-                "sudo=%s status=%s body=%r",
-                repo.owner,
-                repo.name,
-                note.gitlab_note_id,
-                comment_id,
-                sudo,
-                err.status_code,
-                err.body,
-            )
-            continue
+                return None
         except Exception:
             logger.exception(
-                "Edit comment body failed for %s/%s GitLab note %s forgejo comment %s sudo=%s",
+                "Create comment attachment failed for %s/%s GitLab note %s filename=%s sudo=%s",
                 repo.owner,
                 repo.name,
                 note.gitlab_note_id,
-                comment_id,
-                sudo,
+                filename,
+                attachment_sudo,
             )
-            continue
+            return None
+        new_url = resp.get("browser_download_url")
+        return str(new_url) if new_url else None
+
+    new_body = _rewrite_body_uploads(
+        note.body,
+        disk_path=repo.gitlab_disk_path,
+        upload_path_by_upload=upload_path_by_upload,
+        uploaded_url_by_upload=uploaded_url_by_upload,
+        create_attachment=create_attachment,
+        upload_urls_by_body=upload_urls_by_body,
+    )
+    if new_body is None:
+        return
+    try:
+        client.edit_issue_comment(
+            owner=repo.owner,
+            repo=repo.name,
+            comment_id=int(comment_id),
+            body=new_body,
+            sudo=sudo,
+        )
+    except ForgejoError as err:
+        logger.error(
+            "Edit comment body failed for %s/%s GitLab note %s forgejo comment %s "
+            "sudo=%s status=%s body=%r",
+            repo.owner,
+            repo.name,
+            note.gitlab_note_id,
+            comment_id,
+            sudo,
+            err.status_code,
+            _truncate_body(err.body),
+        )
+    except Exception:
+        logger.exception(
+            "Edit comment body failed for %s/%s GitLab note %s forgejo comment %s sudo=%s",
+            repo.owner,
+            repo.name,
+            note.gitlab_note_id,
+            comment_id,
+            sudo,
+        )
+
 
+def apply_note_uploads(
+    plan: Plan,
+    client: _ForgejoRepoOps,
+    *,
+    user_by_id: Mapping[int, str],
+    comment_id_by_gitlab_note_id: Mapping[int, int],
+    upload_path_by_upload: Mapping[GitLabProjectUpload, Path],
+    uploaded_url_by_upload: dict[GitLabProjectUpload, str] | None = None,
+    upload_urls_by_body: Mapping[str, list[tuple[str, str, str]]] | None = None,
+    concurrency: int = 1,
+) -> None:
+    if not upload_path_by_upload:
+        return
+    if uploaded_url_by_upload is None:
+        uploaded_url_by_upload = {}
 
-def collect_project_uploads(plan: Plan) -> set[GitLabProjectUpload]:
-    repo_by_project_id = {r.gitlab_project_id: r for r in plan.repos}
-    uploads: set[GitLabProjectUpload] = set()
+    logger.info(
+        "Migrating uploads referenced in note/comment bodies (%d files)",
+        len(upload_path_by_upload),
+    )
+    repo_by_project_id = plan.repo_by_project_id
+    get_comment_id = comment_id_by_gitlab_note_id.get
+    get_sudo = user_by_id.get
+    # As for issue/PR bodies: one task per repo, never sharing upload cache entries.
+    work_by_project_id: defaultdict[int, list[Callable[[], None]]] = defaultdict(list)
 
-    for issue in plan.issues:
-        repo = repo_by_project_id.get(issue.gitlab_project_id)
-        if repo is None or not repo.gitlab_disk_path:
+    for note in plan.notes:
+        if not mentions_gitlab_uploads(note.body):
+            continue
+        comment_id = get_comment_id(note.gitlab_note_id)
+        if comment_id is None:
             continue
-        for _, upload_hash, filename in iter_gitlab_upload_urls(issue.description):
-            uploads.add(
-                GitLabProjectUpload(
-                    disk_path=repo.gitlab_disk_path,
-                    upload_hash=upload_hash,
-                    filename=filename,
-                )
-            )
 
-    for mr in plan.merge_requests:
-        repo = repo_by_project_id.get(mr.gitlab_target_project_id)
-        if repo is None or not repo.gitlab_disk_path:
+        try:
+            repo = repo_by_project_id[note.gitlab_project_id]
+        except KeyError:
+            logger.error("No repo found for note uploads project_id=%s", note.gitlab_project_id)
             continue
-        for _, upload_hash, filename in iter_gitlab_upload_urls(mr.description):
-            uploads.add(
-                GitLabProjectUpload(
-                    disk_path=repo.gitlab_disk_path,
-                    upload_hash=upload_hash,
-                    filename=filename,
-                )
+        work_by_project_id[repo.gitlab_project_id].append(
+            partial(
+                _apply_note_uploads,
+                client,
+                repo,
+                note,
+                comment_id=comment_id,
+                sudo=get_sudo(note.author_id),
+                upload_path_by_upload=upload_path_by_upload,
+                uploaded_url_by_upload=uploaded_url_by_upload,
+                upload_urls_by_body=upload_urls_by_body,
             )
+        )
 
-    for note in plan.notes:
-        repo = repo_by_project_id.get(note.gitlab_project_id)
-        if repo is None or not repo.gitlab_disk_path:
+    _run_tasks(
+        (partial(_run_in_order, work) for work in work_by_project_id.values()),
+        concurrency=concurrency,
+    )
+
+
+def collect_project_uploads(
+    plan: Plan, *, upload_urls_by_body: dict[str, list[tuple[str, str, str]]] | None = None
+) -> set[GitLabProjectUpload]:
+    """Return the project uploads referenced from issue/MR/note bodies.
+
+    When `upload_urls_by_body` is given, the URLs parsed from each body are recorded in it so the
+    upload phases can rewrite those bodies without parsing them again.
+    """
+    # Nothing can be extracted without an uploads archive or any repo disk path.
+    if plan.uploads_tar_path is None:
+        return set()
+    disk_path_by_project_id = {
+        r.gitlab_project_id: r.gitlab_disk_path for r in plan.repos if r.gitlab_disk_path
+    }
+    if not disk_path_by_project_id:
+        return set()
+    # Dedupe plain tuples first; the same screenshot is often referenced from many notes.
+    raw_keys: set[tuple[str, str, str]] = set()
+    add_key = raw_keys.add
+    disk_path_for = disk_path_by_project_id.get
+
+    bodies = chain(
+        ((issue.gitlab_project_id, issue.description) for issue in plan.issues),
+        ((mr.gitlab_target_project_id, mr.description) for mr in plan.merge_requests),
+        ((note.gitlab_project_id, note.body) for note in plan.notes),
+    )
+    for project_id, body in bodies:
+        if not mentions_gitlab_uploads(body):
             continue
-        for _, upload_hash, filename in iter_gitlab_upload_urls(note.body):
-            uploads.add(
-                GitLabProjectUpload(
-                    disk_path=repo.gitlab_disk_path,
-                    upload_hash=upload_hash,
-                    filename=filename,
-                )
-            )
+        disk_path = disk_path_for(project_id)
+        if disk_path is None:
+            continue
+        urls = iter_gitlab_upload_urls(body)
+        if upload_urls_by_body is not None:
+            upload_urls_by_body[body] = urls
+        for _, upload_hash, filename in urls:
+            add_key((disk_path, upload_hash, filename))
 
-    return uploads
+    return {
+        GitLabProjectUpload(disk_path=disk_path, upload_hash=upload_hash, filename=filename)
+        for disk_path, upload_hash, filename in raw_keys
+    }
 
 
 def apply_user_ssh_keys(plan: Plan, client: _ForgejoOps, *, user_by_id: Mapping[int, str]) -> None:
@@ -1760,7 +2035,7 @@ def apply_user_ssh_keys(plan: Plan, client: _ForgejoOps, *, user_by_id: Mapping[
                 key_plan.gitlab_user_id,
                 sudo,
                 err.status_code,
-                err.body,
+                _truncate_body(err.body),
             )
             continue
         except Exception:
@@ -1773,121 +2048,237 @@ def apply_user_ssh_keys(plan: Plan, client: _ForgejoOps, *, user_by_id: Mapping[
             continue
 
 
-def apply_user_avatars(plan: Plan, client: _ForgejoOps, *, user_by_id: Mapping[int, str]) -> None:
+def _desired_avatars(plan: Plan, *, user_by_id: Mapping[int, str]) -> dict[int, str]:
+    # Only look for avatars of users that were migrated; the archive is never scanned (and no
+    # bytes are read or encoded) for users that would be skipped anyway.
+    return {
+        u.gitlab_user_id: u.avatar
+        for u in plan.users
+        if u.avatar and user_by_id.get(u.gitlab_user_id)
+    }
+
+
+def apply_user_avatars(
+    plan: Plan,
+    client: _ForgejoOps,
+    *,
+    user_by_id: Mapping[int, str],
+    concurrency: int = 1,
+    avatar_path_by_user_id: Mapping[int, Path] | None = None,
+) -> None:
+    """Upload GitLab avatars for migrated users.
+
+    Pass `avatar_path_by_user_id` when avatars were already extracted (see `extract_uploads`);
+    otherwise they are streamed from `plan.uploads_tar_path`.
+    """
     uploads = plan.uploads_tar_path
     if uploads is None:
         return
 
-    desired = {u.gitlab_user_id: u.avatar for u in plan.users if u.avatar}
+    desired = _desired_avatars(plan, user_by_id=user_by_id)
     if not desired:
         return
 
+    logger.info("Importing user avatars (%d)", len(desired))
+
+    # Avatars streamed from the archive are read when their task is queued; extracted files are
+    # only read (and base64-encoded) by the worker, so just the in-flight images sit in memory.
+    tasks: Iterable[Callable[[], None]]
+    if avatar_path_by_user_id is None:
+        tasks = (
+            partial(_update_user_avatar, client, user_id, raw, sudo=user_by_id[user_id])
+            for user_id, raw in iter_user_avatars_from_uploads(uploads, desired=desired)
+        )
+    else:
+        tasks = (
+            partial(_update_user_avatar_from_file, client, user_id, path, sudo=user_by_id[user_id])
+            for user_id, path in avatar_path_by_user_id.items()
+            if user_id in desired
+        )
     try:
-        avatar_bytes = read_user_avatars_from_uploads(uploads, desired=desired)
+        _run_tasks(tasks, concurrency=concurrency)
     except Exception:
         logger.exception("Read user avatars from uploads.tar.gz failed")
-        return
-    for user_id, raw in sorted(avatar_bytes.items()):
-        sudo = user_by_id.get(user_id)
-        if not sudo:
-            continue
-        image_b64 = base64.b64encode(raw).decode("ascii")
-        try:
-            client.update_user_avatar(image_b64=image_b64, sudo=sudo)
-        except ForgejoError as err:
-            logger.error(
-                "Update user avatar failed for gitlab user id=%s sudo=%s status=%s body=%r",
-                user_id,
-                sudo,
-                err.status_code,
-                err.body,
-            )
-            continue
-        except Exception:
-            logger.exception(
-                "Update user avatar failed for gitlab user id=%s sudo=%s", user_id, sudo
-            )
-            continue
 
 
-def ensure_repo_labels(plan: Plan, client: _ForgejoRepoOps) -> None:
-    label_by_id = {label.gitlab_label_id: label for label in plan.labels}
-    if not label_by_id:
+def _update_user_avatar_from_file(
+    client: _ForgejoOps, user_id: int, path: Path, *, sudo: str
+) -> None:
+    try:
+        raw = path.read_bytes()
+    except OSError:
+        logger.exception(
+            "Read extracted avatar failed for gitlab user id=%s path=%s", user_id, path
+        )
         return
+    _update_user_avatar(client, user_id, raw, sudo=sudo)
 
-    repo_by_project_id = {r.gitlab_project_id: r for r in plan.repos}
-    label_ids_by_project: dict[int, set[int]] = {}
 
-    for issue in plan.issues:
-        label_ids = plan.issue_label_ids_by_gitlab_issue_id.get(issue.gitlab_issue_id, ())
+def _update_user_avatar(client: _ForgejoOps, user_id: int, raw: bytes, *, sudo: str) -> None:
+    image_b64 = base64.b64encode(raw).decode("ascii")
+    try:
+        client.update_user_avatar(image_b64=image_b64, sudo=sudo)
+    except ForgejoError as err:
+        logger.error(
+            "Update user avatar failed for gitlab user id=%s sudo=%s status=%s body=%r",
+            user_id,
+            sudo,
+            err.status_code,
+            _truncate_body(err.body),
+        )
+    except Exception:
+        logger.exception("Update user avatar failed for gitlab user id=%s sudo=%s", user_id, sudo)
+
+
+@dataclass(frozen=True)
+class _LabelIndex:
+    """Label assignments gathered in one pass over issues and MRs."""
+
+    label_ids_by_project: Mapping[int, set[int]]
+    labelled_issues: list[tuple[IssuePlan, tuple[int, ...]]]
+    labelled_merge_requests: list[tuple[MergeRequestPlan, tuple[int, ...]]]
+
+
+def _index_labels(plan: Plan) -> _LabelIndex:
+    label_ids_by_project: defaultdict[int, set[int]] = defaultdict(set)
+    labelled_issues: list[tuple[IssuePlan, tuple[int, ...]]] = []
+    labelled_merge_requests: list[tuple[MergeRequestPlan, tuple[int, ...]]] = []
+
+    for issue, label_ids in zip(plan.issues, plan.issue_label_ids, strict=True):
         if label_ids:
-            label_ids_by_project.setdefault(issue.gitlab_project_id, set()).update(label_ids)
+            label_ids_by_project[issue.gitlab_project_id].update(label_ids)
+            labelled_issues.append((issue, label_ids))
 
-    for mr in plan.merge_requests:
-        label_ids = plan.mr_label_ids_by_gitlab_mr_id.get(mr.gitlab_mr_id, ())
+    for mr, label_ids in zip(plan.merge_requests, plan.mr_label_ids, strict=True):
         if label_ids:
-            label_ids_by_project.setdefault(mr.gitlab_target_project_id, set()).update(label_ids)
+            label_ids_by_project[mr.gitlab_target_project_id].update(label_ids)
+            labelled_merge_requests.append((mr, label_ids))
+
+    return _LabelIndex(
+        label_ids_by_project=label_ids_by_project,
+        labelled_issues=labelled_issues,
+        labelled_merge_requests=labelled_merge_requests,
+    )
+
+
+def ensure_repo_labels(
+    plan: Plan,
+    client: _ForgejoRepoOps,
+    *,
+    concurrency: int = 1,
+    label_by_id: Mapping[int, LabelPlan] | None = None,
+    label_index: _LabelIndex | None = None,
+) -> None:
+    if label_by_id is None:
+        label_by_id = {label.gitlab_label_id: label for label in plan.labels}
+    if not label_by_id:
+        return
 
-    for project_id, label_ids in sorted(label_ids_by_project.items()):
+    repo_by_project_id = plan.repo_by_project_id
+    if label_index is None:
+        label_index = _index_labels(plan)
+
+    # Projects are visited in first-seen order over plan.issues then plan.merge_requests, which
+    # the plan builder already emits deterministically.
+    repos: list[RepoPlan] = []
+    tasks: list[Callable[[], None]] = []
+    missing_by_project_id: dict[int, list[LabelPlan]] = {}
+    for project_id, label_ids in label_index.label_ids_by_project.items():
         repo = repo_by_project_id.get(project_id)
         if repo is None:
             logger.error("No repo found for labels project_id=%s", project_id)
             continue
-
-        try:
-            existing_by_name = {
-                str(label_obj.get("name") or ""): label_obj
-                for label_obj in client.list_repo_labels(owner=repo.owner, repo=repo.name)
-            }
-        except ForgejoError as err:
-            logger.error(
-                "List repo labels failed for %s/%s status=%s body=%r",
-                repo.owner,
-                repo.name,
-                err.status_code,
-                err.body,
+        repos.append(repo)
+        tasks.append(
+            partial(
+                _find_missing_repo_labels,
+                client,
+                repo,
+                label_ids,
+                label_by_id,
+                missing_by_project_id=missing_by_project_id,
             )
-            continue
-        except Exception:
-            logger.exception("List repo labels failed for %s/%s", repo.owner, repo.name)
-            continue
+        )
+    _run_tasks(tasks, concurrency=concurrency)
+
+    # Every repo's labels are listed once above; the missing ones across all repos are then
+    # independent creates, so a repo with many new labels does not hold a single worker.
+    _run_tasks(
+        (
+            partial(_create_repo_label, client, repo, label)
+            for repo in repos
+            for label in missing_by_project_id.get(repo.gitlab_project_id, ())
+        ),
+        concurrency=concurrency,
+    )
 
-        def sort_key(label_id: int) -> tuple[str, int]:
-            label = label_by_id.get(label_id)
-            return ((label.title.lower() if label else ""), label_id)
 
-        for label_id in sorted(label_ids, key=sort_key):
-            label = label_by_id.get(label_id)
-            if label is None or not label.title:
-                continue
-            if label.title in existing_by_name:
-                continue
-            try:
-                client.create_repo_label(
-                    owner=repo.owner,
-                    repo=repo.name,
-                    name=label.title,
-                    color=label.color,
-                    description=label.description,
-                )
-            except ForgejoError as err:
-                logger.error(
-                    "Create repo label failed for %s/%s label=%s status=%s body=%r",
-                    repo.owner,
-                    repo.name,
-                    label.title,
-                    err.status_code,
-                    err.body,
-                )
-                continue
-            except Exception:
-                logger.exception(
-                    "Create repo label failed for %s/%s label=%s",
-                    repo.owner,
-                    repo.name,
-                    label.title,
-                )
-                continue
+def _find_missing_repo_labels(
+    client: _ForgejoRepoOps,
+    repo: RepoPlan,
+    label_ids: set[int],
+    label_by_id: Mapping[int, LabelPlan],
+    *,
+    missing_by_project_id: dict[int, list[LabelPlan]],
+) -> None:
+    try:
+        existing_names = {
+            str(label_obj.get("name") or "")
+            for label_obj in client.list_repo_labels(owner=repo.owner, repo=repo.name)
+        }
+    except ForgejoError as err:
+        logger.error(
+            "List repo labels failed for %s/%s status=%s body=%r",
+            repo.owner,
+            repo.name,
+            err.status_code,
+            _truncate_body(err.body),
+        )
+        return
+    except Exception:
+        logger.exception("List repo labels failed for %s/%s", repo.owner, repo.name)
+        return
+
+    wanted = [
+        label
+        for label_id in label_ids
+        if (label := label_by_id.get(label_id)) is not None and label.title
+    ]
+    missing_titles = {label.title for label in wanted} - existing_names
+    if not missing_titles:
+        return
+
+    wanted.sort(key=lambda label: (label.title.lower(), label.gitlab_label_id))
+    missing_by_project_id[repo.gitlab_project_id] = [
+        label for label in wanted if label.title in missing_titles
+    ]
+
+
+def _create_repo_label(client: _ForgejoRepoOps, repo: RepoPlan, label: LabelPlan) -> None:
+    try:
+        client.create_repo_label(
+            owner=repo.owner,
+            repo=repo.name,
+            name=label.title,
+            color=label.color,
+            description=label.description,
+        )
+    except ForgejoError as err:
+        logger.error(
+            "Create repo label failed for %s/%s label=%s status=%s body=%r",
+            repo.owner,
+            repo.name,
+            label.title,
+            err.status_code,
+            _truncate_body(err.body),
+        )
+    except Exception:
+        logger.exception(
+            "Create repo label failed for %s/%s label=%s",
+            repo.owner,
+            repo.name,
+            label.title,
+        )
 
 
 def apply_issue_and_mr_labels(
@@ -1896,109 +2287,151 @@ def apply_issue_and_mr_labels(
     *,
     issue_number_by_gitlab_issue_id: Mapping[int, int],
     pr_number_by_gitlab_mr_id: Mapping[int, int],
+    concurrency: int = 1,
+    label_by_id: Mapping[int, LabelPlan] | None = None,
+    label_index: _LabelIndex | None = None,
 ) -> None:
-    label_by_id = {label.gitlab_label_id: label for label in plan.labels}
+    if label_by_id is None:
+        label_by_id = {label.gitlab_label_id: label for label in plan.labels}
     if not label_by_id:
         return
 
-    repo_by_project_id = {r.gitlab_project_id: r for r in plan.repos}
-
-    def label_names(label_ids: tuple[int, ...]) -> list[str]:
-        names: list[str] = []
-        for label_id in label_ids:
-            label = label_by_id.get(label_id)
-            if label and label.title:
-                names.append(label.title)
-        # Deterministic order + de-dupe.
-        return sorted(set(names), key=str.lower)
+    repo_by_project_id = plan.repo_by_project_id
+    if label_index is None:
+        label_index = _index_labels(plan)
+
+    title_by_id = {label_id: label.title for label_id, label in label_by_id.items() if label.title}
+
+    # Many issues share the same label set, so resolve each distinct tuple once up front.
+    names_by_label_ids: dict[tuple[int, ...], list[str]] = {}
+    for _, label_ids in chain(label_index.labelled_issues, label_index.labelled_merge_requests):
+        if label_ids not in names_by_label_ids:
+            # Deterministic order + de-dupe.
+            names = list(dict.fromkeys(title_by_id[i] for i in label_ids if i in title_by_id))
+            if len(names) > 1:  # most issues carry a single label
+                names.sort(key=str.lower)
+            names_by_label_ids[label_ids] = names
+
+    # Resolve (and report) each labelled project's repo once rather than per issue/MR.
+    repo_by_labelled_project: dict[int, RepoPlan] = {}
+    for project_id in label_index.label_ids_by_project:
+        repo = repo_by_project_id.get(project_id)
+        if repo is None:
+            logger.error("No repo found for issue/MR labels project_id=%s", project_id)
+            continue
+        repo_by_labelled_project[project_id] = repo
 
-    for issue in plan.issues:
-        issue_number = issue_number_by_gitlab_issue_id.get(issue.gitlab_issue_id)
+    tasks: list[Callable[[], None]] = []
+    # Hoisted bound methods for the per-issue/per-MR loops below.
+    add_task = tasks.append
+    get_repo = repo_by_labelled_project.get
+    get_issue_number = issue_number_by_gitlab_issue_id.get
+    for issue, label_ids in label_index.labelled_issues:
+        issue_number = get_issue_number(issue.gitlab_issue_id)
         if issue_number is None:
             continue
-        label_ids = plan.issue_label_ids_by_gitlab_issue_id.get(issue.gitlab_issue_id)
-        if not label_ids:
-            continue
-        names = label_names(label_ids)
+        names = names_by_label_ids[label_ids]
         if not names:
             continue
-        repo = repo_by_project_id.get(issue.gitlab_project_id)
+        repo = get_repo(issue.gitlab_project_id)
         if repo is None:
-            logger.error("No repo found for issue labels project_id=%s", issue.gitlab_project_id)
-            continue
-        try:
-            client.replace_issue_labels(
-                owner=repo.owner,
-                repo=repo.name,
-                issue_number=issue_number,
-                labels=names,
-                sudo=None,
-            )
-        except ForgejoError as err:
-            logger.error(
-                "Apply issue labels failed for %s/%s GitLab issue #%s (id=%s) status=%s body=%r",
-                repo.owner,
-                repo.name,
-                issue.gitlab_issue_iid,
-                issue.gitlab_issue_id,
-                err.status_code,
-                err.body,
-            )
             continue
-        except Exception:
-            logger.exception(
-                "Apply issue labels failed for %s/%s GitLab issue #%s (id=%s)",
-                repo.owner,
-                repo.name,
-                issue.gitlab_issue_iid,
-                issue.gitlab_issue_id,
+        add_task(
+            partial(
+                _replace_issue_labels, client, repo, issue, issue_number=issue_number, names=names
             )
-            continue
+        )
 
-    for mr in plan.merge_requests:
-        pr_number = pr_number_by_gitlab_mr_id.get(mr.gitlab_mr_id)
+    get_pr_number = pr_number_by_gitlab_mr_id.get
+    for mr, label_ids in label_index.labelled_merge_requests:
+        pr_number = get_pr_number(mr.gitlab_mr_id)
         if pr_number is None:
             continue
-        label_ids = plan.mr_label_ids_by_gitlab_mr_id.get(mr.gitlab_mr_id)
-        if not label_ids:
-            continue
-        names = label_names(label_ids)
+        names = names_by_label_ids[label_ids]
         if not names:
             continue
-        repo = repo_by_project_id.get(mr.gitlab_target_project_id)
+        repo = get_repo(mr.gitlab_target_project_id)
         if repo is None:
-            logger.error(
-                "No repo found for merge request labels project_id=%s", mr.gitlab_target_project_id
-            )
-            continue
-        try:
-            client.replace_issue_labels(
-                owner=repo.owner,
-                repo=repo.name,
-                issue_number=pr_number,
-                labels=names,
-                sudo=None,
-            )
-        except ForgejoError as err:
-            logger.error(
-                "Apply MR labels failed for %s/%s GitLab MR !%s (id=%s) status=%s body=%r",
-                repo.owner,
-                repo.name,
-                mr.gitlab_mr_iid,
-                mr.gitlab_mr_id,
-                err.status_code,
-                err.body,
-            )
-            continue
-        except Exception:
-            logger.exception(
-                "Apply MR labels failed for %s/%s GitLab MR !%s (id=%s)",
-                repo.owner,
-                repo.name,
-                mr.gitlab_mr_iid,
-                mr.gitlab_mr_id,
-            )
             continue
+        add_task(partial(_replace_mr_labels, client, repo, mr, pr_number=pr_number, names=names))
+
+    # Forgejo has no bulk label endpoint, so each issue/PR gets its own replace call; the calls
+    # are independent and overlap on the shared connection pool when concurrency > 1. The
+    # issues/PRs were all created label-less earlier in this run, so there is no current label
+    # set worth fetching and diffing against first.
+    _run_tasks(tasks, concurrency=concurrency)
+
+
+def _replace_issue_labels(
+    client: _ForgejoRepoOps,
+    repo: RepoPlan,
+    issue: IssuePlan,
+    *,
+    issue_number: int,
+    names: list[str],
+) -> None:
+    try:
+        client.replace_issue_labels(
+            owner=repo.owner,
+            repo=repo.name,
+            issue_number=issue_number,
+            labels=names,
+            sudo=None,
+        )
+    except ForgejoError as err:
+        logger.error(
+            "Apply issue labels failed for %s/%s GitLab issue #%s (id=%s) status=%s body=%r",
+            repo.owner,
+            repo.name,
+            issue.gitlab_issue_iid,
+            issue.gitlab_issue_id,
+            err.status_code,
+            _truncate_body(err.body),
+        )
+    except Exception:
+        logger.exception(
+            "Apply issue labels failed for %s/%s GitLab issue #%s (id=%s)",
+            repo.owner,
+            repo.name,
+            issue.gitlab_issue_iid,
+            issue.gitlab_issue_id,
+        )
+
+
+def _replace_mr_labels(
+    client: _ForgejoRepoOps,
+    repo: RepoPlan,
+    mr: MergeRequestPlan,
+    *,
+    pr_number: int,
+    names: list[str],
+) -> None:
+    try:
+        client.replace_issue_labels(
+            owner=repo.owner,
+            repo=repo.name,
+            issue_number=pr_number,
+            labels=names,
+            sudo=None,
+        )
+    except ForgejoError as err:
+        logger.error(
+            "Apply MR labels failed for %s/%s GitLab MR !%s (id=%s) status=%s body=%r",
+            repo.owner,
+            repo.name,
+            mr.gitlab_mr_iid,
+            mr.gitlab_mr_id,
+            err.status_code,
+            _truncate_body(err.body),
+        )
+    except Exception:
+        logger.exception(
+            "Apply MR labels failed for %s/%s GitLab MR !%s (id=%s)",
+            repo.owner,
+            repo.name,
+            mr.gitlab_mr_iid,
+            mr.gitlab_mr_id,
+        )
 
 
 def migrate_plan(
@@ -2012,7 +2445,14 @@ def migrate_plan(
     git_token: str,
     migrate_password_hashes: bool = False,
     fast_db_issues: bool = False,
+    fast_db_notes: bool | None = None,
+    concurrency: int = 1,
 ) -> None:
+    # Notes follow the issue import path unless chosen explicitly: API issue/MR creation adds
+    # Forgejo comments of its own, whose ids can collide with the GitLab note ids the DB
+    # fast-path inserts as comment ids.
+    if fast_db_notes is None:
+        fast_db_notes = fast_db_issues
     logger.info(
         "Starting migration (backup_id=%s): orgs=%d repos=%d users=%d "
         "issues=%d mrs=%d notes=%d labels=%d",
@@ -2029,11 +2469,12 @@ def migrate_plan(
 
     with _phase("Users/orgs/teams"):
         forgejo_username_by_gitlab_username = apply_plan(plan, client, user_password=user_password)
-    forgejo_user_by_gitlab_user_id: dict[int, str] = {}
-    for u in plan.users:
-        forgejo_username = forgejo_username_by_gitlab_username.get(u.username)
-        if forgejo_username:
-            forgejo_user_by_gitlab_user_id[u.gitlab_user_id] = forgejo_username
+    forgejo_username_for = forgejo_username_by_gitlab_username.get
+    forgejo_user_by_gitlab_user_id = {
+        u.gitlab_user_id: forgejo_username
+        for u in plan.users
+        if (forgejo_username := forgejo_username_for(u.username))
+    }
 
     users_with_gitlab_2fa = sum(1 for u in plan.users if u.gitlab_otp_required_for_login)
     if users_with_gitlab_2fa:
@@ -2042,6 +2483,9 @@ def migrate_plan(
             users_with_gitlab_2fa,
         )
 
+    label_by_id = {label.gitlab_label_id: label for label in plan.labels}
+    label_index = _index_labels(plan)
+
     with _phase("User SSH keys"):
         apply_user_ssh_keys(plan, client, user_by_id=forgejo_user_by_gitlab_user_id)
 
@@ -2057,87 +2501,189 @@ def migrate_plan(
             except Exception:
                 logger.exception("Apply password hash migration SQL failed")
 
-    upload_bytes_by_upload: dict[GitLabProjectUpload, bytes] = {}
-    if plan.uploads_tar_path is not None:
-        desired_uploads = collect_project_uploads(plan)
-        if desired_uploads:
-            logger.info("Uploads: scanning %d referenced /uploads files", len(desired_uploads))
-        if desired_uploads:
-            try:
-                with _phase("Read uploads.tar.gz"):
-                    upload_bytes_by_upload = read_project_uploads_from_uploads(
-                        plan.uploads_tar_path, desired=desired_uploads
-                    )
-            except Exception:
-                logger.exception("Read project uploads from uploads.tar.gz failed")
-                upload_bytes_by_upload = {}
-
-    with _phase("User avatars"):
-        apply_user_avatars(plan, client, user_by_id=forgejo_user_by_gitlab_user_id)
-
-    with _phase("Repositories"):
-        apply_repos(plan, client, private=private_repos)
-    with _phase("Repo labels"):
-        ensure_repo_labels(plan, client)
-    with _phase("Git push repos"):
-        push_repos(plan, forgejo_url=forgejo_url, git_username=git_username, git_token=git_token)
-    with _phase("Git push wikis"):
-        push_wikis(plan, forgejo_url=forgejo_url, git_username=git_username, git_token=git_token)
-    with _phase("Git push MR helper branches"):
-        push_merge_request_heads(
-            plan, forgejo_url=forgejo_url, git_username=git_username, git_token=git_token
+    # uploads.tar.gz can only be read sequentially, so avatars and project uploads are extracted
+    # together in one pass up front and kept on disk until the upload phases are done.
+    with tempfile.TemporaryDirectory(prefix="gitlab-to-forgejo-uploads-") as uploads_dir:
+        extracted = ExtractedUploads(avatar_path_by_user_id={}, upload_path_by_upload={})
+        # Parsed once while collecting and reused when the upload phases rewrite the bodies.
+        upload_urls_by_body: dict[str, list[tuple[str, str, str]]] = {}
+        if plan.uploads_tar_path is not None:
+            desired_avatars = _desired_avatars(plan, user_by_id=forgejo_user_by_gitlab_user_id)
+            desired_uploads = collect_project_uploads(plan, upload_urls_by_body=upload_urls_by_body)
+            if desired_avatars or desired_uploads:
+                logger.info(
+                    "Uploads: scanning for %d avatars and %d referenced /uploads files",
+                    len(desired_avatars),
+                    len(desired_uploads),
+                )
+                try:
+                    with _phase("Read uploads.tar.gz"):
+                        extracted = extract_uploads(
+                            plan.uploads_tar_path,
+                            desired_avatars=desired_avatars,
+                            desired_uploads=desired_uploads,
+                            dest_dir=Path(uploads_dir),
+                        )
+                except Exception:
+                    logger.exception("Read uploads from uploads.tar.gz failed")
+        upload_path_by_upload = extracted.upload_path_by_upload
+
+        # Avatars only touch user accounts, so they overlap repo creation. Overlapped phases split
+        # the --concurrency budget (repo creation is sequential and takes one slot) instead of
+        # each starting `concurrency` workers against the one shared connection pool.
+        def user_avatars_phase() -> None:
+            with _phase("User avatars"):
+                apply_user_avatars(
+                    plan,
+                    client,
+                    user_by_id=forgejo_user_by_gitlab_user_id,
+                    concurrency=max(1, concurrency - 1),
+                    avatar_path_by_user_id=extracted.avatar_path_by_user_id,
+                )
+
+        def repos_phase() -> None:
+            with _phase("Repositories"):
+                apply_repos(plan, client, private=private_repos)
+
+        _run_tasks([user_avatars_phase, repos_phase], concurrency=min(concurrency, 2))
+
+        # Repo labels only talk to the REST API while the git pushes only talk to the git endpoint,
+        # so with --concurrency > 1 they overlap; all must finish before issues/MRs are created.
+        # Wikis are separate git repos, so they push alongside the main repos; MR helper branches
+        # go into the main repos and wait for those pushes.
+        setup_phase_concurrency = max(1, concurrency // 3)
+
+        def repo_labels_phase() -> None:
+            with _phase("Repo labels"):
+                ensure_repo_labels(
+                    plan,
+                    client,
+                    concurrency=setup_phase_concurrency,
+                    label_by_id=label_by_id,
+                    label_index=label_index,
+                )
+
+        def git_push_phases() -> None:
+            with _phase("Git push repos"):
+                push_repos(
+                    plan,
+                    forgejo_url=forgejo_url,
+                    git_username=git_username,
+                    git_token=git_token,
+                    concurrency=setup_phase_concurrency,
+                )
+            with _phase("Git push MR helper branches"):
+                push_merge_request_heads(
+                    plan,
+                    forgejo_url=forgejo_url,
+                    git_username=git_username,
+                    git_token=git_token,
+                    concurrency=setup_phase_concurrency,
+                )
+
+        def git_push_wikis_phase() -> None:
+            with _phase("Git push wikis"):
+                push_wikis(
+                    plan,
+                    forgejo_url=forgejo_url,
+                    git_username=git_username,
+                    git_token=git_token,
+                    concurrency=setup_phase_concurrency,
+                )
+
+        _run_tasks(
+            [repo_labels_phase, git_push_phases, git_push_wikis_phase],
+            concurrency=min(concurrency, 3),
         )
 
-    with _phase("Issues"):
-        if fast_db_issues:
-            issue_numbers = apply_issues_db_fast(
-                plan, client, user_by_id=forgejo_user_by_gitlab_user_id
-            )
-        else:
-            issue_numbers = apply_issues(plan, client, user_by_id=forgejo_user_by_gitlab_user_id)
-    with _phase("Merge requests"):
-        pr_numbers = apply_merge_requests(plan, client, user_by_id=forgejo_user_by_gitlab_user_id)
-    with _phase("Notes/comments"):
-        if fast_db_issues:
-            comment_ids = apply_notes_db_fast(
+        with _phase("Issues"):
+            if fast_db_issues:
+                issue_numbers = apply_issues_db_fast(
+                    plan,
+                    client,
+                    user_by_id=forgejo_user_by_gitlab_user_id,
+                    concurrency=concurrency,
+                )
+            else:
+                issue_numbers = apply_issues(
+                    plan,
+                    client,
+                    user_by_id=forgejo_user_by_gitlab_user_id,
+                    concurrency=concurrency,
+                )
+        with _phase("Merge requests"):
+            pr_numbers = apply_merge_requests(
                 plan,
                 client,
                 user_by_id=forgejo_user_by_gitlab_user_id,
-                issue_number_by_gitlab_issue_id=issue_numbers,
-                pr_number_by_gitlab_mr_id=pr_numbers,
+                concurrency=concurrency,
             )
-        else:
-            comment_ids = apply_notes(
+        with _phase("Notes/comments"):
+            if fast_db_notes:
+                comment_ids = apply_notes_db_fast(
+                    plan,
+                    client,
+                    user_by_id=forgejo_user_by_gitlab_user_id,
+                    issue_number_by_gitlab_issue_id=issue_numbers,
+                    pr_number_by_gitlab_mr_id=pr_numbers,
+                    concurrency=concurrency,
+                )
+            else:
+                comment_ids = apply_notes(
+                    plan,
+                    client,
+                    user_by_id=forgejo_user_by_gitlab_user_id,
+                    issue_number_by_gitlab_issue_id=issue_numbers,
+                    pr_number_by_gitlab_mr_id=pr_numbers,
+                    concurrency=concurrency,
+                )
+        # Shared across both upload phases so a file referenced from several bodies is
+        # uploaded once.
+        uploaded_url_by_upload: dict[GitLabProjectUpload, str] = {}
+        with _phase("Issue/PR uploads"):
+            apply_issue_and_pr_uploads(
                 plan,
                 client,
                 user_by_id=forgejo_user_by_gitlab_user_id,
                 issue_number_by_gitlab_issue_id=issue_numbers,
                 pr_number_by_gitlab_mr_id=pr_numbers,
+                upload_path_by_upload=upload_path_by_upload,
+                uploaded_url_by_upload=uploaded_url_by_upload,
+                upload_urls_by_body=upload_urls_by_body,
+                concurrency=concurrency,
             )
-    with _phase("Issue/PR uploads"):
-        apply_issue_and_pr_uploads(
-            plan,
-            client,
-            user_by_id=forgejo_user_by_gitlab_user_id,
-            issue_number_by_gitlab_issue_id=issue_numbers,
-            pr_number_by_gitlab_mr_id=pr_numbers,
-            upload_bytes_by_upload=upload_bytes_by_upload,
-        )
-    with _phase("Note uploads"):
-        apply_note_uploads(
-            plan,
-            client,
-            user_by_id=forgejo_user_by_gitlab_user_id,
-            comment_id_by_gitlab_note_id=comment_ids,
-            upload_bytes_by_upload=upload_bytes_by_upload,
-        )
-    with _phase("Apply labels"):
-        apply_issue_and_mr_labels(
-            plan,
-            client,
-            issue_number_by_gitlab_issue_id=issue_numbers,
-            pr_number_by_gitlab_mr_id=pr_numbers,
-        )
+
+        # Note uploads edit comment bodies while labels are set on the issues/PRs themselves, so
+        # the two final API phases overlap.
+        final_phase_concurrency = max(1, concurrency // 2)
+
+        def note_uploads_phase() -> None:
+            with _phase("Note uploads"):
+                apply_note_uploads(
+                    plan,
+                    client,
+                    user_by_id=forgejo_user_by_gitlab_user_id,
+                    comment_id_by_gitlab_note_id=comment_ids,
+                    upload_path_by_upload=upload_path_by_upload,
+                    uploaded_url_by_upload=uploaded_url_by_upload,
+                    upload_urls_by_body=upload_urls_by_body,
+                    concurrency=final_phase_concurrency,
+                )
+
+        def labels_phase() -> None:
+            with _phase("Apply labels"):
+                apply_issue_and_mr_labels(
+                    plan,
+                    client,
+                    issue_number_by_gitlab_issue_id=issue_numbers,
+                    pr_number_by_gitlab_mr_id=pr_numbers,
+                    concurrency=final_phase_concurrency,
+                    label_by_id=label_by_id,
+                    label_index=label_index,
+                )
+
+        _run_tasks([note_uploads_phase, labels_phase], concurrency=min(concurrency, 2))
+
     sql = build_metadata_fix_sql(
         plan,
         issue_number_by_gitlab_issue_id=issue_numbers,
@@ -2145,14 +2691,14 @@ def migrate_plan(
         comment_id_by_gitlab_note_id=comment_ids,
         include_issues=not fast_db_issues,
         include_merge_requests=True,
-        include_notes=not fast_db_issues,
+        include_notes=not fast_db_notes,
     )
     logger.info(
-        "Metadata backfill: issues=%d prs=%d comments=%d sql_bytes=%d",
+        "Metadata backfill: issues=%d prs=%d comments=%d sql_chars=%d",
         len(issue_numbers),
         len(pr_numbers),
         len(comment_ids),
-        len(sql.encode("utf-8")),
+        len(sql),
     )
     with _phase("Backfill metadata (DB)"):
         try:
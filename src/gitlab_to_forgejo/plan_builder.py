@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+import calendar
 import datetime as dt
 import re
+import sys
+from collections import defaultdict, deque
 from collections.abc import Iterable
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+from operator import attrgetter
 from pathlib import Path
 
 from gitlab_to_forgejo.copy_parser import iter_copy_rows
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OrgPlan:
     name: str
     full_path: str
@@ -17,7 +22,7 @@ class OrgPlan:
     description: str | None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RepoPlan:
     owner: str
     name: str
@@ -29,7 +34,7 @@ class RepoPlan:
     wiki_refs_path: Path
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UserPlan:
     gitlab_user_id: int
     username: str
@@ -41,7 +46,7 @@ class UserPlan:
     gitlab_otp_required_for_login: bool = False
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UserSSHKeyPlan:
     gitlab_key_id: int
     gitlab_user_id: int
@@ -49,7 +54,7 @@ class UserSSHKeyPlan:
     key: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LabelPlan:
     gitlab_label_id: int
     title: str
@@ -57,7 +62,7 @@ class LabelPlan:
     description: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IssuePlan:
     gitlab_issue_id: int
     gitlab_issue_iid: int
@@ -71,7 +76,7 @@ class IssuePlan:
     closed_unix: int = 0
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MergeRequestPlan:
     gitlab_mr_id: int
     gitlab_mr_iid: int
@@ -90,7 +95,7 @@ class MergeRequestPlan:
     closed_unix: int = 0
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NotePlan:
     gitlab_note_id: int
     gitlab_project_id: int
@@ -118,8 +123,25 @@ class Plan:
     mr_label_ids_by_gitlab_mr_id: dict[int, tuple[int, ...]] = field(default_factory=dict)
     user_ssh_keys: list[UserSSHKeyPlan] = field(default_factory=list)
 
+    @cached_property
+    def repo_by_project_id(self) -> dict[int, RepoPlan]:
+        """Repos keyed by GitLab project id, shared by every migration phase."""
+        return {repo.gitlab_project_id: repo for repo in self.repos}
 
-@dataclass(frozen=True)
+    @cached_property
+    def issue_label_ids(self) -> list[tuple[int, ...]]:
+        """Label ids per issue, parallel to `issues` (empty tuple when unlabelled)."""
+        get = self.issue_label_ids_by_gitlab_issue_id.get
+        return [get(issue.gitlab_issue_id, ()) for issue in self.issues]
+
+    @cached_property
+    def mr_label_ids(self) -> list[tuple[int, ...]]:
+        """Label ids per merge request, parallel to `merge_requests`."""
+        get = self.mr_label_ids_by_gitlab_mr_id.get
+        return [get(mr.gitlab_mr_id, ()) for mr in self.merge_requests]
+
+
+@dataclass(frozen=True, slots=True)
 class _GroupNamespace:
     id: int
     name: str
@@ -130,8 +152,12 @@ class _GroupNamespace:
 
 
 _BACKUP_ID_RE = re.compile(r"^:backup_id:\s*(\S+)\s*$", re.MULTILINE)
-_TZ_OFFSET_NO_COLON_RE = re.compile(r"([+-]\d{2})(\d{2})$")
-_TZ_OFFSET_HOURS_ONLY_RE = re.compile(r"[+-]\d{2}$")
+_UNIX_EPOCH = dt.datetime(1970, 1, 1)
+# Canonical pg_dump layout of the date/time fields; anything else goes through `datetime`.
+_CANONICAL_TIMESTAMP_RE = re.compile(
+    r"\d{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|[12]\d|3[01]) (?:[01]\d|2[0-3]):[0-5]\d:[0-5]\d"
+    r"(?:\.\d{1,6})?"
+)
 
 
 def _read_backup_id(backup_root: Path) -> str:
@@ -160,52 +186,98 @@ def _parse_timestamp_unix(raw: str | None) -> int:
     if not value:
         return 0
 
+    # Offsets (`Z`, `+HH`, `+HHMM`, `+HH:MM`) can only follow the seconds field; GitLab's
+    # `timestamp without time zone` columns (the bulk of the dump) have none and are UTC.
+    tz_start = len(value)
+    offset_s = 0
     if value.endswith("Z"):
-        value = value[:-1] + "+00:00"
-    elif _TZ_OFFSET_NO_COLON_RE.search(value):
-        value = value[:-2] + ":" + value[-2:]
-    elif _TZ_OFFSET_HOURS_ONLY_RE.search(value):
-        value = value + ":00"
-
-    parsed = dt.datetime.fromisoformat(value)
-    if parsed.tzinfo is None:
-        parsed = parsed.replace(tzinfo=dt.UTC)
-    return int(parsed.timestamp())
+        tz_start -= 1
+    else:
+        sign_pos = max(value.rfind("+", 19), value.rfind("-", 19))
+        if sign_pos != -1:
+            tz_start = sign_pos
+            digits = value[sign_pos + 1 :].replace(":", "")
+            offset_s = int(digits[:2]) * 3600 + int(digits[2:4] or 0) * 60
+            if value[sign_pos] == "-":
+                offset_s = -offset_s
+
+    day = int(value[8:10]) if _CANONICAL_TIMESTAMP_RE.fullmatch(value, 0, tz_start) else 0
+    if day == 0 or (day > 28 and day > calendar.monthrange(int(value[0:4]), int(value[5:7]))[1]):
+        # Not canonical, or a day past the end of its month: let `datetime` validate the value
+        # (raising ValueError for malformed input) rather than slicing out a wrong epoch.
+        local = dt.datetime.fromisoformat(value[:tz_start])
+        return int((local - _UNIX_EPOCH).total_seconds()) - offset_s
+    # `YYYY-MM-DD HH:MM:SS[.ffffff]`: slice the fields instead of building a datetime per value.
+    # Fractional seconds are dropped.
+    return (
+        calendar.timegm(
+            (
+                int(value[0:4]),
+                int(value[5:7]),
+                day,
+                int(value[11:13]),
+                int(value[14:16]),
+                int(value[17:19]),
+                0,
+                0,
+                0,
+            )
+        )
+        - offset_s
+    )
 
 
 def _find_root_group_id(groups: dict[int, _GroupNamespace], root_group_path: str) -> int:
-    candidates = [g for g in groups.values() if g.path == root_group_path]
-    if not candidates:
-        raise ValueError(f"no group namespace found with path={root_group_path!r}")
     # Prefer the top-level group (no parent). Fall back to lowest id.
-    candidates.sort(key=lambda g: (g.parent_id is not None, g.id))
-    return candidates[0].id
-
-
-def _is_descendant(
-    groups: dict[int, _GroupNamespace], *, root_id: int, group: _GroupNamespace
-) -> bool:
-    if group.id == root_id:
-        return True
-    if group.traversal_ids:
-        return root_id in group.traversal_ids
-
-    cur = group.parent_id
-    while cur is not None:
-        if cur == root_id:
-            return True
-        parent = groups.get(cur)
-        if parent is None:
-            break
-        cur = parent.parent_id
-    return False
+    root = min(
+        (g for g in groups.values() if g.path == root_group_path),
+        key=lambda g: (g.parent_id is not None, g.id),
+        default=None,
+    )
+    if root is None:
+        raise ValueError(f"no group namespace found with path={root_group_path!r}")
+    return root.id
+
+
+def _descendant_group_ids(groups: dict[int, _GroupNamespace], root_id: int) -> set[int]:
+    # Groups with traversal_ids (modern GitLab) answer membership directly; older rows fall back
+    # to the parent_id tree, walked once downward from the root.
+    children_by_parent: defaultdict[int, list[int]] = defaultdict(list)
+    for gid, group in groups.items():
+        if group.parent_id is not None:
+            children_by_parent[group.parent_id].append(gid)
+    reachable = {root_id}
+    queue = deque([root_id])
+    while queue:
+        for child_id in children_by_parent.get(queue.popleft(), ()):
+            if child_id not in reachable:
+                reachable.add(child_id)
+                queue.append(child_id)
+
+    return {
+        gid
+        for gid, group in groups.items()
+        if gid == root_id
+        or (root_id in group.traversal_ids if group.traversal_ids else gid in reachable)
+    }
 
 
-def _full_group_path(groups: dict[int, _GroupNamespace], group_id: int) -> str:
-    group = groups[group_id]
-    if group.parent_id is None or group.parent_id not in groups:
-        return group.path
-    return f"{_full_group_path(groups, group.parent_id)}/{group.path}"
+def _full_group_path(
+    groups: dict[int, _GroupNamespace], group_id: int, memo: dict[int, str]
+) -> str:
+    # Walk up to the first ancestor with a known path, then fill the chain top-down so sibling
+    # groups share their ancestors' work.
+    chain: list[_GroupNamespace] = []
+    cur: int | None = group_id
+    while cur is not None and cur not in memo and cur in groups:
+        group = groups[cur]
+        chain.append(group)
+        cur = group.parent_id
+    prefix = memo.get(cur) if cur is not None else None
+    for group in reversed(chain):
+        prefix = group.path if prefix is None else f"{prefix}/{group.path}"
+        memo[group.id] = prefix
+    return memo[group_id]
 
 
 def build_plan(backup_root: Path, *, root_group_path: str) -> Plan:
@@ -258,13 +330,12 @@ def build_plan(backup_root: Path, *, root_group_path: str) -> Plan:
         elif table == "projects":
             if descendant_group_ids is None:
                 root_id = _find_root_group_id(groups, root_group_path)
-                descendant_group_ids = {
-                    gid
-                    for gid, g in groups.items()
-                    if _is_descendant(groups, root_id=root_id, group=g)
-                }
-                for gid in sorted(descendant_group_ids, key=lambda i: _full_group_path(groups, i)):
-                    full_path = _full_group_path(groups, gid)
+                descendant_group_ids = _descendant_group_ids(groups, root_id)
+                full_path_by_gid: dict[int, str] = {}
+                for gid in descendant_group_ids:
+                    _full_group_path(groups, gid, full_path_by_gid)
+                for gid in sorted(descendant_group_ids, key=full_path_by_gid.__getitem__):
+                    full_path = full_path_by_gid[gid]
                     org_name = full_path.replace("/", "-")
                     org_name_by_ns_id[gid] = org_name
                     g = groups[gid]
@@ -322,24 +393,37 @@ def build_plan(backup_root: Path, *, root_group_path: str) -> Plan:
     if descendant_group_ids is None:
         raise ValueError("did not find any projects; unable to derive descendant group set")
 
-    # pass 2: members/issues/MRs/notes/users/keys
+    # pass 2: members/issues/MRs/notes/users/keys/labels/label_links
     direct_members: dict[int, dict[int, int]] = {gid: {} for gid in descendant_group_ids}
     interacting_user_ids: set[int] = set()
 
     issue_project_by_issue_id: dict[int, int] = {}
     target_project_by_mr_id: dict[int, int] = {}
     issues: list[IssuePlan] = []
-    merge_request_rows: list[
-        tuple[int, int, int, int | None, str, str, str, str, int, int, int | None, int, int, int]
-    ] = []
-    merge_request_diff_ids: set[int] = set()
+    merge_requests: list[MergeRequestPlan] = []
+    # latest_merge_request_diff_id -> indexes into merge_requests, filled in by pass 3.
+    mr_indexes_by_diff_id: defaultdict[int, list[int]] = defaultdict(list)
     notes: list[NotePlan] = []
     users_by_id: dict[int, UserPlan] = {}
     user_ssh_keys: list[UserSSHKeyPlan] = []
     labels_by_id: dict[int, LabelPlan] = {}
+    # A link is kept only if its label and its issue/MR are kept, and pg_dump writes `labels`
+    # and `merge_requests` after `label_links`; keep the (compact) assignments and filter them
+    # once the whole pass has been read.
+    label_links: list[tuple[str, int, int]] = []
 
     for table, row in iter_copy_rows(
-        db_path, tables={"members", "issues", "merge_requests", "notes", "users", "labels", "keys"}
+        db_path,
+        tables={
+            "members",
+            "issues",
+            "merge_requests",
+            "notes",
+            "users",
+            "labels",
+            "keys",
+            "label_links",
+        },
     ):
         if table == "members":
             if row["source_type"] != "Namespace":
@@ -392,7 +476,7 @@ def build_plan(backup_root: Path, *, root_group_path: str) -> Plan:
             latest_diff_id_raw = row.get("latest_merge_request_diff_id")
             latest_diff_id = int(latest_diff_id_raw) if latest_diff_id_raw is not None else None
             if latest_diff_id is not None:
-                merge_request_diff_ids.add(latest_diff_id)
+                mr_indexes_by_diff_id[latest_diff_id].append(len(merge_requests))
 
             source_project_id_raw = row.get("source_project_id")
             source_project_id = (
@@ -405,28 +489,28 @@ def build_plan(backup_root: Path, *, root_group_path: str) -> Plan:
                 row.get("merged_at")
             )
 
-            merge_request_rows.append(
-                (
-                    mr_id,
-                    int(row["iid"]),
-                    target_project_id,
-                    source_project_id,
-                    row["source_branch"] or "",
-                    row["target_branch"] or "",
-                    row["title"] or "",
-                    row["description"] or "",
-                    author_id,
-                    state_id,
-                    latest_diff_id,
-                    created_unix,
-                    updated_unix,
-                    closed_unix,
+            merge_requests.append(
+                MergeRequestPlan(
+                    gitlab_mr_id=mr_id,
+                    gitlab_mr_iid=int(row["iid"]),
+                    gitlab_target_project_id=target_project_id,
+                    source_branch=row["source_branch"] or "",
+                    # Most MRs target one of a handful of branches; share the strings.
+                    target_branch=sys.intern(row["target_branch"] or ""),
+                    title=row["title"] or "",
+                    description=row["description"] or "",
+                    author_id=author_id,
+                    gitlab_source_project_id=source_project_id,
+                    state_id=state_id,
+                    created_unix=created_unix,
+                    updated_unix=updated_unix,
+                    closed_unix=closed_unix,
                 )
             )
         elif table == "notes":
             if row["system"] == "t":
                 continue
-            noteable_type = row["noteable_type"] or ""
+            noteable_type = sys.intern(row["noteable_type"] or "")
             if noteable_type not in {"Issue", "MergeRequest"}:
                 continue
             if row["author_id"] is None or row["noteable_id"] is None or row["id"] is None:
@@ -536,17 +620,7 @@ def build_plan(backup_root: Path, *, root_group_path: str) -> Plan:
                 color=color,
                 description=description,
             )
-
-    users = sorted(users_by_id.values(), key=lambda u: u.username)
-    user_ssh_keys = sorted(
-        user_ssh_keys, key=lambda key_plan: (key_plan.gitlab_user_id, key_plan.gitlab_key_id)
-    )
-
-    # pass 2.5: label_links (issue/MR label assignments)
-    issue_label_ids: dict[int, list[int]] = {}
-    mr_label_ids: dict[int, list[int]] = {}
-    if issue_project_by_issue_id or target_project_by_mr_id:
-        for _, row in iter_copy_rows(db_path, tables={"label_links"}):
+        elif table == "label_links":
             target_type = (row.get("target_type") or "").strip()
             if target_type not in {"Issue", "MergeRequest"}:
                 continue
@@ -556,28 +630,34 @@ def build_plan(backup_root: Path, *, root_group_path: str) -> Plan:
             if target_id_raw is None or label_id_raw is None:
                 continue
             try:
-                target_id = int(target_id_raw)
-                label_id = int(label_id_raw)
+                label_links.append((target_type, int(target_id_raw), int(label_id_raw)))
             except ValueError:
                 continue
-            if label_id not in labels_by_id:
-                continue
 
-            if target_type == "Issue":
-                if target_id not in issue_project_by_issue_id:
-                    continue
-                issue_label_ids.setdefault(target_id, []).append(label_id)
-            else:  # MergeRequest
-                if target_id not in target_project_by_mr_id:
-                    continue
-                mr_label_ids.setdefault(target_id, []).append(label_id)
+    users = sorted(users_by_id.values(), key=attrgetter("username"))
+    user_ssh_keys.sort(key=attrgetter("gitlab_user_id", "gitlab_key_id"))
+
+    # label_links (issue/MR label assignments), read during pass 2
+    issue_label_ids: defaultdict[int, set[int]] = defaultdict(set)
+    mr_label_ids: defaultdict[int, set[int]] = defaultdict(set)
+    for target_type, target_id, label_id in label_links:
+        if label_id not in labels_by_id:
+            continue
+        if target_type == "Issue":
+            if target_id not in issue_project_by_issue_id:
+                continue
+            issue_label_ids[target_id].add(label_id)
+        else:  # MergeRequest
+            if target_id not in target_project_by_mr_id:
+                continue
+            mr_label_ids[target_id].add(label_id)
 
     issue_label_ids_by_gitlab_issue_id = {
-        issue_id: tuple(sorted(set(label_ids)))
+        issue_id: tuple(sorted(label_ids))
         for issue_id, label_ids in sorted(issue_label_ids.items())
     }
     mr_label_ids_by_gitlab_mr_id = {
-        mr_id: tuple(sorted(set(label_ids)))
+        mr_id: tuple(sorted(label_ids))
         for mr_id, label_ids in sorted(mr_label_ids.items())
     }
 
@@ -586,65 +666,30 @@ def build_plan(backup_root: Path, *, root_group_path: str) -> Plan:
         key=lambda label: (label.title.lower(), label.gitlab_label_id),
     )
 
-    # pass 3: merge_request_diffs (head/base commit SHAs)
-    head_sha_by_diff_id: dict[int, str] = {}
-    base_sha_by_diff_id: dict[int, str] = {}
-    if merge_request_diff_ids:
+    # pass 3: merge_request_diffs (head/base commit SHAs). This needs the diff ids collected
+    # from merge_requests in pass 2; reading it concurrently would mean keeping the SHAs of
+    # every diff in the dump, so the passes stay sequential.
+    if mr_indexes_by_diff_id:
+        pending_diff_ids = set(mr_indexes_by_diff_id)
         for _, row in iter_copy_rows(db_path, tables={"merge_request_diffs"}):
             diff_id_raw = row.get("id")
             if diff_id_raw is None:
                 continue
             diff_id = int(diff_id_raw)
-            if diff_id not in merge_request_diff_ids:
+            if diff_id not in pending_diff_ids:
                 continue
-            head_sha_by_diff_id[diff_id] = row.get("head_commit_sha") or ""
-            base_sha_by_diff_id[diff_id] = row.get("base_commit_sha") or ""
-            if len(head_sha_by_diff_id) >= len(merge_request_diff_ids):
+            pending_diff_ids.discard(diff_id)
+            head_commit_sha = row.get("head_commit_sha") or ""
+            base_commit_sha = row.get("base_commit_sha") or ""
+            for idx in mr_indexes_by_diff_id[diff_id]:
+                merge_requests[idx] = replace(
+                    merge_requests[idx],
+                    head_commit_sha=head_commit_sha,
+                    base_commit_sha=base_commit_sha,
+                )
+            if not pending_diff_ids:
                 break
 
-    merge_requests: list[MergeRequestPlan] = []
-    for (
-        mr_id,
-        mr_iid,
-        target_project_id,
-        source_project_id,
-        source_branch,
-        target_branch,
-        title,
-        description,
-        author_id,
-        state_id,
-        latest_diff_id,
-        created_unix,
-        updated_unix,
-        closed_unix,
-    ) in merge_request_rows:
-        head_commit_sha = (
-            head_sha_by_diff_id.get(latest_diff_id, "") if latest_diff_id is not None else ""
-        )
-        base_commit_sha = (
-            base_sha_by_diff_id.get(latest_diff_id, "") if latest_diff_id is not None else ""
-        )
-        merge_requests.append(
-            MergeRequestPlan(
-                gitlab_mr_id=mr_id,
-                gitlab_mr_iid=mr_iid,
-                gitlab_target_project_id=target_project_id,
-                source_branch=source_branch,
-                target_branch=target_branch,
-                title=title,
-                description=description,
-                author_id=author_id,
-                gitlab_source_project_id=source_project_id,
-                state_id=state_id,
-                head_commit_sha=head_commit_sha,
-                base_commit_sha=base_commit_sha,
-                created_unix=created_unix,
-                updated_unix=updated_unix,
-                closed_unix=closed_unix,
-            )
-        )
-
     # Compute effective membership for each org: direct + ancestor memberships.
     def iter_group_ancestors(group_id: int) -> Iterable[int]:
         cur: int | None = group_id
@@ -680,15 +725,15 @@ def build_plan(backup_root: Path, *, root_group_path: str) -> Plan:
 
     return Plan(
         backup_id=backup_id,
-        orgs=sorted(orgs, key=lambda o: o.name),
-        repos=sorted(repos, key=lambda r: (r.owner, r.name)),
+        orgs=sorted(orgs, key=attrgetter("name")),
+        repos=sorted(repos, key=attrgetter("owner", "name")),
         users=users,
         org_members=org_members,
-        issues=sorted(issues, key=lambda i: (i.gitlab_project_id, i.gitlab_issue_iid)),
+        issues=sorted(issues, key=attrgetter("gitlab_project_id", "gitlab_issue_iid")),
         merge_requests=sorted(
-            merge_requests, key=lambda mr: (mr.gitlab_target_project_id, mr.gitlab_mr_iid)
+            merge_requests, key=attrgetter("gitlab_target_project_id", "gitlab_mr_iid")
         ),
-        notes=sorted(notes, key=lambda n: (n.gitlab_project_id, n.noteable_type, n.noteable_id)),
+        notes=sorted(notes, key=attrgetter("gitlab_project_id", "noteable_type", "noteable_id")),
         uploads_tar_path=uploads_tar_path,
         labels=labels,
         issue_label_ids_by_gitlab_issue_id=issue_label_ids_by_gitlab_issue_id,
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from gitlab_to_forgejo.plan_builder import Plan, build_plan
+
+
+@pytest.fixture(scope="session")
+def mini_plan() -> Plan:
+    """The `fixtures/gitlab-mini` plan, parsed once per session; tests must not mutate it."""
+    return build_plan(
+        Path(__file__).resolve().parents[1] / "fixtures/gitlab-mini", root_group_path="pleroma"
+    )
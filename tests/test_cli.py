@@ -4,6 +4,8 @@ import logging
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
+
 from gitlab_to_forgejo import cli
 from gitlab_to_forgejo.plan_builder import (
     IssuePlan,
@@ -21,11 +23,22 @@ def _fixture_backup_root() -> Path:
     return Path(__file__).resolve().parents[1] / "fixtures/gitlab-mini"
 
 
+class _FakeClient:
+    def __init__(self) -> None:
+        self.closed = False
+
+    def __enter__(self) -> _FakeClient:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.closed = True
+
+
 def test_cli_migrate_builds_plan_and_applies(tmp_path: Path) -> None:
     token_file = tmp_path / "token"
     token_file.write_text("t0\n", encoding="utf-8")
 
-    fake_client = object()
+    fake_client = _FakeClient()
 
     with (
         patch("gitlab_to_forgejo.cli.migrate_plan") as migrate_plan,
@@ -55,6 +68,7 @@ def test_cli_migrate_builds_plan_and_applies(tmp_path: Path) -> None:
     assert plan.backup_id == "1770183352_2026_02_04_18.4.6"
 
     assert migrate_plan.call_args.args[1] is fake_client
+    assert fake_client.closed
     assert migrate_plan.call_args.kwargs["user_password"] == "pw"
     assert migrate_plan.call_args.kwargs["private_repos"] is True
     assert migrate_plan.call_args.kwargs["forgejo_url"] == "http://example.test"
@@ -115,6 +129,74 @@ def test_cli_migrate_can_enable_fast_db_issues(tmp_path: Path) -> None:
 
     assert rc == 0
     assert migrate_plan.call_args.kwargs["fast_db_issues"] is True
+    # Unset: notes follow the issue import path.
+    assert migrate_plan.call_args.kwargs["fast_db_notes"] is None
+
+
+def test_cli_migrate_can_disable_fast_db_notes(tmp_path: Path) -> None:
+    token_file = tmp_path / "token"
+    token_file.write_text("t0\n", encoding="utf-8")
+
+    with (
+        patch("gitlab_to_forgejo.cli.migrate_plan") as migrate_plan,
+        patch("gitlab_to_forgejo.cli.ForgejoClient"),
+    ):
+        rc = cli.main(
+            [
+                "migrate",
+                "--backup",
+                str(_fixture_backup_root()),
+                "--root-group",
+                "pleroma",
+                "--forgejo-url",
+                "http://example.test",
+                "--token-file",
+                str(token_file),
+                "--no-fast-db-notes",
+            ]
+        )
+
+    assert rc == 0
+    assert migrate_plan.call_args.kwargs["fast_db_notes"] is False
+
+
+def test_cli_migrate_passes_concurrency(tmp_path: Path) -> None:
+    token_file = tmp_path / "token"
+    token_file.write_text("t0\n", encoding="utf-8")
+
+    with (
+        patch("gitlab_to_forgejo.cli.migrate_plan") as migrate_plan,
+        patch("gitlab_to_forgejo.cli.ForgejoClient"),
+    ):
+        rc = cli.main(
+            [
+                "migrate",
+                "--backup",
+                str(_fixture_backup_root()),
+                "--root-group",
+                "pleroma",
+                "--forgejo-url",
+                "http://example.test",
+                "--token-file",
+                str(token_file),
+                "--concurrency",
+                "4",
+            ]
+        )
+
+    assert rc == 0
+    assert migrate_plan.call_args.kwargs["concurrency"] == 4
+
+
+@pytest.mark.parametrize("value", ["0", "-2", "many"])
+def test_cli_migrate_rejects_invalid_concurrency(
+    tmp_path: Path, value: str, capsys: pytest.CaptureFixture[str]
+) -> None:
+    with patch("gitlab_to_forgejo.cli.migrate_plan") as migrate_plan, pytest.raises(SystemExit):
+        cli.main(["migrate", "--token", "t0", "--concurrency", value])
+
+    migrate_plan.assert_not_called()
+    assert "--concurrency" in capsys.readouterr().err
 
 
 def test_cli_migrate_supports_only_repo_filter(tmp_path: Path) -> None:
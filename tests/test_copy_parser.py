@@ -53,3 +53,55 @@ def test_quoted_column_names_are_normalized() -> None:
     ]
     assert notes, "fixture should contain notes rows"
     assert "position" in notes[0]
+
+
+def test_stops_reading_after_requested_tables(tmp_path: Path) -> None:
+    db_path = tmp_path / "database.sql"
+    db_path.write_text(
+        "\n".join(
+            [
+                "COPY public.shards (id, name) FROM stdin;",
+                "1\tdefault",
+                "\\.",
+                # Anything after the last requested table is never parsed.
+                "COPY public.users id, username FROM stdin;",
+                "1\troot",
+                "\\.",
+            ]
+        ),
+        encoding="utf-8",
+    )
+
+    rows = list(iter_copy_rows(db_path, tables={"shards"}))
+
+    assert rows == [("shards", {"id": "1", "name": "default"})]
+
+
+def test_decodes_copy_escapes(tmp_path: Path) -> None:
+    db_path = tmp_path / "database.sql"
+    db_path.write_bytes(
+        b"COPY public.notes (id, note) FROM stdin;\n1\ta\\tb\\\\c\\x41\\101\\nd\\q\xc3\xa9\n\\.\n"
+    )
+
+    rows = list(iter_copy_rows(db_path, tables={"notes"}))
+
+    assert rows == [("notes", {"id": "1", "note": "a\tb\\cAA\ndq\u00e9"})]
+
+
+def test_rows_behave_like_read_only_mappings(tmp_path: Path) -> None:
+    db_path = tmp_path / "database.sql"
+    db_path.write_text(
+        'COPY public.notes (id, note, "position") FROM stdin;\n1\ta\\nb\t\\N\n\\.\n',
+        encoding="utf-8",
+    )
+
+    [(table, row)] = list(iter_copy_rows(db_path, tables={"notes"}))
+
+    assert table == "notes"
+    assert row["note"] == "a\nb"
+    assert row.get("position") is None
+    assert row.get("missing", "default") == "default"
+    assert "position" in row
+    assert "missing" not in row
+    assert list(row) == ["id", "note", "position"]
+    assert dict(row) == {"id": "1", "note": "a\nb", "position": None}
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import io
 import json
 
+import pytest
+import requests
 import responses
+from requests.adapters import HTTPAdapter
 
-from gitlab_to_forgejo.forgejo_client import ForgejoClient
+from gitlab_to_forgejo.forgejo_client import ForgejoClient, ForgejoError
 
 
 @responses.activate
@@ -24,6 +28,53 @@ def test_get_user_uses_token_header() -> None:
     assert responses.calls[0].request.headers["Authorization"] == "token t0"
 
 
+def test_default_session_pools_connections() -> None:
+    client = ForgejoClient(base_url="https://example.test", token="t0")
+
+    adapter = client._session.get_adapter("https://example.test/api/v1/users/alice")
+
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter._pool_maxsize == 32
+
+
+@responses.activate
+def test_default_session_retries_gateway_errors_for_get_only() -> None:
+    client = ForgejoClient(base_url="http://example.test", token="t0")
+
+    responses.add(responses.GET, "http://example.test/api/v1/users/alice", status=503)
+    responses.add(
+        responses.GET,
+        "http://example.test/api/v1/users/alice",
+        json={"username": "alice"},
+        status=200,
+    )
+    responses.add(responses.POST, "http://example.test/api/v1/repos/o/r/issues", status=502)
+
+    assert client.get_user("alice")["username"] == "alice"
+
+    with pytest.raises(ForgejoError) as excinfo:
+        client.create_issue(owner="o", repo="r", title="T", body="B")
+    assert excinfo.value.status_code == 502
+    assert [c.request.method for c in responses.calls] == ["GET", "GET", "POST"]
+
+
+@responses.activate
+def test_create_issue_decodes_utf8_json_without_charset() -> None:
+    client = ForgejoClient(base_url="http://example.test", token="t0")
+
+    responses.add(
+        responses.POST,
+        "http://example.test/api/v1/repos/o/r/issues",
+        body=json.dumps({"number": 7, "title": "Grüße"}, ensure_ascii=False).encode("utf-8"),
+        content_type="application/json",
+        status=201,
+    )
+
+    resp = client.create_issue(owner="o", repo="r", title="Grüße", body="B")
+
+    assert resp == {"number": 7, "title": "Grüße"}
+
+
 @responses.activate
 def test_ensure_user_creates_when_missing() -> None:
     client = ForgejoClient(base_url="http://example.test", token="t0")
@@ -94,6 +145,15 @@ def test_ensure_team_creates_when_missing() -> None:
     assert body["permission"] == "admin"
     assert body["includes_all_repositories"] is True
 
+    # The created team is remembered, so asking again needs no further requests.
+    assert (
+        client.ensure_team(
+            org="pleroma", name="Maintainers", permission="admin", includes_all_repositories=True
+        )
+        == 2
+    )
+    assert len(responses.calls) == 2
+
 
 @responses.activate
 def test_ensure_team_write_includes_units_map() -> None:
@@ -173,6 +233,24 @@ def test_create_issue_uses_sudo_param() -> None:
     assert body == {"title": "Hello", "body": "World"}
 
 
+@responses.activate
+def test_json_request_bodies_are_compact_utf8() -> None:
+    client = ForgejoClient(base_url="http://example.test", token="t0")
+
+    responses.add(
+        responses.POST,
+        "http://example.test/api/v1/repos/pleroma/docs/issues",
+        json={"number": 1},
+        status=201,
+    )
+
+    client.create_issue(owner="pleroma", repo="docs", title="Héllo", body="→", sudo=None)
+
+    request = responses.calls[0].request
+    assert request.headers["Content-Type"] == "application/json"
+    assert request.body == '{"title":"Héllo","body":"→"}'.encode()
+
+
 @responses.activate
 def test_create_pull_request_uses_sudo_param() -> None:
     client = ForgejoClient(base_url="http://example.test", token="t0")
@@ -291,6 +369,7 @@ def test_replace_issue_labels_puts_names() -> None:
     assert labels[0]["name"] == "bug"
     body = json.loads(responses.calls[0].request.body)
     assert body == {"labels": ["bug", "discussion"]}
+    assert responses.calls[0].request.headers["Content-Type"] == "application/json"
 
 
 @responses.activate
@@ -345,6 +424,40 @@ def test_create_issue_comment_attachment_posts_multipart() -> None:
     assert "sudo=lanodan" in responses.calls[0].request.url
 
 
+@responses.activate
+def test_create_issue_attachment_streams_file_objects() -> None:
+    client = ForgejoClient(base_url="http://example.test", token="t0")
+    received: list[tuple[str, bytes]] = []
+
+    def _callback(request: requests.PreparedRequest) -> tuple[int, dict[str, str], str]:
+        received.append((request.headers["Content-Type"], b"".join(request.body)))
+        return 201, {}, json.dumps({"uuid": "u3"})
+
+    responses.add_callback(
+        responses.POST,
+        "http://example.test/api/v1/repos/pleroma/docs/issues/1/assets",
+        callback=_callback,
+    )
+
+    attachment = client.create_issue_attachment(
+        owner="pleroma",
+        repo="docs",
+        issue_number=1,
+        filename="screen.png",
+        content=io.BytesIO(b"png-bytes"),
+    )
+
+    assert attachment["uuid"] == "u3"
+    [(content_type, body)] = received
+    assert content_type.startswith("multipart/form-data; boundary=")
+    boundary = content_type.split("boundary=", 1)[1].encode()
+    assert body == (
+        b"--" + boundary + b"\r\n"
+        b'Content-Disposition: form-data; name="attachment"; filename="screen.png"\r\n\r\n'
+        b"png-bytes\r\n--" + boundary + b"--\r\n"
+    )
+
+
 @responses.activate
 def test_edit_issue_body_patches_body() -> None:
     client = ForgejoClient(base_url="http://example.test", token="t0")
@@ -394,3 +507,15 @@ def test_edit_pull_request_body_patches_body() -> None:
 
     payload = json.loads(responses.calls[0].request.body)
     assert payload == {"body": "new body"}
+
+
+def test_forgejo_error_normalized_body_lowercases_and_collapses_whitespace() -> None:
+    err = ForgejoError(
+        method="POST",
+        url="http://example.test",
+        status_code=422,
+        body="Key  Has Been\n Used",
+    )
+
+    assert err.normalized_body == "key has been used"
+    assert err.normalized_body is err.normalized_body
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import dataclasses
 from pathlib import Path
 
 from gitlab_to_forgejo.forgejo_db import (
@@ -86,7 +87,7 @@ def _mk_plan() -> Plan:
     )
 
 
-def test_build_fast_issue_import_sql_generates_insert_and_issue_index_sync() -> None:
+def test_build_fast_issue_import_sql_copies_rows_and_syncs_issue_index() -> None:
     plan = _mk_plan()
     sql = build_fast_issue_import_sql(
         plan,
@@ -94,14 +95,20 @@ def test_build_fast_issue_import_sql_generates_insert_and_issue_index_sync() ->
         forgejo_username_by_gitlab_user_id={20: "alice"},
     )
 
-    assert "BEGIN;" in sql
-    assert "INSERT INTO issue (" in sql
-    assert 'ON CONFLICT (repo_id, "index") DO NOTHING;' in sql
-    assert "issue_index" in sql
-    assert "max_index" in sql
-    assert "COMMIT;" in sql
-    assert "79" in sql
-    assert "'Issue title'" in sql
+    lines = sql.split("\n")
+    assert lines[0] == "BEGIN;"
+    copy_at = lines.index("COPY _gitlab_fast_issue FROM stdin;")
+    assert lines[copy_at + 1 : copy_at + 3] == [
+        "pleroma\tpleroma-fe\talice\t79\tIssue title\tIssue body\tf\t100\t150\t0",
+        "\\.",
+    ]
+    assert "CREATE TEMP TABLE _gitlab_fast_issue (" in lines[:copy_at]
+    assert lines[copy_at + 3] == "INSERT INTO issue ("
+    assert "FROM _gitlab_fast_issue v" in lines
+    assert 'ON CONFLICT (repo_id, "index") DO NOTHING;' in lines
+    assert "SELECT r.id, 79" in lines
+    assert "DO UPDATE SET max_index = GREATEST(issue_index.max_index, EXCLUDED.max_index);" in lines
+    assert lines[-2:] == ["COMMIT;", ""]
 
 
 def test_build_fast_note_import_sql_uses_note_id_for_comment_id_and_returns_mapping() -> None:
@@ -114,9 +121,59 @@ def test_build_fast_note_import_sql_uses_note_id_for_comment_id_and_returns_mapp
     )
 
     assert comment_ids == {5001: 5001}
-    assert "BEGIN;" in sql
-    assert "INSERT INTO comment (" in sql
-    assert "ON CONFLICT (id) DO NOTHING;" in sql
-    assert 'i."index" = 79' in sql
+    lines = sql.split("\n")
+    assert lines[0] == "BEGIN;"
+    copy_at = lines.index("COPY _gitlab_fast_comment FROM stdin;")
+    assert lines[copy_at + 1 : copy_at + 3] == [
+        "5001\tpleroma\tpleroma-fe\t79\tbob\tcomment body\t120\t121",
+        "\\.",
+    ]
+    assert lines[copy_at + 3] == "INSERT INTO comment ("
+    assert "FROM _gitlab_fast_comment v" in lines
+    assert '  AND i."index" = v.issue_index' in lines
+    assert "ON CONFLICT (id) DO NOTHING;" in lines
     assert "num_comments" in sql
-    assert "COMMIT;" in sql
+    assert lines[-2:] == ["COMMIT;", ""]
+
+
+def test_build_fast_import_sql_escapes_copy_fields() -> None:
+    plan = _mk_plan()
+    text = "a\tb\nc\\d\r\n\\.\nend"
+    plan = dataclasses.replace(
+        plan,
+        issues=[dataclasses.replace(plan.issues[0], title=text, description=text)],
+        notes=[dataclasses.replace(plan.notes[0], body=text)],
+    )
+
+    issue_sql = build_fast_issue_import_sql(
+        plan,
+        issue_number_by_gitlab_issue_id={1001: 79},
+        forgejo_username_by_gitlab_user_id={20: "alice"},
+    )
+    note_sql, _ = build_fast_note_import_sql(
+        plan,
+        issue_number_by_gitlab_issue_id={1001: 79},
+        pr_number_by_gitlab_mr_id={},
+        forgejo_username_by_gitlab_user_id={21: "bob"},
+    )
+
+    escaped = "a\\tb\\nc\\\\d\\r\\n\\\\.\\nend"
+    issue_lines = issue_sql.split("\n")
+    row = issue_lines[issue_lines.index("COPY _gitlab_fast_issue FROM stdin;") + 1]
+    assert row.split("\t")[4:6] == [escaped, escaped]
+    note_lines = note_sql.split("\n")
+    row = note_lines[note_lines.index("COPY _gitlab_fast_comment FROM stdin;") + 1]
+    assert row.split("\t")[5] == escaped
+    # Only the terminator may appear as a bare `\.` line.
+    assert issue_lines.count("\\.") == 1
+    assert note_lines.count("\\.") == 1
+
+
+def test_build_fast_issue_import_sql_without_rows_is_empty() -> None:
+    sql = build_fast_issue_import_sql(
+        _mk_plan(),
+        issue_number_by_gitlab_issue_id={},
+        forgejo_username_by_gitlab_user_id={20: "alice"},
+    )
+
+    assert sql == ""
@@ -11,46 +11,62 @@ from gitlab_to_forgejo.plan_builder import (
     Plan,
     RepoPlan,
     UserPlan,
-    build_plan,
 )
 
 
-def _fixture_backup_root() -> Path:
-    return Path(__file__).resolve().parents[1] / "fixtures/gitlab-mini"
-
-
 def _unix(ts: str) -> int:
     return int(dt.datetime.fromisoformat(ts).replace(tzinfo=dt.UTC).timestamp())
 
 
-def test_build_metadata_fix_sql_updates_issue_and_comment_timestamps() -> None:
-    plan = build_plan(_fixture_backup_root(), root_group_path="pleroma")
+def test_build_metadata_fix_sql_updates_issue_and_comment_timestamps(mini_plan: Plan) -> None:
     sql = build_metadata_fix_sql(
-        plan,
+        mini_plan,
         issue_number_by_gitlab_issue_id={2978: 12},
         pr_number_by_gitlab_mr_id={3973: 34},
         comment_id_by_gitlab_note_id={53164: 101, 53191: 102, 53193: 103},
     )
 
-    assert "BEGIN;" in sql
-    assert "COMMIT;" in sql
+    assert sql.startswith("BEGIN;\n")
+    assert sql.endswith("COMMIT;\n")
 
+    assert "COPY _gitlab_issue_meta FROM stdin;" in sql
     assert "UPDATE issue i" in sql
-    assert "u.lower_name = lower('pleroma')" in sql
-    assert "r.lower_name = lower('docs')" in sql
-    assert 'i."index" = 12' in sql
-    assert f"created_unix = {_unix('2020-02-23 18:11:52.11909')}" in sql
-    assert f"updated_unix = {_unix('2020-03-08 14:04:32.974976')}" in sql
+    assert "JOIN repository r ON r.owner_id = u.id AND r.lower_name = lower(t.repo)" in sql
+    issue_row = "\t".join(
+        [
+            "pleroma",
+            "docs",
+            "12",
+            "f",
+            str(_unix("2020-02-23 18:11:52.11909")),
+            str(_unix("2020-03-08 14:04:32.974976")),
+            "0",
+            "f",
+        ]
+    )
+    assert f"\n{issue_row}\n" in sql
 
     # MR/PR opening post timestamp.
-    assert "-- gitlab mr !3 → pleroma/docs #34" in sql
-    assert f"created_unix = {_unix('2020-03-08 15:10:43.272445')}" in sql
-    assert f"updated_unix = {_unix('2020-03-08 16:02:46.115598')}" in sql
+    mr_row = "\t".join(
+        [
+            "pleroma",
+            "docs",
+            "34",
+            "t",
+            str(_unix("2020-03-08 15:10:43.272445")),
+            str(_unix("2020-03-08 16:02:46.115598")),
+            "0",
+            "f",
+        ]
+    )
+    assert f"\n{mr_row}\n" in sql
 
     # Issue note comment timestamp.
-    assert "UPDATE comment" in sql
-    assert f"created_unix = {_unix('2020-03-08 14:04:32.951042')}" in sql
-    assert "WHERE id = 101" in sql
+    assert "COPY _gitlab_comment_meta FROM stdin;" in sql
+    assert "UPDATE comment c" in sql
+    created = _unix("2020-03-08 14:04:32.951042")
+    assert f"\n101\t{created}\t" in sql
+    assert sql.count("\n\\.\n") == 2
 
 
 def test_build_metadata_fix_sql_closes_closed_issues_and_sets_closed_time() -> None:
@@ -122,6 +138,71 @@ def test_build_metadata_fix_sql_closes_closed_issues_and_sets_closed_time() -> N
         comment_id_by_gitlab_note_id={1: 999},
     )
 
-    assert "is_closed = TRUE" in sql
-    assert "closed_unix = 200" in sql
-    assert "WHERE id = 999" in sql
+    assert "\npleroma\tdocs\t7\tf\t100\t200\t200\tt\n" in sql
+    assert "\n999\t150\t150\n" in sql
+
+
+def test_build_metadata_fix_sql_escapes_copy_fields() -> None:
+    plan = Plan(
+        backup_id="x",
+        orgs=[],
+        repos=[
+            RepoPlan(
+                owner="we\\ird",
+                name="tab\tname",
+                gitlab_project_id=1,
+                gitlab_disk_path="",
+                bundle_path=Path("/tmp/repo.bundle"),
+                refs_path=Path("/tmp/repo.refs"),
+                wiki_bundle_path=Path("/tmp/wiki.bundle"),
+                wiki_refs_path=Path("/tmp/wiki.refs"),
+            )
+        ],
+        users=[],
+        org_members={},
+        issues=[
+            IssuePlan(
+                gitlab_issue_id=1,
+                gitlab_issue_iid=1,
+                gitlab_project_id=1,
+                title="T",
+                description="D",
+                author_id=1,
+                created_unix=10,
+            )
+        ],
+        merge_requests=[],
+        notes=[],
+    )
+
+    sql = build_metadata_fix_sql(
+        plan,
+        issue_number_by_gitlab_issue_id={1: 1},
+        pr_number_by_gitlab_mr_id={},
+        comment_id_by_gitlab_note_id={},
+    )
+
+    assert "\nwe\\\\ird\ttab\\tname\t1\tf\t10\t10\t0\tf\n" in sql
+    assert "_gitlab_comment_meta" not in sql
+
+
+def test_build_metadata_fix_sql_without_rows_is_an_empty_transaction() -> None:
+    plan = Plan(
+        backup_id="x",
+        orgs=[],
+        repos=[],
+        users=[],
+        org_members={},
+        issues=[],
+        merge_requests=[],
+        notes=[],
+    )
+
+    sql = build_metadata_fix_sql(
+        plan,
+        issue_number_by_gitlab_issue_id={},
+        pr_number_by_gitlab_mr_id={},
+        comment_id_by_gitlab_note_id={},
+    )
+
+    assert sql == "BEGIN;\nCOMMIT;\n"
@@ -55,6 +55,18 @@ def test_read_ref_shas_includes_merge_request_refs() -> None:
     assert shas["refs/merge-requests/3/head"] == "8d363825a9a6a94a4db1bc8da1be5b3afd2441fb"
 
 
+def test_read_ref_shas_returns_copies_and_rereads_changed_files(tmp_path: Path) -> None:
+    refs = tmp_path / "001.refs"
+    refs.write_text("aaaaaaaa refs/heads/main\n", encoding="utf-8")
+
+    first = read_ref_shas(refs)
+    first["refs/heads/other"] = "x"
+    assert read_ref_shas(refs) == {"refs/heads/main": "aaaaaaaa"}
+
+    refs.write_text("aaaaaaaa refs/heads/main\nbbbbbbbb refs/tags/v1\n", encoding="utf-8")
+    assert read_ref_shas(refs) == {"refs/heads/main": "aaaaaaaa", "refs/tags/v1": "bbbbbbbb"}
+
+
 def test_list_wiki_push_refspecs_maps_master_to_main() -> None:
     refs_path = Path(__file__).resolve().parents[1] / "fixtures/wiki-refs/master_only.refs"
     assert list_wiki_push_refspecs(refs_path) == [
@@ -6,8 +6,10 @@ from pathlib import Path
 
 from gitlab_to_forgejo.gitlab_uploads import (
     GitLabProjectUpload,
+    extract_uploads,
     iter_gitlab_upload_urls,
-    read_project_uploads_from_uploads,
+    iter_user_avatars_from_uploads,
+    mentions_gitlab_uploads,
     replace_gitlab_upload_urls,
 )
 
@@ -26,6 +28,32 @@ def test_iter_gitlab_upload_urls_finds_upload_paths() -> None:
     ]
 
 
+def test_iter_gitlab_upload_urls_ignores_text_without_lowercase_uploads_prefix() -> None:
+    assert iter_gitlab_upload_urls("no attachments here") == []
+    assert iter_gitlab_upload_urls("/UPLOADS/765b08065cca166722283f5cf5234971/screen.png") == []
+
+
+def test_iter_gitlab_upload_urls_returns_fresh_lists_for_repeated_text() -> None:
+    text = "see /uploads/765b08065cca166722283f5cf5234971/log.txt and again"
+
+    first = iter_gitlab_upload_urls(text)
+    first.clear()
+
+    assert iter_gitlab_upload_urls(text) == [
+        (
+            "/uploads/765b08065cca166722283f5cf5234971/log.txt",
+            "765b08065cca166722283f5cf5234971",
+            "log.txt",
+        )
+    ]
+
+
+def test_mentions_gitlab_uploads_is_a_prefix_prefilter() -> None:
+    assert mentions_gitlab_uploads("see /uploads/765b08065cca166722283f5cf5234971/a.png")
+    assert mentions_gitlab_uploads("/uploads/ but no hash")
+    assert not mentions_gitlab_uploads("no attachments here")
+
+
 def test_replace_gitlab_upload_urls_rewrites_only_matched_urls() -> None:
     original = (
         "a /uploads/aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa/a.png "
@@ -42,7 +70,13 @@ def test_replace_gitlab_upload_urls_rewrites_only_matched_urls() -> None:
     )
 
 
-def test_read_project_uploads_from_uploads_extracts_bytes(tmp_path: Path) -> None:
+def test_replace_gitlab_upload_urls_returns_text_unchanged_without_mapping() -> None:
+    text = "a /uploads/aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa/a.png"
+
+    assert replace_gitlab_upload_urls(text, mapping={}) is text
+
+
+def test_extract_uploads_streams_project_uploads_to_disk(tmp_path: Path) -> None:
     uploads = tmp_path / "uploads.tar.gz"
     payload = b"file-bytes"
 
@@ -54,13 +88,66 @@ def test_read_project_uploads_from_uploads_extracts_bytes(tmp_path: Path) -> Non
     )
 
     with tarfile.open(uploads, "w:gz") as tf:
-        info = tarfile.TarInfo(
-            name=f"./{disk_path}/{upload.upload_hash}/{upload.filename}",
-        )
+        # Member names may come without the leading "./".
+        info = tarfile.TarInfo(name=f"{disk_path}/{upload.upload_hash}/{upload.filename}")
         info.size = len(payload)
         tf.addfile(info, io.BytesIO(payload))
 
-    extracted = read_project_uploads_from_uploads(uploads, desired={upload})
+    dest_dir = tmp_path / "extracted"
+    dest_dir.mkdir()
+    extracted = extract_uploads(
+        uploads, desired_avatars={}, desired_uploads={upload}, dest_dir=dest_dir
+    )
+
+    assert extracted.avatar_path_by_user_id == {}
+    assert list(extracted.upload_path_by_upload) == [upload]
+    assert extracted.upload_path_by_upload[upload].parent == dest_dir
+    assert extracted.upload_path_by_upload[upload].read_bytes() == payload
 
-    assert extracted == {upload: payload}
 
+def test_iter_user_avatars_from_uploads_yields_in_archive_order(tmp_path: Path) -> None:
+    uploads = tmp_path / "uploads.tar.gz"
+
+    with tarfile.open(uploads, "w:gz") as tf:
+        for user_id, payload in [(7, b"seven"), (3, b"three"), (9, b"unwanted")]:
+            info = tarfile.TarInfo(name=f"./-/system/user/avatar/{user_id}/avatar.png")
+            info.size = len(payload)
+            tf.addfile(info, io.BytesIO(payload))
+
+    avatars = iter_user_avatars_from_uploads(
+        uploads, desired={3: "avatar.png", 7: "avatar.png", 8: None}
+    )
+
+    assert list(avatars) == [(7, b"seven"), (3, b"three")]
+
+
+def test_extract_uploads_reads_avatars_and_project_uploads_in_one_pass(tmp_path: Path) -> None:
+    uploads = tmp_path / "uploads.tar.gz"
+    upload = GitLabProjectUpload(
+        disk_path="@hashed/aa/bb/meta",
+        upload_hash="765b08065cca166722283f5cf5234971",
+        filename="screen.png",
+    )
+    members = [
+        ("./-/system/user/avatar/43/avatar.png", b"avatar"),
+        (f"./{upload.disk_path}/{upload.upload_hash}/{upload.filename}", b"screen"),
+    ]
+    with tarfile.open(uploads, "w:gz") as tf:
+        for name, payload in members:
+            info = tarfile.TarInfo(name=name)
+            info.size = len(payload)
+            tf.addfile(info, io.BytesIO(payload))
+    dest_dir = tmp_path / "out"
+    dest_dir.mkdir()
+
+    extracted = extract_uploads(
+        uploads,
+        desired_avatars={43: "avatar.png", 44: "missing.png"},
+        desired_uploads={upload},
+        dest_dir=dest_dir,
+    )
+
+    assert set(extracted.avatar_path_by_user_id) == {43}
+    assert extracted.avatar_path_by_user_id[43].read_bytes() == b"avatar"
+    assert set(extracted.upload_path_by_upload) == {upload}
+    assert extracted.upload_path_by_upload[upload].read_bytes() == b"screen"
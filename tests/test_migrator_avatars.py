@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import base64
 import io
+import logging
 import tarfile
 from pathlib import Path
 
+import pytest
+
 from gitlab_to_forgejo.migrator import apply_user_avatars
 from gitlab_to_forgejo.plan_builder import OrgPlan, Plan, RepoPlan, UserPlan
 
@@ -69,3 +72,79 @@ def test_apply_user_avatars_extracts_from_uploads_tar_and_sets_avatar(tmp_path:
 
     expected = base64.b64encode(png_bytes).decode("ascii")
     assert client.calls == [("update_user_avatar", expected, "alice")]
+
+
+def test_apply_user_avatars_skips_archive_when_no_avatar_user_was_migrated(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    plan = Plan(
+        backup_id="x",
+        orgs=[],
+        repos=[],
+        users=[
+            UserPlan(
+                gitlab_user_id=43,
+                username="alice",
+                email="a@e",
+                full_name="A",
+                state="active",
+                avatar="avatar.png",
+            )
+        ],
+        org_members={},
+        issues=[],
+        merge_requests=[],
+        notes=[],
+        # Does not exist: opening it would log an exception.
+        uploads_tar_path=tmp_path / "uploads.tar.gz",
+    )
+
+    client = _FakeForgejo()
+    with caplog.at_level(logging.ERROR):
+        apply_user_avatars(plan, client, user_by_id={})
+
+    assert client.calls == []
+    assert caplog.records == []
+
+
+def test_apply_user_avatars_reads_extracted_files_and_skips_missing_ones(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    png_bytes = b"\x89PNG\r\n\x1a\n"
+    alice_path = tmp_path / "000001-avatar-43"
+    alice_path.write_bytes(png_bytes)
+    plan = Plan(
+        backup_id="x",
+        orgs=[],
+        repos=[],
+        users=[
+            UserPlan(
+                gitlab_user_id=user_id,
+                username=username,
+                email=f"{username}@e",
+                full_name=username,
+                state="active",
+                avatar="avatar.png",
+            )
+            for user_id, username in ((43, "alice"), (44, "bob"))
+        ],
+        org_members={},
+        issues=[],
+        merge_requests=[],
+        notes=[],
+        uploads_tar_path=tmp_path / "uploads.tar.gz",
+    )
+
+    client = _FakeForgejo()
+    with caplog.at_level(logging.ERROR):
+        apply_user_avatars(
+            plan,
+            client,
+            user_by_id={43: "alice", 44: "bob"},
+            concurrency=2,
+            avatar_path_by_user_id={43: alice_path, 44: tmp_path / "000002-avatar-44"},
+        )
+
+    expected = base64.b64encode(png_bytes).decode("ascii")
+    assert client.calls == [("update_user_avatar", expected, "alice")]
+    assert "Read extracted avatar failed for gitlab user id=44" in caplog.text
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 from pathlib import Path
 from unittest.mock import patch
 
@@ -112,3 +113,130 @@ def test_migrate_plan_uses_fast_db_issue_and_note_paths_when_enabled() -> None:
     assert meta_sql.call_args.kwargs["include_issues"] is False
     assert meta_sql.call_args.kwargs["include_notes"] is False
     assert meta_sql.call_args.kwargs["include_merge_requests"] is True
+
+
+def test_migrate_plan_imports_notes_via_api_when_issues_use_api() -> None:
+    plan = _plan()
+
+    with (
+        patch("gitlab_to_forgejo.migrator.apply_plan", return_value={"alice": "alice"}),
+        patch("gitlab_to_forgejo.migrator.apply_user_ssh_keys"),
+        patch("gitlab_to_forgejo.migrator.apply_user_avatars"),
+        patch("gitlab_to_forgejo.migrator.apply_repos"),
+        patch("gitlab_to_forgejo.migrator.ensure_repo_labels"),
+        patch("gitlab_to_forgejo.migrator.push_repos"),
+        patch("gitlab_to_forgejo.migrator.push_wikis"),
+        patch("gitlab_to_forgejo.migrator.push_merge_request_heads"),
+        patch("gitlab_to_forgejo.migrator.apply_issues", return_value={1001: 1}) as apply_issues,
+        patch("gitlab_to_forgejo.migrator.apply_issues_db_fast") as apply_issues_db_fast,
+        patch("gitlab_to_forgejo.migrator.apply_merge_requests", return_value={}),
+        patch("gitlab_to_forgejo.migrator.apply_notes", return_value={5001: 9}) as apply_notes,
+        patch("gitlab_to_forgejo.migrator.apply_notes_db_fast") as apply_notes_db_fast,
+        patch("gitlab_to_forgejo.migrator.apply_issue_and_pr_uploads"),
+        patch("gitlab_to_forgejo.migrator.apply_note_uploads"),
+        patch("gitlab_to_forgejo.migrator.apply_issue_and_mr_labels"),
+        patch("gitlab_to_forgejo.migrator.build_metadata_fix_sql", return_value="") as meta_sql,
+        patch("gitlab_to_forgejo.migrator.apply_metadata_fix_sql"),
+    ):
+        migrate_plan(
+            plan,
+            client=object(),  # type: ignore[arg-type]
+            user_password="pw",
+            private_repos=True,
+            forgejo_url="http://example.test",
+            git_username="root",
+            git_token="t0",
+        )
+
+    apply_issues.assert_called_once()
+    apply_issues_db_fast.assert_not_called()
+    apply_notes.assert_called_once()
+    apply_notes_db_fast.assert_not_called()
+    assert meta_sql.call_args.kwargs["include_issues"] is True
+    assert meta_sql.call_args.kwargs["include_notes"] is True
+
+
+def test_migrate_plan_overlaps_repo_labels_with_git_pushes_when_concurrent() -> None:
+    plan = _plan()
+    labels_started = threading.Event()
+
+    def push_repos(*args: object, **kwargs: object) -> None:
+        # Only returns once labels are running in parallel with the git pushes.
+        assert labels_started.wait(timeout=5)
+
+    with (
+        patch("gitlab_to_forgejo.migrator.apply_plan", return_value={"alice": "alice"}),
+        patch("gitlab_to_forgejo.migrator.apply_user_ssh_keys"),
+        patch("gitlab_to_forgejo.migrator.apply_user_avatars"),
+        patch("gitlab_to_forgejo.migrator.apply_repos"),
+        patch(
+            "gitlab_to_forgejo.migrator.ensure_repo_labels",
+            side_effect=lambda *a, **k: labels_started.set(),
+        ),
+        patch("gitlab_to_forgejo.migrator.push_repos", side_effect=push_repos),
+        patch("gitlab_to_forgejo.migrator.push_wikis"),
+        patch("gitlab_to_forgejo.migrator.push_merge_request_heads") as push_mr_heads,
+        patch("gitlab_to_forgejo.migrator.apply_issues", return_value={1001: 79}) as apply_issues,
+        patch("gitlab_to_forgejo.migrator.apply_merge_requests", return_value={}),
+        patch("gitlab_to_forgejo.migrator.apply_notes", return_value={}),
+        patch("gitlab_to_forgejo.migrator.apply_issue_and_pr_uploads"),
+        patch("gitlab_to_forgejo.migrator.apply_note_uploads"),
+        patch("gitlab_to_forgejo.migrator.apply_issue_and_mr_labels"),
+        patch("gitlab_to_forgejo.migrator.build_metadata_fix_sql", return_value=""),
+        patch("gitlab_to_forgejo.migrator.apply_metadata_fix_sql"),
+    ):
+        migrate_plan(
+            plan,
+            client=object(),  # type: ignore[arg-type]
+            user_password="pw",
+            private_repos=True,
+            forgejo_url="http://example.test",
+            git_username="root",
+            git_token="t0",
+            concurrency=2,
+        )
+
+    push_mr_heads.assert_called_once()
+    apply_issues.assert_called_once()
+
+
+def test_migrate_plan_splits_concurrency_across_overlapped_phases() -> None:
+    plan = _plan()
+
+    with (
+        patch("gitlab_to_forgejo.migrator.apply_plan", return_value={"alice": "alice"}),
+        patch("gitlab_to_forgejo.migrator.apply_user_ssh_keys"),
+        patch("gitlab_to_forgejo.migrator.apply_user_avatars") as apply_user_avatars,
+        patch("gitlab_to_forgejo.migrator.apply_repos"),
+        patch("gitlab_to_forgejo.migrator.ensure_repo_labels") as ensure_repo_labels,
+        patch("gitlab_to_forgejo.migrator.push_repos") as push_repos,
+        patch("gitlab_to_forgejo.migrator.push_wikis") as push_wikis,
+        patch("gitlab_to_forgejo.migrator.push_merge_request_heads") as push_mr_heads,
+        patch("gitlab_to_forgejo.migrator.apply_issues", return_value={}),
+        patch("gitlab_to_forgejo.migrator.apply_merge_requests", return_value={}),
+        patch("gitlab_to_forgejo.migrator.apply_notes", return_value={}),
+        patch("gitlab_to_forgejo.migrator.apply_issue_and_pr_uploads") as issue_uploads,
+        patch("gitlab_to_forgejo.migrator.apply_note_uploads") as note_uploads,
+        patch("gitlab_to_forgejo.migrator.apply_issue_and_mr_labels") as apply_labels,
+        patch("gitlab_to_forgejo.migrator.build_metadata_fix_sql", return_value=""),
+        patch("gitlab_to_forgejo.migrator.apply_metadata_fix_sql"),
+    ):
+        migrate_plan(
+            plan,
+            client=object(),  # type: ignore[arg-type]
+            user_password="pw",
+            private_repos=True,
+            forgejo_url="http://example.test",
+            git_username="root",
+            git_token="t0",
+            concurrency=6,
+        )
+
+    # Avatars overlap the sequential repo creation; labels overlap two push chains; note uploads
+    # overlap issue/PR labels. Phases that run alone keep the whole budget.
+    assert apply_user_avatars.call_args.kwargs["concurrency"] == 5
+    for phase in (ensure_repo_labels, push_repos, push_wikis, push_mr_heads):
+        assert phase.call_args.kwargs["concurrency"] == 2
+    assert issue_uploads.call_args.kwargs["concurrency"] == 6
+    assert note_uploads.call_args.kwargs["concurrency"] == 3
+    assert apply_labels.call_args.kwargs["concurrency"] == 3
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from pathlib import Path
+from typing import IO
 
 from gitlab_to_forgejo.forgejo_client import ForgejoError
 from gitlab_to_forgejo.gitlab_uploads import GitLabProjectUpload
-from gitlab_to_forgejo.migrator import apply_issue_and_pr_uploads, apply_note_uploads
+from gitlab_to_forgejo.migrator import (
+    apply_issue_and_pr_uploads,
+    apply_note_uploads,
+    collect_project_uploads,
+)
 from gitlab_to_forgejo.plan_builder import (
     IssuePlan,
     MergeRequestPlan,
@@ -27,11 +33,11 @@ class _FakeForgejo:
         repo: str,
         issue_number: int,
         filename: str,
-        content: bytes,
+        content: IO[bytes],
         sudo: str | None = None,
     ) -> dict[str, object]:
         self.calls.append(
-            ("create_issue_attachment", owner, repo, issue_number, filename, content, sudo)
+            ("create_issue_attachment", owner, repo, issue_number, filename, content.read(), sudo)
         )
         return {"browser_download_url": f"http://example.test/attachments/{filename}"}
 
@@ -54,11 +60,19 @@ class _FakeForgejo:
         repo: str,
         comment_id: int,
         filename: str,
-        content: bytes,
+        content: IO[bytes],
         sudo: str | None = None,
     ) -> dict[str, object]:
         self.calls.append(
-            ("create_issue_comment_attachment", owner, repo, comment_id, filename, content, sudo)
+            (
+                "create_issue_comment_attachment",
+                owner,
+                repo,
+                comment_id,
+                filename,
+                content.read(),
+                sudo,
+            )
         )
         return {"browser_download_url": f"http://example.test/attachments/{comment_id}/{filename}"}
 
@@ -95,11 +109,19 @@ class _FakeForgejoCommentAttachment403OnSudo(_FakeForgejo):
         repo: str,
         comment_id: int,
         filename: str,
-        content: bytes,
+        content: IO[bytes],
         sudo: str | None = None,
     ) -> dict[str, object]:
         self.calls.append(
-            ("create_issue_comment_attachment", owner, repo, comment_id, filename, content, sudo)
+            (
+                "create_issue_comment_attachment",
+                owner,
+                repo,
+                comment_id,
+                filename,
+                content.read(),
+                sudo,
+            )
         )
         if sudo is not None:
             raise ForgejoError(
@@ -161,7 +183,9 @@ def test_apply_issue_and_pr_uploads_uploads_and_rewrites_body(tmp_path: Path) ->
         upload_hash="765b08065cca166722283f5cf5234971",
         filename="screen.png",
     )
-    upload_bytes = {upload: b"png-bytes"}
+    upload_path = tmp_path / "screen.png"
+    upload_path.write_bytes(b"png-bytes")
+    upload_paths = {upload: upload_path}
 
     client = _FakeForgejo()
     apply_issue_and_pr_uploads(
@@ -170,7 +194,7 @@ def test_apply_issue_and_pr_uploads_uploads_and_rewrites_body(tmp_path: Path) ->
         user_by_id={1: "alice"},
         issue_number_by_gitlab_issue_id={10: 1},
         pr_number_by_gitlab_mr_id={},
-        upload_bytes_by_upload=upload_bytes,
+        upload_path_by_upload=upload_paths,
     )
 
     assert client.calls == [
@@ -194,6 +218,60 @@ def test_apply_issue_and_pr_uploads_uploads_and_rewrites_body(tmp_path: Path) ->
     ]
 
 
+def test_apply_issue_and_pr_uploads_uploads_repeated_urls_once(tmp_path: Path) -> None:
+    repo = RepoPlan(
+        owner="pleroma",
+        name="meta",
+        gitlab_project_id=1,
+        gitlab_disk_path="@hashed/aa/bb/meta",
+        bundle_path=tmp_path / "repo.bundle",
+        refs_path=tmp_path / "repo.refs",
+        wiki_bundle_path=tmp_path / "wiki.bundle",
+        wiki_refs_path=tmp_path / "wiki.refs",
+    )
+    url = "/uploads/765b08065cca166722283f5cf5234971/screen.png"
+    missing = "/uploads/00000000000000000000000000000000/gone.png"
+    issue = IssuePlan(
+        gitlab_issue_id=10,
+        gitlab_issue_iid=40,
+        gitlab_project_id=1,
+        title="UI/UX",
+        description=f"{url} {missing} {url}",
+        author_id=1,
+    )
+    plan = Plan(
+        backup_id="x",
+        orgs=[],
+        repos=[repo],
+        users=[],
+        org_members={},
+        issues=[issue],
+        merge_requests=[],
+        notes=[],
+    )
+    upload_path = tmp_path / "screen.png"
+    upload_path.write_bytes(b"png-bytes")
+    upload = GitLabProjectUpload(
+        disk_path=repo.gitlab_disk_path,
+        upload_hash="765b08065cca166722283f5cf5234971",
+        filename="screen.png",
+    )
+
+    client = _FakeForgejo()
+    apply_issue_and_pr_uploads(
+        plan,
+        client,
+        user_by_id={},
+        issue_number_by_gitlab_issue_id={10: 1},
+        pr_number_by_gitlab_mr_id={},
+        upload_path_by_upload={upload: upload_path},
+    )
+
+    new_url = "http://example.test/attachments/screen.png"
+    assert [c[0] for c in client.calls] == ["create_issue_attachment", "edit_issue_body"]
+    assert client.calls[1][4] == f"{new_url} {missing} {new_url}"
+
+
 def test_apply_issue_and_pr_uploads_rewrites_pull_request_body(tmp_path: Path) -> None:
     repo = RepoPlan(
         owner="pleroma",
@@ -246,7 +324,9 @@ def test_apply_issue_and_pr_uploads_rewrites_pull_request_body(tmp_path: Path) -
         upload_hash="765b08065cca166722283f5cf5234971",
         filename="screen.png",
     )
-    upload_bytes = {upload: b"png-bytes"}
+    upload_path = tmp_path / "screen.png"
+    upload_path.write_bytes(b"png-bytes")
+    upload_paths = {upload: upload_path}
 
     client = _FakeForgejo()
     apply_issue_and_pr_uploads(
@@ -255,7 +335,7 @@ def test_apply_issue_and_pr_uploads_rewrites_pull_request_body(tmp_path: Path) -
         user_by_id={1: "alice"},
         issue_number_by_gitlab_issue_id={},
         pr_number_by_gitlab_mr_id={30: 2},
-        upload_bytes_by_upload=upload_bytes,
+        upload_path_by_upload=upload_paths,
     )
 
     assert client.calls == [
@@ -329,7 +409,9 @@ def test_apply_note_uploads_uploads_and_rewrites_comment_body(tmp_path: Path) ->
         upload_hash="765b08065cca166722283f5cf5234971",
         filename="screen.png",
     )
-    upload_bytes = {upload: b"png-bytes"}
+    upload_path = tmp_path / "screen.png"
+    upload_path.write_bytes(b"png-bytes")
+    upload_paths = {upload: upload_path}
 
     client = _FakeForgejo()
     apply_note_uploads(
@@ -337,7 +419,7 @@ def test_apply_note_uploads_uploads_and_rewrites_comment_body(tmp_path: Path) ->
         client,
         user_by_id={1: "alice"},
         comment_id_by_gitlab_note_id={20: 123},
-        upload_bytes_by_upload=upload_bytes,
+        upload_path_by_upload=upload_paths,
     )
 
     assert client.calls == [
@@ -361,6 +443,68 @@ def test_apply_note_uploads_uploads_and_rewrites_comment_body(tmp_path: Path) ->
     ]
 
 
+def test_apply_note_uploads_with_concurrency_handles_every_repo(tmp_path: Path) -> None:
+    repos = [
+        RepoPlan(
+            owner="pleroma",
+            name=name,
+            gitlab_project_id=project_id,
+            gitlab_disk_path=f"@hashed/{name}",
+            bundle_path=tmp_path / f"{name}.bundle",
+            refs_path=tmp_path / f"{name}.refs",
+            wiki_bundle_path=tmp_path / f"{name}.wiki.bundle",
+            wiki_refs_path=tmp_path / f"{name}.wiki.refs",
+        )
+        for project_id, name in ((1, "meta"), (2, "docs"))
+    ]
+    notes = [
+        NotePlan(
+            gitlab_note_id=20 + project_id,
+            gitlab_project_id=project_id,
+            noteable_type="Issue",
+            noteable_id=10,
+            author_id=1,
+            body="See: /uploads/765b08065cca166722283f5cf5234971/screen.png",
+        )
+        for project_id in (1, 2)
+    ]
+    plan = Plan(
+        backup_id="x",
+        orgs=[],
+        repos=repos,
+        users=[],
+        org_members={},
+        issues=[],
+        merge_requests=[],
+        notes=notes,
+    )
+    upload_path = tmp_path / "screen.png"
+    upload_path.write_bytes(b"png-bytes")
+    upload_paths = {
+        GitLabProjectUpload(
+            disk_path=repo.gitlab_disk_path,
+            upload_hash="765b08065cca166722283f5cf5234971",
+            filename="screen.png",
+        ): upload_path
+        for repo in repos
+    }
+
+    client = _FakeForgejo()
+    apply_note_uploads(
+        plan,
+        client,
+        user_by_id={},
+        comment_id_by_gitlab_note_id={21: 121, 22: 122},
+        upload_path_by_upload=upload_paths,
+        concurrency=2,
+    )
+
+    assert sorted(c[:4] for c in client.calls if c[0] == "edit_issue_comment") == [
+        ("edit_issue_comment", "pleroma", "docs", 122),
+        ("edit_issue_comment", "pleroma", "meta", 121),
+    ]
+
+
 def test_apply_note_uploads_falls_back_to_admin_for_comment_attachments(tmp_path: Path) -> None:
     repo = RepoPlan(
         owner="pleroma",
@@ -411,7 +555,9 @@ def test_apply_note_uploads_falls_back_to_admin_for_comment_attachments(tmp_path
         upload_hash="765b08065cca166722283f5cf5234971",
         filename="screen.png",
     )
-    upload_bytes = {upload: b"png-bytes"}
+    upload_path = tmp_path / "screen.png"
+    upload_path.write_bytes(b"png-bytes")
+    upload_paths = {upload: upload_path}
 
     client = _FakeForgejoCommentAttachment403OnSudo()
     apply_note_uploads(
@@ -419,7 +565,7 @@ def test_apply_note_uploads_falls_back_to_admin_for_comment_attachments(tmp_path
         client,
         user_by_id={1: "alice"},
         comment_id_by_gitlab_note_id={20: 123},
-        upload_bytes_by_upload=upload_bytes,
+        upload_path_by_upload=upload_paths,
     )
 
     assert client.calls == [
@@ -450,3 +596,182 @@ def test_apply_note_uploads_falls_back_to_admin_for_comment_attachments(tmp_path
             "alice",
         ),
     ]
+
+
+def test_uploads_are_reused_across_issue_and_note_phases(tmp_path: Path) -> None:
+    repo = RepoPlan(
+        owner="pleroma",
+        name="meta",
+        gitlab_project_id=1,
+        gitlab_disk_path="@hashed/aa/bb/meta",
+        bundle_path=tmp_path / "repo.bundle",
+        refs_path=tmp_path / "repo.refs",
+        wiki_bundle_path=tmp_path / "wiki.bundle",
+        wiki_refs_path=tmp_path / "wiki.refs",
+    )
+    issue = IssuePlan(
+        gitlab_issue_id=10,
+        gitlab_issue_iid=40,
+        gitlab_project_id=1,
+        title="UI/UX",
+        description="Screenshot: ![](/uploads/765b08065cca166722283f5cf5234971/screen.png)",
+        author_id=1,
+    )
+    note = NotePlan(
+        gitlab_note_id=20,
+        gitlab_project_id=1,
+        noteable_type="Issue",
+        noteable_id=10,
+        author_id=1,
+        body="Same: /uploads/765b08065cca166722283f5cf5234971/screen.png",
+    )
+    plan = Plan(
+        backup_id="x",
+        orgs=[],
+        repos=[repo],
+        users=[],
+        org_members={},
+        issues=[issue],
+        merge_requests=[],
+        notes=[note],
+    )
+    upload = GitLabProjectUpload(
+        disk_path=repo.gitlab_disk_path,
+        upload_hash="765b08065cca166722283f5cf5234971",
+        filename="screen.png",
+    )
+    upload_path = tmp_path / "screen.png"
+    upload_path.write_bytes(b"png-bytes")
+    upload_paths = {upload: upload_path}
+    uploaded_url_by_upload: dict[GitLabProjectUpload, str] = {}
+
+    client = _FakeForgejo()
+    apply_issue_and_pr_uploads(
+        plan,
+        client,
+        user_by_id={1: "alice"},
+        issue_number_by_gitlab_issue_id={10: 1},
+        pr_number_by_gitlab_mr_id={},
+        upload_path_by_upload=upload_paths,
+        uploaded_url_by_upload=uploaded_url_by_upload,
+    )
+    apply_note_uploads(
+        plan,
+        client,
+        user_by_id={1: "alice"},
+        comment_id_by_gitlab_note_id={20: 123},
+        upload_path_by_upload=upload_paths,
+        uploaded_url_by_upload=uploaded_url_by_upload,
+    )
+
+    assert [c[0] for c in client.calls] == [
+        "create_issue_attachment",
+        "edit_issue_body",
+        "edit_issue_comment",
+    ]
+    assert client.calls[2][4] == "Same: http://example.test/attachments/screen.png"
+
+
+def test_collect_project_uploads_scans_issues_mrs_and_notes(tmp_path: Path) -> None:
+    repos = [
+        RepoPlan(
+            owner="pleroma",
+            name=name,
+            gitlab_project_id=project_id,
+            gitlab_disk_path=disk_path,
+            bundle_path=tmp_path / "repo.bundle",
+            refs_path=tmp_path / "repo.refs",
+            wiki_bundle_path=tmp_path / "wiki.bundle",
+            wiki_refs_path=tmp_path / "wiki.refs",
+        )
+        for project_id, name, disk_path in [(1, "meta", "@hashed/aa/bb/meta"), (2, "nodisk", "")]
+    ]
+    plan = Plan(
+        backup_id="x",
+        orgs=[],
+        repos=repos,
+        users=[],
+        org_members={},
+        issues=[
+            IssuePlan(
+                gitlab_issue_id=10,
+                gitlab_issue_iid=1,
+                gitlab_project_id=1,
+                title="Issue",
+                description="![](/uploads/765b08065cca166722283f5cf5234971/a.png)",
+                author_id=1,
+            ),
+            IssuePlan(
+                gitlab_issue_id=11,
+                gitlab_issue_iid=1,
+                gitlab_project_id=2,
+                title="Issue without disk path",
+                description="![](/uploads/00000000000000000000000000000000/x.png)",
+                author_id=1,
+            ),
+        ],
+        merge_requests=[
+            MergeRequestPlan(
+                gitlab_mr_id=30,
+                gitlab_mr_iid=1,
+                gitlab_target_project_id=1,
+                source_branch="feature",
+                target_branch="master",
+                title="MR",
+                description="/uploads/11111111111111111111111111111111/b.log",
+                author_id=1,
+            )
+        ],
+        notes=[
+            NotePlan(
+                gitlab_note_id=20,
+                gitlab_project_id=1,
+                noteable_type="Issue",
+                noteable_id=10,
+                author_id=1,
+                body="again /uploads/765b08065cca166722283f5cf5234971/a.png",
+            )
+        ],
+    )
+
+    assert collect_project_uploads(plan) == set()
+
+    plan = replace(plan, uploads_tar_path=tmp_path / "uploads.tar.gz")
+    assert collect_project_uploads(plan) == {
+        GitLabProjectUpload(
+            disk_path="@hashed/aa/bb/meta",
+            upload_hash="765b08065cca166722283f5cf5234971",
+            filename="a.png",
+        ),
+        GitLabProjectUpload(
+            disk_path="@hashed/aa/bb/meta",
+            upload_hash="11111111111111111111111111111111",
+            filename="b.log",
+        ),
+    }
+
+    upload_urls_by_body: dict[str, list[tuple[str, str, str]]] = {}
+    collect_project_uploads(plan, upload_urls_by_body=upload_urls_by_body)
+    assert upload_urls_by_body == {
+        "![](/uploads/765b08065cca166722283f5cf5234971/a.png)": [
+            (
+                "/uploads/765b08065cca166722283f5cf5234971/a.png",
+                "765b08065cca166722283f5cf5234971",
+                "a.png",
+            )
+        ],
+        "/uploads/11111111111111111111111111111111/b.log": [
+            (
+                "/uploads/11111111111111111111111111111111/b.log",
+                "11111111111111111111111111111111",
+                "b.log",
+            )
+        ],
+        "again /uploads/765b08065cca166722283f5cf5234971/a.png": [
+            (
+                "/uploads/765b08065cca166722283f5cf5234971/a.png",
+                "765b08065cca166722283f5cf5234971",
+                "a.png",
+            )
+        ],
+    }
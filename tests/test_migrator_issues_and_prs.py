@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+import threading
 from pathlib import Path
 from unittest.mock import patch
 
 from gitlab_to_forgejo.forgejo_client import ForgejoError, ForgejoNotFound
 from gitlab_to_forgejo.migrator import apply_issues, apply_merge_requests, apply_notes
-from gitlab_to_forgejo.plan_builder import MergeRequestPlan, Plan, RepoPlan, build_plan
+from gitlab_to_forgejo.plan_builder import IssuePlan, MergeRequestPlan, Plan, RepoPlan, build_plan
 
 
 def _fixture_backup_root() -> Path:
@@ -274,6 +275,22 @@ def test_apply_merge_requests_retries_on_transient_404() -> None:
     assert [c[0] for c in client.calls].count("create_pull_request") == 2
 
 
+def test_apply_merge_requests_backs_off_and_falls_back_after_persistent_transient_404() -> None:
+    plan = build_plan(_fixture_backup_root(), root_group_path="pleroma")
+    client = _FlakyPullRequestForgejo()
+    client._failures_remaining = 100
+    forgejo_user_by_gitlab_user_id = {u.gitlab_user_id: u.username for u in plan.users}
+
+    with patch("gitlab_to_forgejo.migrator.time.sleep") as sleep:
+        pr_numbers = apply_merge_requests(plan, client, user_by_id=forgejo_user_by_gitlab_user_id)
+
+    assert pr_numbers == {3973: 1}
+    assert [c[0] for c in client.calls] == ["create_pull_request"] * 6 + ["create_issue"]
+    delays = [call.args[0] for call in sleep.call_args_list]
+    assert len(delays) == 5
+    assert all(0.1 * 2**i <= d <= 0.1 * 2**i + 0.05 for i, d in enumerate(delays))
+
+
 def test_apply_merge_requests_uses_merge_request_head_ref_when_branch_missing() -> None:
     plan = build_plan(_fixture_backup_root(), root_group_path="pleroma")
     client = _FakeForgejo()
@@ -340,3 +357,199 @@ def test_apply_merge_requests_falls_back_to_issue_when_no_changes_between_head_a
 
     assert numbers == {plan.merge_requests[0].gitlab_mr_id: 1}
     assert [c[0] for c in client.calls] == ["create_pull_request", "create_issue"]
+
+
+class _MissingBasePullRequestForgejo(_FakeForgejo):
+    def create_pull_request(  # type: ignore[override]
+        self,
+        *,
+        owner: str,
+        repo: str,
+        title: str,
+        body: str,
+        head: str,
+        base: str,
+        sudo: str | None,
+    ) -> dict[str, object]:
+        self.calls.append(("create_pull_request", owner, repo, title, body, head, base, sudo))
+        raise ForgejoNotFound(
+            method="POST",
+            url="http://example.test/api/v1/repos/pleroma/pleroma-fe/pulls",
+            status_code=404,
+            body='{"message":"could not find \'master\' to be a commit in the base repository"}',
+        )
+
+
+def test_apply_merge_requests_skips_pr_creation_for_known_missing_base(tmp_path: Path) -> None:
+    refs_path = tmp_path / "repo.refs"
+    refs_path.write_text("bbbbbbbb refs/heads/master\n", encoding="utf-8")
+    repo = RepoPlan(
+        owner="pleroma",
+        name="pleroma-fe",
+        gitlab_project_id=1,
+        gitlab_disk_path="@hashed/aa/bb/pleroma-fe",
+        bundle_path=tmp_path / "repo.bundle",
+        refs_path=refs_path,
+        wiki_bundle_path=tmp_path / "wiki.bundle",
+        wiki_refs_path=tmp_path / "wiki.refs",
+    )
+    merge_requests = [
+        MergeRequestPlan(
+            gitlab_mr_id=100 + iid,
+            gitlab_mr_iid=iid,
+            gitlab_target_project_id=1,
+            source_branch=f"feature-{iid}",
+            target_branch="master",
+            title=f"MR {iid}",
+            description="D",
+            author_id=1,
+            state_id=1,
+            head_commit_sha="c" * 40,
+        )
+        for iid in (1, 2)
+    ]
+    plan = Plan(
+        backup_id="x",
+        orgs=[],
+        repos=[repo],
+        users=[],
+        org_members={},
+        issues=[],
+        merge_requests=merge_requests,
+        notes=[],
+    )
+    client = _MissingBasePullRequestForgejo()
+
+    with patch("gitlab_to_forgejo.migrator.time.sleep") as sleep:
+        numbers = apply_merge_requests(plan, client, user_by_id={1: "alice"})
+
+    assert numbers == {101: 1, 102: 2}
+    assert [c[0] for c in client.calls] == ["create_pull_request", "create_issue", "create_issue"]
+    assert "could not be resolved in the base repository" in str(client.calls[2][4])
+    sleep.assert_not_called()
+
+
+def test_apply_merge_requests_classifies_missing_branches_without_pr_calls(
+    tmp_path: Path,
+) -> None:
+    refs_path = tmp_path / "repo.refs"
+    refs_path.write_text("bbbbbbbb refs/heads/master\n", encoding="utf-8")
+    repo = RepoPlan(
+        owner="pleroma",
+        name="pleroma-fe",
+        gitlab_project_id=1,
+        gitlab_disk_path="@hashed/aa/bb/pleroma-fe",
+        bundle_path=tmp_path / "repo.bundle",
+        refs_path=refs_path,
+        wiki_bundle_path=tmp_path / "wiki.bundle",
+        wiki_refs_path=tmp_path / "wiki.refs",
+    )
+    plan = Plan(
+        backup_id="x",
+        orgs=[],
+        repos=[repo],
+        users=[],
+        org_members={},
+        issues=[],
+        merge_requests=[
+            MergeRequestPlan(
+                gitlab_mr_id=101,
+                gitlab_mr_iid=1,
+                gitlab_target_project_id=1,
+                source_branch="gone",
+                target_branch="master",
+                title="Missing head",
+                description="D",
+                author_id=1,
+                state_id=1,
+            ),
+            MergeRequestPlan(
+                gitlab_mr_id=102,
+                gitlab_mr_iid=2,
+                gitlab_target_project_id=1,
+                source_branch="feature",
+                target_branch="gone-target",
+                title="Missing base",
+                description="D",
+                author_id=1,
+                state_id=1,
+                head_commit_sha="c" * 40,
+            ),
+        ],
+        notes=[],
+    )
+    client = _FakeForgejo()
+
+    numbers = apply_merge_requests(plan, client, user_by_id={1: "alice"})
+
+    assert numbers == {101: 1, 102: 2}
+    assert [c[0] for c in client.calls] == ["create_issue", "create_issue"]
+    assert client.calls[1][3] == "MR: Missing base"
+    assert "does not exist in the GitLab backup" in str(client.calls[1][4])
+
+
+class _PerRepoNumberingForgejo(_FakeForgejo):
+    """Numbers issues per repo like Forgejo does, from whichever thread calls in."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = threading.Lock()
+        self._next_number_by_repo: dict[str, int] = {}
+
+    def create_issue(
+        self,
+        *,
+        owner: str,
+        repo: str,
+        title: str,
+        body: str,
+        sudo: str | None,
+    ) -> dict[str, object]:
+        with self._lock:
+            number = self._next_number_by_repo.get(repo, 1)
+            self._next_number_by_repo[repo] = number + 1
+            self.calls.append(("create_issue", owner, repo, title, body, sudo))
+        return {"number": number}
+
+
+def test_apply_issues_with_concurrency_keeps_per_repo_order(tmp_path: Path) -> None:
+    repos = [
+        RepoPlan(
+            owner="pleroma",
+            name=name,
+            gitlab_project_id=project_id,
+            gitlab_disk_path=f"@hashed/{name}",
+            bundle_path=tmp_path / f"{name}.bundle",
+            refs_path=tmp_path / f"{name}.refs",
+            wiki_bundle_path=tmp_path / f"{name}.wiki.bundle",
+            wiki_refs_path=tmp_path / f"{name}.wiki.refs",
+        )
+        for project_id, name in ((1, "docs"), (2, "fe"), (3, "be"))
+    ]
+    issues = [
+        IssuePlan(
+            gitlab_issue_id=100 * project_id + iid,
+            gitlab_issue_iid=iid,
+            gitlab_project_id=project_id,
+            title=f"Issue {iid}",
+            description="",
+            author_id=1,
+        )
+        for iid in range(1, 21)
+        for project_id in (1, 2, 3)
+    ]
+    plan = Plan(
+        backup_id="x",
+        orgs=[],
+        repos=repos,
+        users=[],
+        org_members={},
+        issues=issues,
+        merge_requests=[],
+        notes=[],
+    )
+    client = _PerRepoNumberingForgejo()
+
+    issue_numbers = apply_issues(plan, client, user_by_id={1: "alice"}, concurrency=3)
+
+    assert issue_numbers == {issue.gitlab_issue_id: issue.gitlab_issue_iid for issue in issues}
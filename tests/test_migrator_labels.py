@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import logging
 from pathlib import Path
 
+import pytest
+
 from gitlab_to_forgejo.migrator import apply_issue_and_mr_labels, ensure_repo_labels
 from gitlab_to_forgejo.plan_builder import (
     IssuePlan,
@@ -117,6 +120,106 @@ def test_ensure_repo_labels_creates_missing_labels() -> None:
     ]
 
 
+def test_ensure_repo_labels_skips_labels_that_already_exist() -> None:
+    plan = Plan(
+        backup_id="x",
+        orgs=[],
+        repos=[
+            RepoPlan(
+                owner="pleroma",
+                name="docs",
+                gitlab_project_id=673,
+                gitlab_disk_path="@hashed/aa/bb/docs",
+                bundle_path=Path("repo.bundle"),
+                refs_path=Path("repo.refs"),
+                wiki_bundle_path=Path("wiki.bundle"),
+                wiki_refs_path=Path("wiki.refs"),
+            )
+        ],
+        users=[],
+        org_members={},
+        issues=[
+            IssuePlan(
+                gitlab_issue_id=1,
+                gitlab_issue_iid=1,
+                gitlab_project_id=673,
+                title="Issue",
+                description="Body",
+                author_id=43,
+            )
+        ],
+        merge_requests=[],
+        notes=[],
+        labels=[
+            LabelPlan(gitlab_label_id=10, title="bug", color="#ff0000", description="Bug label"),
+            LabelPlan(gitlab_label_id=11, title="docs", color="#0000ff", description="Docs"),
+        ],
+        issue_label_ids_by_gitlab_issue_id={1: (11, 10)},
+    )
+
+    client = _FakeForgejo()
+    client._repo_labels[("pleroma", "docs")] = [{"id": 1, "name": "bug"}]
+    ensure_repo_labels(plan, client)
+    ensure_repo_labels(plan, client)
+
+    assert client.calls == [
+        ("list_repo_labels", "pleroma", "docs"),
+        ("create_repo_label", "pleroma", "docs", "docs", "#0000ff", "Docs"),
+        ("list_repo_labels", "pleroma", "docs"),
+    ]
+
+
+def test_ensure_repo_labels_lists_every_repo_before_creating() -> None:
+    plan = Plan(
+        backup_id="x",
+        orgs=[],
+        repos=[
+            RepoPlan(
+                owner="pleroma",
+                name=name,
+                gitlab_project_id=project_id,
+                gitlab_disk_path=f"@hashed/{name}",
+                bundle_path=Path(f"{name}.bundle"),
+                refs_path=Path(f"{name}.refs"),
+                wiki_bundle_path=Path(f"{name}.wiki.bundle"),
+                wiki_refs_path=Path(f"{name}.wiki.refs"),
+            )
+            for project_id, name in ((1, "docs"), (2, "fe"))
+        ],
+        users=[],
+        org_members={},
+        issues=[
+            IssuePlan(
+                gitlab_issue_id=project_id,
+                gitlab_issue_iid=1,
+                gitlab_project_id=project_id,
+                title="Issue",
+                description="Body",
+                author_id=43,
+            )
+            for project_id in (1, 2)
+        ],
+        merge_requests=[],
+        notes=[],
+        labels=[
+            LabelPlan(gitlab_label_id=10, title="bug", color="#ff0000", description="Bug label"),
+            LabelPlan(gitlab_label_id=11, title="docs", color="#0000ff", description="Docs"),
+        ],
+        issue_label_ids_by_gitlab_issue_id={1: (10, 11), 2: (10,)},
+    )
+
+    client = _FakeForgejo()
+    client._repo_labels[("pleroma", "docs")] = [{"id": 1, "name": "docs"}]
+    ensure_repo_labels(plan, client)
+
+    assert client.calls == [
+        ("list_repo_labels", "pleroma", "docs"),
+        ("list_repo_labels", "pleroma", "fe"),
+        ("create_repo_label", "pleroma", "docs", "bug", "#ff0000", "Bug label"),
+        ("create_repo_label", "pleroma", "fe", "bug", "#ff0000", "Bug label"),
+    ]
+
+
 def test_apply_issue_and_mr_labels_replaces_labels_by_name() -> None:
     plan = Plan(
         backup_id="x",
@@ -198,3 +301,110 @@ def test_apply_issue_and_mr_labels_replaces_labels_by_name() -> None:
         ("replace_issue_labels", "pleroma", "docs", 5, ("bug", "discussion"), None),
         ("replace_issue_labels", "pleroma", "docs", 6, ("discussion",), None),
     ]
+
+
+def test_apply_issue_and_mr_labels_with_concurrency_applies_every_issue() -> None:
+    plan = Plan(
+        backup_id="x",
+        orgs=[],
+        repos=[
+            RepoPlan(
+                owner="pleroma",
+                name="docs",
+                gitlab_project_id=673,
+                gitlab_disk_path="@hashed/aa/bb/docs",
+                bundle_path=Path("repo.bundle"),
+                refs_path=Path("repo.refs"),
+                wiki_bundle_path=Path("wiki.bundle"),
+                wiki_refs_path=Path("wiki.refs"),
+            )
+        ],
+        users=[],
+        org_members={},
+        issues=[
+            IssuePlan(
+                gitlab_issue_id=i,
+                gitlab_issue_iid=i,
+                gitlab_project_id=673,
+                title=f"Issue {i}",
+                description="Body",
+                author_id=43,
+            )
+            for i in range(1, 21)
+        ],
+        merge_requests=[
+            MergeRequestPlan(
+                gitlab_mr_id=50,
+                gitlab_mr_iid=1,
+                gitlab_target_project_id=673,
+                source_branch="feature",
+                target_branch="master",
+                title="MR",
+                description="Body",
+                author_id=43,
+            )
+        ],
+        notes=[],
+        labels=[
+            LabelPlan(gitlab_label_id=10, title="bug", color="#ff0000", description="Bug label"),
+        ],
+        issue_label_ids_by_gitlab_issue_id={i: (10,) for i in range(1, 21)},
+        mr_label_ids_by_gitlab_mr_id={50: (10,)},
+    )
+
+    client = _FakeForgejo()
+    apply_issue_and_mr_labels(
+        plan,
+        client,
+        issue_number_by_gitlab_issue_id={i: i + 100 for i in range(1, 21)},
+        pr_number_by_gitlab_mr_id={50: 200},
+        concurrency=4,
+    )
+
+    assert sorted(client.calls) == [
+        ("replace_issue_labels", "pleroma", "docs", n, ("bug",), None)
+        for n in [*range(101, 121), 200]
+    ]
+
+
+def test_apply_issue_and_mr_labels_reports_missing_repo_once(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    plan = Plan(
+        backup_id="x",
+        orgs=[],
+        repos=[],
+        users=[],
+        org_members={},
+        issues=[
+            IssuePlan(
+                gitlab_issue_id=i,
+                gitlab_issue_iid=i,
+                gitlab_project_id=999,
+                title=f"Issue {i}",
+                description="Body",
+                author_id=43,
+            )
+            for i in range(1, 4)
+        ],
+        merge_requests=[],
+        notes=[],
+        labels=[
+            LabelPlan(gitlab_label_id=10, title="bug", color="#ff0000", description="Bug label"),
+        ],
+        issue_label_ids_by_gitlab_issue_id={i: (10,) for i in range(1, 4)},
+    )
+
+    client = _FakeForgejo()
+    with caplog.at_level(logging.ERROR, logger="gitlab_to_forgejo.migrator"):
+        apply_issue_and_mr_labels(
+            plan,
+            client,
+            issue_number_by_gitlab_issue_id={i: i for i in range(1, 4)},
+            pr_number_by_gitlab_mr_id={},
+        )
+
+    assert client.calls == []
+    assert [r.getMessage() for r in caplog.records] == [
+        "No repo found for issue/MR labels project_id=999"
+    ]
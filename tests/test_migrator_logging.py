@@ -7,8 +7,8 @@ from unittest.mock import patch
 import pytest
 
 from gitlab_to_forgejo.forgejo_client import ForgejoError
-from gitlab_to_forgejo.migrator import apply_merge_requests, migrate_plan
-from gitlab_to_forgejo.plan_builder import MergeRequestPlan, OrgPlan, Plan, RepoPlan
+from gitlab_to_forgejo.migrator import apply_issues, apply_merge_requests, migrate_plan
+from gitlab_to_forgejo.plan_builder import IssuePlan, MergeRequestPlan, OrgPlan, Plan, RepoPlan
 
 
 class _BoomForgejo:
@@ -111,6 +111,77 @@ def test_apply_merge_requests_logs_context_on_unhandled_forgejo_error(
     assert "status=500" in caplog.text
 
 
+class _HugeErrorBodyForgejo(_BoomForgejo):
+    def create_pull_request(  # type: ignore[override]
+        self,
+        *,
+        owner: str,
+        repo: str,
+        title: str,
+        body: str,
+        head: str,
+        base: str,
+        sudo: str | None,
+    ) -> dict[str, object]:
+        raise ForgejoError(
+            method="POST",
+            url=f"http://example.test/api/v1/repos/{owner}/{repo}/pulls",
+            status_code=500,
+            body="x" * 10_000,
+        )
+
+
+def test_apply_merge_requests_truncates_error_bodies_in_logs(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    refs_path = tmp_path / "repo.refs"
+    refs_path.write_text(
+        "1111111111111111111111111111111111111111 refs/heads/feature\n"
+        "2222222222222222222222222222222222222222 refs/heads/master\n",
+        encoding="utf-8",
+    )
+    plan = Plan(
+        backup_id="x",
+        orgs=[],
+        repos=[
+            RepoPlan(
+                owner="pleroma",
+                name="pleroma-fe",
+                gitlab_project_id=1,
+                gitlab_disk_path="@hashed/aa/bb/pleroma-fe",
+                bundle_path=tmp_path / "repo.bundle",
+                refs_path=refs_path,
+                wiki_bundle_path=tmp_path / "wiki.bundle",
+                wiki_refs_path=tmp_path / "wiki.refs",
+            )
+        ],
+        users=[],
+        org_members={},
+        issues=[],
+        merge_requests=[
+            MergeRequestPlan(
+                gitlab_mr_id=123,
+                gitlab_mr_iid=7,
+                gitlab_target_project_id=1,
+                source_branch="feature",
+                target_branch="master",
+                title="MR",
+                description="D",
+                author_id=1,
+            )
+        ],
+        notes=[],
+    )
+
+    caplog.set_level(logging.ERROR, logger="gitlab_to_forgejo.migrator")
+
+    apply_merge_requests(plan, _HugeErrorBodyForgejo(), user_by_id={1: "alice"})
+
+    assert "status=500" in caplog.text
+    assert "(10000 chars)" in caplog.text
+    assert "x" * 1000 not in caplog.text
+
+
 def test_migrate_plan_logs_phase_progress(caplog: pytest.LogCaptureFixture) -> None:
     plan = Plan(
         backup_id="x",
@@ -170,3 +241,44 @@ def test_migrate_plan_applies_sequence_resync_sql_at_end() -> None:
         )
 
     assert [call.args[0] for call in apply_sql.call_args_list][-2:] == ["--metadata", "--seqsync"]
+
+
+def test_apply_issues_logs_progress(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    plan = Plan(
+        backup_id="x",
+        orgs=[],
+        repos=[
+            RepoPlan(
+                owner="pleroma",
+                name="pleroma-fe",
+                gitlab_project_id=1,
+                gitlab_disk_path="@hashed/aa/bb/pleroma-fe",
+                bundle_path=tmp_path / "repo.bundle",
+                refs_path=tmp_path / "repo.refs",
+                wiki_bundle_path=tmp_path / "wiki.bundle",
+                wiki_refs_path=tmp_path / "wiki.refs",
+            )
+        ],
+        users=[],
+        org_members={},
+        issues=[
+            IssuePlan(
+                gitlab_issue_id=10 + iid,
+                gitlab_issue_iid=iid,
+                gitlab_project_id=1,
+                title=f"Issue {iid}",
+                description="D",
+                author_id=1,
+            )
+            for iid in (1, 2)
+        ],
+        merge_requests=[],
+        notes=[],
+    )
+
+    caplog.set_level(logging.INFO, logger="gitlab_to_forgejo.migrator")
+
+    apply_issues(plan, _BoomForgejo(), user_by_id={1: "alice"})
+
+    assert "Issues progress: 1/2 (avg " in caplog.text
+    assert "Issues progress: 2/2 (avg " in caplog.text
@@ -64,6 +64,24 @@ def test_push_repos_pushes_bundles_to_remote_urls() -> None:
     assert first["token"] == "t0"
 
 
+def test_push_repos_with_concurrency_pushes_every_repo() -> None:
+    plan = build_plan(_fixture_backup_root(), root_group_path="pleroma")
+
+    with patch("gitlab_to_forgejo.migrator.push_bundle_http") as push:
+        push_repos(
+            plan,
+            forgejo_url="http://example.test",
+            git_username="root",
+            git_token="t0",
+            concurrency=2,
+        )
+
+    assert sorted(call.kwargs["remote_url"] for call in push.call_args_list) == [
+        "http://example.test/pleroma-elixir-libraries/pool-benchmark.git",
+        "http://example.test/pleroma/docs.git",
+    ]
+
+
 def test_push_wikis_initializes_wiki_repo_and_pushes_when_bundle_exists(tmp_path: Path) -> None:
     wiki_bundle = tmp_path / "001.bundle"
     wiki_bundle.write_bytes(b"not a real bundle")
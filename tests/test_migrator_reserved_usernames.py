@@ -103,3 +103,41 @@ def test_apply_plan_falls_back_for_invalid_username() -> None:
     apply_plan(plan, client, user_password="pw")
 
     assert client.usernames == ["namachan10777_", "gitlab-namachan10777-10777"]
+
+
+class _FakeForgejoRejectsNonAscii(_FakeForgejo):
+    def ensure_user(self, *, username: str, email: str, full_name: str, password: str) -> None:
+        self.usernames.append(username)
+        if not username.isascii():
+            raise ForgejoError(
+                method="POST",
+                url="http://example.test/api/v1/admin/users",
+                status_code=422,
+                body='{"message":"[Username]: invalid username"}',
+            )
+
+
+def test_apply_plan_fallback_username_keeps_only_ascii_characters() -> None:
+    plan = Plan(
+        backup_id="x",
+        orgs=[],
+        repos=[],
+        users=[
+            UserPlan(
+                gitlab_user_id=7,
+                username="Jörg \u017fmith",
+                email="j@example.com",
+                full_name="J",
+                state="active",
+            )
+        ],
+        org_members={},
+        issues=[],
+        merge_requests=[],
+        notes=[],
+    )
+
+    client = _FakeForgejoRejectsNonAscii()
+    apply_plan(plan, client, user_password="pw")
+
+    assert client.usernames[1] == "gitlab-j-rg-mith-7"
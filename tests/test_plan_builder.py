@@ -1,21 +1,18 @@
 from __future__ import annotations
 
 import datetime as dt
+import sys
 from pathlib import Path
 
-from gitlab_to_forgejo.plan_builder import build_plan
-
-
-def _fixture_backup_root() -> Path:
-    return Path(__file__).resolve().parents[1] / "fixtures/gitlab-mini"
+from gitlab_to_forgejo.plan_builder import Plan, UserSSHKeyPlan, build_plan
 
 
 def _unix(ts: str) -> int:
     return int(dt.datetime.fromisoformat(ts).replace(tzinfo=dt.UTC).timestamp())
 
 
-def test_build_plan_from_fixture() -> None:
-    plan = build_plan(_fixture_backup_root(), root_group_path="pleroma")
+def test_build_plan_from_fixture(mini_plan: Plan) -> None:
+    plan = mini_plan
 
     assert plan.backup_id == "1770183352_2026_02_04_18.4.6"
 
@@ -63,3 +60,57 @@ def test_build_plan_from_fixture() -> None:
     issue_notes = [n for n in plan.notes if n.noteable_type == "Issue"]
     assert len(issue_notes) == 1
     assert issue_notes[0].created_unix == _unix("2020-03-08 14:04:32.951042")
+
+
+def test_plan_repo_by_project_id_indexes_repos_once(mini_plan: Plan) -> None:
+    plan = mini_plan
+
+    assert plan.repo_by_project_id == {r.gitlab_project_id: r for r in plan.repos}
+    assert plan.repo_by_project_id is plan.repo_by_project_id
+
+
+def test_build_plan_walks_parent_ids_for_groups_without_traversal_ids(tmp_path: Path) -> None:
+    backup_root = tmp_path / "backup"
+    (backup_root / "db").mkdir(parents=True)
+    (backup_root / "backup_information.yml").write_text(":backup_id: 123\n", encoding="utf-8")
+    sql_lines = [
+        "COPY public.shards (id, name) FROM stdin;",
+        "1\tdefault",
+        "\\.",
+        "COPY public.namespaces (id, name, path, type, parent_id, traversal_ids) FROM stdin;",
+        "3\tPleroma\tpleroma\tGroup\t\\N\t{3}",
+        "4\tLibs\tlibs\tGroup\t3\t\\N",
+        "5\tElixir\telixir\tGroup\t4\t\\N",
+        "6\tOther\tother\tGroup\t\\N\t\\N",
+        "7\tStray\tstray\tGroup\t6\t{6,7}",
+        "\\.",
+        "COPY public.project_repositories (shard_id, disk_path, project_id) FROM stdin;",
+        "1\t@hashed/aa\t673",
+        "\\.",
+        "COPY public.projects (id, path, namespace_id) FROM stdin;",
+        "673\tdocs\t5",
+        "\\.",
+    ]
+    (backup_root / "db" / "database.sql").write_text("\n".join(sql_lines), encoding="utf-8")
+
+    plan = build_plan(backup_root, root_group_path="pleroma")
+
+    assert [org.name for org in plan.orgs] == ["pleroma", "pleroma-libs", "pleroma-libs-elixir"]
+    assert [(repo.owner, repo.name) for repo in plan.repos] == [("pleroma-libs-elixir", "docs")]
+
+
+def test_per_row_plan_objects_are_slotted(mini_plan: Plan) -> None:
+    plan = mini_plan
+
+    key = UserSSHKeyPlan(gitlab_key_id=1, gitlab_user_id=2, title="laptop", key="ssh-ed25519 AAAA")
+    for obj in (plan.orgs[0], plan.repos[0], plan.users[0], plan.issues[0], plan.notes[0], key):
+        assert not hasattr(obj, "__dict__")
+
+
+def test_repeated_note_and_branch_strings_are_shared(mini_plan: Plan) -> None:
+    plan = mini_plan
+
+    for note in plan.notes:
+        assert note.noteable_type is sys.intern(note.noteable_type)
+    for mr in plan.merge_requests:
+        assert mr.target_branch is sys.intern(mr.target_branch)
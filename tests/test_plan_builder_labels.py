@@ -2,10 +2,13 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import pytest
+
 from gitlab_to_forgejo.plan_builder import build_plan
 
 
-def test_build_plan_parses_labels_and_assignments(tmp_path: Path) -> None:
+@pytest.mark.parametrize("label_links_first", [False, True])
+def test_build_plan_parses_labels_and_assignments(tmp_path: Path, label_links_first: bool) -> None:
     backup_root = tmp_path / "backup"
     (backup_root / "db").mkdir(parents=True)
     (backup_root / "backup_information.yml").write_text(
@@ -61,7 +64,7 @@ def test_build_plan_parses_labels_and_assignments(tmp_path: Path) -> None:
         issues_header,
         (
             "2978\t1\t673\tIssue title\tIssue body\t43\t1\t2020-01-01 00:00:00+00\t"
-            "2020-01-02 00:00:00+00\t\\N"
+            "2020-01-02 05:30:00+05:30\t\\N"
         ),
         "\\.",
         "",
@@ -91,6 +94,9 @@ def test_build_plan_parses_labels_and_assignments(tmp_path: Path) -> None:
         "\\.",
         "",
     ]
+    if label_links_first:
+        # Worst case: label_links before every table its rows are filtered against.
+        sql_lines = sql_lines[-5:] + sql_lines[:-5]
     sql = "\n".join(sql_lines)
     (backup_root / "db" / "database.sql").write_text(sql, encoding="utf-8")
 
@@ -102,5 +108,20 @@ def test_build_plan_parses_labels_and_assignments(tmp_path: Path) -> None:
     assert labels_by_id[10].description == "Bug label"
     assert labels_by_id[11].title == "discussion"
 
+    issue = next(i for i in plan.issues if i.gitlab_issue_id == 2978)
+    assert issue.created_unix == 1577836800
+    assert issue.updated_unix == 1577923200
+
     assert plan.issue_label_ids_by_gitlab_issue_id == {2978: (10,)}
     assert plan.mr_label_ids_by_gitlab_mr_id == {3973: (11,)}
+    assert [
+        (issue.gitlab_issue_id, label_ids)
+        for issue, label_ids in zip(plan.issues, plan.issue_label_ids, strict=True)
+    ] == [
+        (issue.gitlab_issue_id, (10,) if issue.gitlab_issue_id == 2978 else ())
+        for issue in plan.issues
+    ]
+    assert [
+        (mr.gitlab_mr_id, label_ids)
+        for mr, label_ids in zip(plan.merge_requests, plan.mr_label_ids, strict=True)
+    ] == [(mr.gitlab_mr_id, (11,) if mr.gitlab_mr_id == 3973 else ()) for mr in plan.merge_requests]
@@ -3,6 +3,8 @@ from __future__ import annotations
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
+
 import gitlab_to_forgejo.plan_builder as plan_builder
 
 
@@ -11,12 +13,21 @@ def _fixture_backup_root() -> Path:
 
 
 def _pass2_tables() -> set[str]:
-    return {"members", "issues", "merge_requests", "notes", "users", "labels", "keys"}
-
-
-def test_build_plan_ignores_null_member_user_id_and_infers_note_project_id() -> None:
-    expected = plan_builder.build_plan(_fixture_backup_root(), root_group_path="pleroma")
-
+    return {
+        "members",
+        "issues",
+        "merge_requests",
+        "notes",
+        "users",
+        "labels",
+        "keys",
+        "label_links",
+    }
+
+
+def test_build_plan_ignores_null_member_user_id_and_infers_note_project_id(
+    mini_plan: plan_builder.Plan,
+) -> None:
     original = plan_builder.iter_copy_rows
 
     def injected_iter_copy_rows(path: Path, *, tables: set[str]):
@@ -41,7 +52,7 @@ def test_build_plan_ignores_null_member_user_id_and_infers_note_project_id() ->
     with patch.object(plan_builder, "iter_copy_rows", side_effect=injected_iter_copy_rows):
         plan = plan_builder.build_plan(_fixture_backup_root(), root_group_path="pleroma")
 
-    assert plan.org_members == expected.org_members
+    assert plan.org_members == mini_plan.org_members
 
     extra_notes = [n for n in plan.notes if n.gitlab_note_id == 999999]
     assert len(extra_notes) == 1
@@ -117,3 +128,33 @@ def test_build_plan_reads_user_encrypted_password() -> None:
 
     user = next(u for u in plan.users if u.gitlab_user_id == 43)
     assert user.gitlab_encrypted_password == encrypted_password
+
+
+@pytest.mark.parametrize(
+    "created_at",
+    ["2020-13-08 15:10:43.272445", "2020-02-30 15:10:43", "2020-3-8 15:10:43"],
+)
+def test_build_plan_rejects_malformed_issue_timestamp(created_at: str) -> None:
+    original = plan_builder.iter_copy_rows
+
+    def injected_iter_copy_rows(path: Path, *, tables: set[str]):
+        yield from original(path, tables=tables)
+        if tables == _pass2_tables():
+            yield "issues", {
+                "id": "999999",
+                "iid": "999",
+                "project_id": "673",
+                "title": "Synthetic issue",
+                "description": "",
+                "author_id": "43",
+                "state_id": "1",
+                "created_at": created_at,
+                "updated_at": None,
+                "closed_at": None,
+            }
+
+    with (
+        patch.object(plan_builder, "iter_copy_rows", side_effect=injected_iter_copy_rows),
+        pytest.raises(ValueError),
+    ):
+        plan_builder.build_plan(_fixture_backup_root(), root_group_path="pleroma")
@@ -11,7 +11,16 @@ def _fixture_backup_root() -> Path:
 
 
 def _pass2_tables() -> set[str]:
-    return {"members", "issues", "merge_requests", "notes", "users", "labels", "keys"}
+    return {
+        "members",
+        "issues",
+        "merge_requests",
+        "notes",
+        "users",
+        "labels",
+        "keys",
+        "label_links",
+    }
 
 
 def test_build_plan_reads_user_ssh_keys_and_otp_flag() -> None: